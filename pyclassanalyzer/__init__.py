@@ -4,4 +4,18 @@ PyClassAnalyzer - A tool for analyzing Python class structure and generating Pla
 
 
 __version__ = '0.1.0'
-__all__ = ['ClassAnalyzer'] 
\ No newline at end of file
+__all__ = ['analyze', 'ClassGraph', 'TomlConfig']
+
+
+def __getattr__(name):
+    # Imported on first use, so `import pyclassanalyzer` stays cheap
+    if name == 'analyze':
+        from pyclassanalyzer.api import analyze
+        return analyze
+    if name == 'ClassGraph':
+        from pyclassanalyzer.network.classgraph import ClassGraph
+        return ClassGraph
+    if name == 'TomlConfig':
+        from pyclassanalyzer.config import TomlConfig
+        return TomlConfig
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,10 @@
 import ast
 import os 
 
-from typing import List
+from typing import List, Optional
 from pyclassanalyzer.network.package import PackageTree
 from pyclassanalyzer.utils.path import find_root_name
+from pyclassanalyzer.utils.pathspec import PathFilter
 def analyze_module(path: str) -> ast.Module:
     """
     
@@ -15,8 +16,9 @@ def analyze_module(path: str) -> ast.Module:
     return tree 
 
 class PackageAnalyzer:
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, path_filter: Optional[PathFilter] = None) -> None:
         self.path = path 
+        self.path_filter = path_filter or PathFilter()
         
     def _discovery(self) -> List[str]:
         """
@@ -24,9 +26,12 @@ class PackageAnalyzer:
         
         Only include files inside directories that contain an `__init__.py` file,
         which indicates a Python Package
+        
+        Excluded directories are pruned by the path filter during the walk,
+        so they are never entered.
         """
         paths = []
-        for root, _, files in os.walk(self.path):
+        for root, _, files in self.path_filter.walk(self.path):
                         
             for file in files:
                 # 상대 경로로 변환 
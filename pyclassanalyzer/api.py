@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from pyclassanalyzer.config import TomlConfig
+from pyclassanalyzer.network.classgraph import ClassGraph
+from pyclassanalyzer.network.facts import FactsCache
+from pyclassanalyzer.scanner.scanner import GraphScanner
+from pyclassanalyzer.scanner.multi import MultiRootScanner, expand_roots
+
+PathLike = Union[str, "os.PathLike[str]"]
+ConfigSource = Union[None, str, "os.PathLike[str]", Dict[str, Any], TomlConfig]
+
+# Module summaries shared by all the analyses of the process
+SHARED_CACHE = FactsCache()
+
+
+def create_scanner(roots: List[str], config: TomlConfig, workers: Optional[int] = 1,
+                   cache_dir: Optional[str] = None, memory_cache: Optional[FactsCache] = None,
+                   keep_unresolved: bool = False) -> GraphScanner:
+    """Create the scanner of one source root, or of several roots merged into one graph.
+
+    Args:
+        roots (List[str]): The source root directories.
+        config (TomlConfig): The configuration.
+        workers (Optional[int]): The worker processes to parse the modules, None for the CPU count.
+        cache_dir (Optional[str]): The directory of the per-root analysis caches.
+        memory_cache (Optional[FactsCache]): The module summaries shared in the process.
+        keep_unresolved (bool): Whether to keep the relations to classes outside the roots,
+            for the graph to be merged with other shards. The roots of a multi-root
+            scanner are already resolved against each other.
+    """
+    if len(roots) == 1:
+        cache_path = None
+        if cache_dir:
+            cache_path = str(Path(cache_dir) / f"{Path(roots[0]).resolve().name}.json")
+        return GraphScanner(path=roots[0], config=config, cache_path=cache_path,
+                            workers=workers, memory_cache=memory_cache, keep_unresolved=keep_unresolved)
+    return MultiRootScanner(roots=roots, config=config, workers=workers,
+                            cache_dir=cache_dir, memory_cache=memory_cache)
+
+
+def analyze(paths: Union[PathLike, Iterable[PathLike]], config: ConfigSource = None,
+            workers: Optional[int] = 1, cache_dir: Optional[str] = None,
+            memory_cache: Optional[FactsCache] = SHARED_CACHE, keep_unresolved: bool = False) -> ClassGraph:
+    """Analyze the classes of one or several source roots.
+
+    Nothing depends on the working directory, so it can be called repeatedly,
+    and from several threads, for different projects in one process.
+    Modules unchanged since a previous call are not parsed again.
+
+    Args:
+        paths: A directory, or several directories and glob patterns.
+            Several roots are merged, with classes qualified by their root (ex. `a.src.Config`).
+        config: A dict, the path of a TOML file, a TomlConfig,
+            or None for the defaults. Missing keys take their default value.
+        workers (Optional[int]): The worker processes to parse the modules, None for the CPU count.
+        cache_dir (Optional[str]): If set, the analysis of each root is also kept on disk.
+        memory_cache (Optional[FactsCache]): The module summaries shared between calls,
+            None to parse everything again.
+        keep_unresolved (bool): Whether to keep the relations to classes defined
+            outside the analyzed roots, to combine the graph with others (see `union`).
+
+    Returns:
+        ClassGraph: The class graph.
+
+    Example:
+        graph = analyze("src/myproject", config={"exclude": {"directories": ["tests", "docs"]}})
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    patterns = [os.fspath(path) for path in paths]
+
+    roots = expand_roots(patterns)
+    if not roots:
+        raise FileNotFoundError(f"No directory to analyze: {', '.join(patterns)}")
+
+    scanner = create_scanner(roots, TomlConfig.of(config), workers=workers,
+                             cache_dir=cache_dir, memory_cache=memory_cache, keep_unresolved=keep_unresolved)
+    scanner.analyze()
+    return scanner.graph
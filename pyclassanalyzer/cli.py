@@ -1,49 +1,378 @@
-import toml 
 import argparse
+import glob
 import sys
 from pathlib import Path
 
-from pyclassanalyzer.scanner.scanner import GraphScanner
-from pyclassanalyzer.config import TomlConfig
+from pyclassanalyzer.utils.log import logger, configure_logging
 
+# The subsystems are imported on the code paths that use them, so `--help`
+# and cached runs do not pay for the exporters, the metrics or NumPy.
+# The choices are spelled out here for the same reason (checked by the tests
+# against EXPORTERS, RANKINGS and the metric writers).
+FORMATS = ['plantuml', 'json', 'jsonl', 'graphml', 'dot', 'svg', 'html']
+RANK_BY = ['pagerank', 'in-degree', 'out-degree', 'degree', 'betweenness']
+METRIC_FORMATS = ['csv', 'json']
+MEMBER_LEVELS = ['none', 'public', 'summary', 'all']
+RELATION_TYPES = ['inheritance', 'composition', 'aggregation', 'association', 'dependency', 'realization']
+# Written by `index` and read by `query` when no path is given
+DEFAULT_INDEX = 'outputs/index.db'
 
-def main():
+
+def add_logging_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('-v', '--verbose',
+                       action='count',
+                       default=0,
+                       help='진행 상황(파일/초, 남은 시간) 출력, -vv는 디버그 메시지까지 출력')
+    parser.add_argument('-q', '--quiet',
+                       action='store_true',
+                       help='경고와 오류만 출력')
+
+
+def verbosity(args) -> int:
+    return -1 if args.quiet else args.verbose
+
+
+def check_failures(failures: int, max_failures) -> int:
+    """Exit code of an analysis with `failures` modules that could not be analyzed."""
+    if max_failures is not None and failures > max_failures:
+        logger.error(f"{failures} modules failed, more than --max-failures {max_failures}")
+        return 1
+    return 0
+
+
+def serve(argv) -> int:
+    """`pyclassanalyzer serve`: keep the analyzed graph warm and answer requests."""
+    import asyncio
+    import toml
+    from pyclassanalyzer.config import TomlConfig
+    from pyclassanalyzer.scanner.scanner import GraphScanner
+    from pyclassanalyzer.server.server import AnalysisServer
+    
+    parser = argparse.ArgumentParser(
+        prog='pyclassanalyzer serve',
+        description='분석된 클래스 그래프를 메모리에 유지하며 요청에 응답하는 서버',
+    )
+    parser.add_argument('path',
+                       help='분석할 Python 디렉토리 경로')
+    parser.add_argument('--socket',
+                       help='Unix 소켓 경로 (지정하면 host/port 대신 사용)')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='HTTP 서버 호스트 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765,
+                       help='HTTP 서버 포트 (기본값: 8765)')
+    parser.add_argument('--interval', type=float, default=2.0,
+                       help='변경된 파일을 다시 분석하는 주기(초), 0이면 /refresh 요청 시에만 (기본값: 2.0)')
+    parser.add_argument('-c', '--config',
+                       metavar='FILE',
+                       help='설정 파일 경로 (기본값: 현재 디렉토리의 config.toml, 없으면 기본 설정)')
+    add_logging_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    configure_logging(verbosity(args))
+    
+    try:
+        config = TomlConfig(args.config)
+        input_path = Path(args.path)
+        if not input_path.is_dir():
+            logger.error(f"지정된 경로를 찾을 수 없습니다: {args.path}")
+            return 1
+        
+        scanner = GraphScanner(path=str(input_path), config=config)
+        server = AnalysisServer(scanner=scanner, refresh_interval=args.interval)
+        
+        address = args.socket or f"http://{args.host}:{args.port}"
+        logger.info(f"Serving {input_path} on {address}")
+        asyncio.run(server.serve_forever(socket_path=args.socket, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        return 0
+    except toml.TomlDecodeError as e:
+        logger.error(f"TOML 파일 파싱 오류: {e}")
+        return 1
+    except Exception as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+def index(argv) -> int:
+    """`pyclassanalyzer index`: analyze the sources and save the symbol index read by `query`."""
+    parser = argparse.ArgumentParser(
+        prog='pyclassanalyzer index',
+        description='클래스 위치, 상속, 멤버, 관계를 담은 심볼 인덱스 생성 (query 명령에서 사용)',
+    )
+    parser.add_argument('path',
+                       nargs='+',
+                       help='분석할 Python 디렉토리 경로, 여러 개 또는 glob 패턴 지정 가능')
+    parser.add_argument('-o', '--output',
+                       default=DEFAULT_INDEX,
+                       help=f'인덱스 파일 경로 (기본값: {DEFAULT_INDEX})')
+    parser.add_argument('--workers',
+                       type=int,
+                       help='모듈을 병렬로 분석할 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--cache-dir',
+                       metavar='DIR',
+                       help='루트별 분석 캐시 디렉토리, 다음 실행에서는 변경된 모듈만 다시 분석')
+    parser.add_argument('-c', '--config',
+                       metavar='FILE',
+                       help='설정 파일 경로 (기본값: 현재 디렉토리의 config.toml, 없으면 기본 설정)')
+    add_logging_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    configure_logging(verbosity(args))
+    
+    import toml
+    from pyclassanalyzer.api import create_scanner
+    from pyclassanalyzer.config import TomlConfig
+    from pyclassanalyzer.scanner.multi import expand_roots
+    
+    try:
+        config = TomlConfig(args.config)
+        roots = expand_roots(args.path)
+        if not roots:
+            logger.error(f"지정된 경로를 찾을 수 없습니다: {' '.join(args.path)}")
+            return 1
+        
+        scanner = create_scanner(roots, config, workers=args.workers, cache_dir=args.cache_dir)
+        scanner.analyze()
+        scanner.log_issues()
+        logger.info(f"Saved: {scanner.save_index(args.output)}")
+        scanner.print_graph_count()
+    except KeyboardInterrupt:
+        logger.error("사용자에 의해 중단되었습니다.")
+        return 1
+    except toml.TomlDecodeError as e:
+        logger.error(f"TOML 파일 파싱 오류: {e}")
+        return 1
+    except Exception as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+def query(argv) -> int:
+    """`pyclassanalyzer query`: answer from the symbol index, without analyzing the sources.
+    
+    Prints one `file:line: qualified name` per class, or a JSON list with `--json`.
+    Returns 1 when no class matches, so it can be tested in shell scripts.
+    """
+    parser = argparse.ArgumentParser(
+        prog='pyclassanalyzer query',
+        description='index 명령으로 만든 심볼 인덱스에서 클래스를 바로 조회',
+    )
+    parser.add_argument('kind',
+                       choices=['where', 'subclasses', 'dependents', 'find'],
+                       help='where: 정의 위치, subclasses: 상속한 클래스, dependents: 의존하는 클래스, find: 이름 패턴 검색')
+    parser.add_argument('name',
+                       help='클래스 이름 (짧은 이름, 모듈 포함 이름) 또는 find의 glob 패턴 (예: "*Scanner")')
+    parser.add_argument('-i', '--index',
+                       default=DEFAULT_INDEX,
+                       help=f'인덱스 파일 경로 (기본값: {DEFAULT_INDEX})')
+    parser.add_argument('--transitive',
+                       action='store_true',
+                       help='subclasses/dependents에서 간접적인 클래스까지 포함')
+    parser.add_argument('--type',
+                       action='append',
+                       choices=RELATION_TYPES,
+                       help='dependents에서 고려할 관계 타입, 여러 번 지정 가능 (기본값: 모든 관계)')
+    parser.add_argument('--limit',
+                       type=int,
+                       metavar='N',
+                       help='최대 N개만 출력')
+    parser.add_argument('--json',
+                       action='store_true',
+                       help='멤버와 상위 클래스를 포함한 JSON으로 출력')
+    add_logging_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    configure_logging(verbosity(args))
+    
+    from pyclassanalyzer.network.index import SymbolIndex
+    
+    try:
+        with SymbolIndex(args.index) as symbols:
+            if args.kind == 'where':
+                classes = symbols.where(args.name)
+            elif args.kind == 'subclasses':
+                classes = symbols.subclasses(args.name, transitive=args.transitive)
+            elif args.kind == 'dependents':
+                classes = symbols.dependents(args.name, types=args.type, transitive=args.transitive)
+            else:
+                classes = symbols.find(args.name)
+    except FileNotFoundError:
+        logger.error(f"인덱스 파일을 찾을 수 없습니다: {args.index} (pyclassanalyzer index로 생성)")
+        return 1
+    except Exception as e:
+        logger.error(str(e))
+        return 1
+    
+    if args.limit is not None:
+        classes = classes[:args.limit]
+    if args.json:
+        import json
+        print(json.dumps([class_.to_dict() for class_ in classes], indent=2))
+    else:
+        for class_ in classes:
+            print(f"{class_.location()}: {class_.qualname}")
+    return 0 if classes else 1
+
+
+COMMANDS = {
+    'serve': serve,
+    'index': index,
+    'query': query,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    
     parser = argparse.ArgumentParser(
         description='Python 클래스 구조 분석 및 PlantUML 다이어그램 생성',
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     
     parser.add_argument('path', 
-                       help='분석할 Python 파일 또는 디렉토리 경로')
+                       nargs='+',
+                       help='분석할 Python 디렉토리 경로, 여러 개 또는 glob 패턴 지정 가능 (예: "services/*/src" "libs/*")')
     parser.add_argument('-o', '--output',  
-                       help='출력할 PlantUML 파일 경로 (기본값: [project_name]_[timestamp].puml")'
+                       help='출력할 PlantUML 파일 경로, 내용이 바뀌지 않은 다이어그램은 다시 쓰지 않음 (기본값: outputs/[project_name].puml)'
                        )
     parser.add_argument('--summary', 
                        action='store_true', 
                        help='분석 결과 요약 출력')
     parser.add_argument('-t', '--title',
                        help='다이어그램 제목 (기본값: 프로젝트 이름 기반 자동 생성)')
+    parser.add_argument('--reduce',
+                       action='store_true',
+                       help='관계 타입별 전이 축소(transitive reduction)로 중복 관계 제거')
+    parser.add_argument('--collapse-to',
+                       metavar='package[:depth]',
+                       help='클래스 대신 패키지 단위로 접은 개요 다이어그램 생성 (예: package, package:2)')
+    parser.add_argument('--focus',
+                       metavar='PACKAGE',
+                       help='지정한 패키지(및 하위 패키지)의 클래스만 출력 (예: pyclassanalyzer.network)')
+    parser.add_argument('--max-classes',
+                       type=int,
+                       metavar='N',
+                       help='클래스가 N개를 넘으면 중요도가 높은 N개만 출력')
+    parser.add_argument('--rank-by',
+                       default='pagerank',
+                       choices=RANK_BY,
+                       help='--max-classes의 중요도 기준 (기본값: pagerank)')
+    parser.add_argument('--members',
+                       choices=MEMBER_LEVELS,
+                       help='클래스 멤버 표시 수준: none(생략), public(공개 멤버만), summary(개수만), all(전체) (기본값: 설정 파일의 [members], 없으면 all)')
+    parser.add_argument('--max-members',
+                       type=int,
+                       metavar='N',
+                       help='클래스마다 멤버를 N개까지만 출력하고 나머지는 "… 37 more"로 표시, 0이면 제한 없음')
+    parser.add_argument('--metrics',
+                       choices=METRIC_FORMATS,
+                       help='클래스/패키지 설계 지표(fan-in/out, DIT, NOC, LCOM, Ca/Ce, 불안정성)를 저장할 형식')
+    parser.add_argument('--queries',
+                       metavar='FILE',
+                       help='JSON 질의 파일을 한 번에 처리해 결과를 저장 (예: {"ancestors": ["A"], "neighbors": ["A", "B"]})')
+    parser.add_argument('--workers',
+                       type=int,
+                       help='모듈을 병렬로 분석할 프로세스 수, 큰 파일부터 분배 (기본값: CPU 수)')
+    parser.add_argument('--cache-dir',
+                       metavar='DIR',
+                       help='루트별 분석 캐시 디렉토리, 다음 실행에서는 변경된 모듈만 다시 분석')
+    parser.add_argument('--max-failures',
+                       type=int,
+                       metavar='N',
+                       help='분석에 실패한 파일이 N개를 넘으면 종료 코드 1 반환 (기본값: 실패해도 0)')
+    parser.add_argument('-c', '--config',
+                       metavar='FILE',
+                       help='설정 파일 경로 (기본값: 현재 디렉토리의 config.toml, 없으면 기본 설정)')
+    parser.add_argument('-f', '--format',
+                       default='plantuml',
+                       help=f'출력 형식, 쉼표로 여러 개 지정 가능 ({", ".join(FORMATS)}) (기본값: plantuml)')
+    add_logging_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    configure_logging(verbosity(args))
     
-    args = parser.parse_args()
+    formats = [name.strip() for name in args.format.split(',') if name.strip()]
+    unsupported = [name for name in formats if name not in FORMATS]
+    if unsupported or not formats:
+        parser.error(f"지원되지 않는 출력 형식입니다: {', '.join(unsupported)} (지원: {', '.join(FORMATS)})")
+    
+    if args.max_classes is not None and args.max_classes < 1:
+        parser.error("--max-classes는 1 이상이어야 합니다.")
+    if args.max_members is not None and args.max_members < 0:
+        parser.error("--max-members는 0 이상이어야 합니다.")
+    
+    collapse_depth = None
+    if args.collapse_to:
+        level, _, depth = args.collapse_to.partition(':')
+        if level != 'package' or (depth and not depth.isdigit()):
+            parser.error(f"--collapse-to 형식이 올바르지 않습니다: {args.collapse_to} (예: package, package:2)")
+        if formats != ['plantuml']:
+            parser.error("--collapse-to는 plantuml 형식만 지원합니다.")
+        collapse_depth = int(depth) if depth else None
+
+    import toml
+    from pyclassanalyzer.api import create_scanner
+    from pyclassanalyzer.config import TomlConfig, merge_config
+    from pyclassanalyzer.scanner.multi import expand_roots
 
     try:
         # Config 
-        config = TomlConfig()
+        config = TomlConfig(args.config)
+        # The options override the [members] table of the file, for the view drawn by this run
+        members = {}
+        if args.members:
+            members['level'] = args.members
+        if args.max_members is not None:
+            members['max'] = args.max_members
+        if members:
+            config = TomlConfig(merge_config(config.data, {'members': members}))
         # Target
-        input_path = Path(args.path)
-        if not input_path.exists():
-            print(f"Error: 지정된 경로를 찾을 수 없습니다: {args.path}", file=sys.stderr)
-            return 1
+        if len(args.path) == 1 and not glob.has_magic(args.path[0]):
+            input_path = Path(args.path[0])
+            if not input_path.exists():
+                logger.error(f"지정된 경로를 찾을 수 없습니다: {args.path[0]}")
+                return 1
+            if input_path.is_file():
+                logger.warning("현재 파일은 지원되지 않습니다.")
+                return 1
         
-        scanner = GraphScanner(path=str(input_path), config=config)  
-        if input_path.is_file():
-            print(f"Warning: 현재 파일은 지원되지 않습니다.")
+        roots = expand_roots(args.path)
+        if not roots:
+            logger.error(f"지정된 경로를 찾을 수 없습니다: {' '.join(args.path)}")
             return 1
-        elif input_path.is_dir():   
-            scanner.analyze()
+        
+        scanner = create_scanner(roots, config, workers=args.workers, cache_dir=args.cache_dir)
+        scanner.analyze()
+        # Modules skipped by the [limits] config or failed to parse do not stop the run
+        scanner.log_issues()
+        failures = sum(1 for issue in scanner.issues.values() if issue.kind == "failed")
             
-        if args.summary:
-            scanner.print_analysis_summary()
+        # Metrics are computed before the graph is narrowed down,
+        # so the couplings to the classes outside the focus are counted.
+        metrics = None
+        if args.metrics:
+            metrics = scanner.compute_metrics()
+            if args.focus:
+                metrics = metrics.focus(args.focus)
+        
+        if args.focus:
+            scanner.focus(args.focus)
+        
+        if args.reduce:
+            removed = scanner.graph.transitive_reduction()
+            logger.info(f"Transitive reduction removed {sum(removed.values())} redundant relations.")
+            for rel_type, count in removed.items():
+                logger.info(f"  * {rel_type}: {count}")
+        
+        if args.max_classes is not None:
+            total = len(scanner.graph.nodes)
+            scanner.limit_classes(args.max_classes, args.rank_by)
+            if len(scanner.graph.nodes) < total:
+                logger.info(f"Kept {len(scanner.graph.nodes)} of {total} classes ranked by {args.rank_by}.")
         
         outputs = 'outputs'
         output_path = args.output
@@ -55,27 +384,47 @@ def main():
         if not output_dir.exists():
             output_dir.mkdir(parents=True, exist_ok=True)
 
-        is_success = scanner.save_plantuml(output_path, args.title)
-        if is_success:
+        if metrics is not None:
+            from pyclassanalyzer.generators.metrics import save_metrics
+            for path in save_metrics(metrics, output_path, args.metrics):
+                logger.info(f"Saved: {path}")
+        
+        if args.queries:
+            logger.info(f"Saved: {scanner.save_queries(args.queries, output_path)}")
+        
+        if args.collapse_to:
+            if args.summary:
+                scanner.print_analysis_summary()
+            if not scanner.save_package_overview(output_path, collapse_depth, args.title):
+                logger.error(f"파일 저장 실패: {output_path}")
+                return 1
             scanner.print_graph_count()
-        else:
-            print(f"Error: 파일 저장 실패: {output_path}", file=sys.stderr)
-            return 1
+            return check_failures(failures, args.max_failures)
+        
+        # One traversal of the graph feeds every format and the summary
+        paths = scanner.save_outputs(output_path, formats, args.title, summary=args.summary)
+        for name, path in paths.items():
+            # PlantUML reports its own save, which is skipped when the diagram is unchanged
+            if name != 'plantuml':
+                logger.info(f"Saved: {path}")
+        
+        scanner.print_graph_count()
+        return check_failures(failures, args.max_failures)
     
     except KeyboardInterrupt:
-        print("\n사용자에 의해 중단되었습니다.", file=sys.stderr)
+        logger.error("사용자에 의해 중단되었습니다.")
         return 1
     except FileNotFoundError:
-        print(f"Error: 지정된 경로를 찾을 수 없습니다. toml", file=sys.stderr)
+        logger.error("지정된 경로를 찾을 수 없습니다. toml")
         return 1
     except PermissionError:
-        print(f"Error: 파일 접근 권한이 없습니다: {args.path}", file=sys.stderr)
+        logger.error(f"파일 접근 권한이 없습니다: {' '.join(args.path)}")
         return 1
     except toml.TomlDecodeError as e:
-        print(f"Error: TOML 파일 파싱 오류: {e}", file=sys.stderr)
+        logger.error(f"TOML 파일 파싱 오류: {e}")
         return 1
     except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
+        logger.error(str(e))
         return 1
     return 0
 
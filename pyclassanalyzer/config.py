@@ -1,26 +1,89 @@
+import copy
 import toml
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from pathlib import Path
 
+from pyclassanalyzer.utils.log import logger
+
+# Used for the keys missing in the given configuration
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "exclude": {
+        "directories": ["tests"],
+        "types": ["exception"],
+        "methods": ["magic"],
+        "relationships": [],
+        "classes": [],
+    },
+    "exception": {
+        "name": "*Exception",
+    },
+    # Detail of the class boxes in the diagrams (see `generators.plantuml.format_members`)
+    "members": {
+        "level": "all",
+        "max": 0,
+    },
+}
+
 def find_config_pathlib() -> Optional[Path]:
     config_path = Path.cwd() / "config.toml"
     return config_path
 
+
+def merge_config(defaults: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of `defaults` updated with `data`, table by table."""
+    merged = copy.deepcopy(defaults)
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
 class TomlConfig:
-    
-    def __init__(self) -> None:
-        self.path = find_config_pathlib()
+    """Configuration of the analysis.
+
+    Args:
+        source: Where the configuration comes from.
+            - None: `config.toml` of the working directory, or the defaults if there is none.
+            - str / Path: path of a TOML file.
+            - dict: the configuration itself, ex) {"exclude": {"directories": ["tests"]}}
+
+    The keys missing in the source are taken from `DEFAULT_CONFIG`.
+    A config object is never modified by the analysis, so it can be shared.
+    """
+
+    def __init__(self, source: Union[None, str, Path, Dict[str, Any]] = None) -> None:
+        self.path: Optional[Path] = None
         self.data:Dict[str,Any] = {}
+
+        if isinstance(source, dict):
+            self.data = merge_config(DEFAULT_CONFIG, source)
+            return
+
+        self.path = Path(source) if source is not None else find_config_pathlib()
+        if source is None and not self.path.is_file():
+            self.path = None
+            self.data = merge_config(DEFAULT_CONFIG, {})
+            return
         self._load()
-    
-    
+
+    @classmethod
+    def of(cls, config: Union[None, str, Path, Dict[str, Any], "TomlConfig"]) -> "TomlConfig":
+        """Return the config as a TomlConfig, keeping it if it is already one.
+        None is the defaults: unlike `TomlConfig()`, no config.toml is looked up in the working directory.
+        """
+        if isinstance(config, TomlConfig):
+            return config
+        return cls(config if config is not None else {})
+
     def _load(self) -> None:
         with open(self.path, 'r', encoding='utf-8') as f:
-            self.data = toml.load(f)
-    
+            self.data = merge_config(DEFAULT_CONFIG, toml.load(f))
+
     def get(self, key:str) -> Dict[str,Any]:
-        """Split by . 
+        """Split by .
 
         Args:
             key (str): _description_
@@ -30,16 +93,11 @@ class TomlConfig:
         """
         keys = key.split('.')
         current = self.data
-        
+
         try:
             for k in keys:
                 current = current[k]
             return current
         except (KeyError, TypeError):
-            print(f"Key error when parsing toml")
+            logger.debug(f"Key error when parsing toml: {key}")
             return {}
-    
-        
-            
-    
-    
\ No newline at end of file
@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, TextIO
+
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, Relation
+from pyclassanalyzer.utils.log import progress
+
+
+class Exporter(ABC):
+    """Streaming writer of the class graph.
+
+    An exporter does not walk the graph by itself.
+    It is fed node by node and relation by relation, so that several
+    exporters can share a single traversal (see `export()`).
+    The nodes are always written before the relations.
+    """
+    name: str = ""
+    extension: str = ""
+
+    def __init__(self, stream: TextIO, config=None, path: Optional[str] = None) -> None:
+        self.stream = stream
+        self._config = config
+        # Path of the stream, for the exporters writing companion files next to it
+        self.path = path
+
+    def begin(self, title: str) -> None:
+        pass
+
+    @abstractmethod
+    def write_node(self, node: ClassNode) -> None:
+        ...
+
+    @abstractmethod
+    def write_relation(self, relation: Relation) -> None:
+        ...
+
+    def end(self) -> None:
+        pass
+
+
+def export(class_graph: ClassGraph, exporters: Iterable[Exporter], config, title: str = "Class Diagram") -> None:
+    """Feed all the exporters from a single traversal of the class graph.
+
+    The `exclude.classes` and `exclude.relationships` configurations are
+    applied once here, so every output (PlantUML, exporters, summary)
+    sees the same filtered graph, and the cost stays close to one pass
+    whatever the number of outputs.
+
+    Args:
+        class_graph (ClassGraph): The class graph to export.
+        exporters (Iterable[Exporter]): The exporters to feed.
+        config: The configuration.
+        title (str): The title of the graph.
+    """
+    exporters: List[Exporter] = list(exporters)
+    class_exclusion_list = config.get('exclude')['classes'] or []
+    relation_exclusion_list = config.get('exclude')['relationships'] or []
+
+    for exporter in exporters:
+        exporter.begin(title)
+
+    with progress("emit", total=len(class_graph.nodes) + len(class_graph.relations), unit="items") as reporter:
+        excluded = set()
+        for node in class_graph.sorted_nodes():
+            reporter.advance()
+            if str(node.type_) in class_exclusion_list:
+                excluded.add(node.name)
+                continue
+            for exporter in exporters:
+                exporter.write_node(node)
+
+        for relation in class_graph.sorted_relations():
+            reporter.advance()
+            if relation.source in excluded or relation.target in excluded:
+                continue
+            if str(relation.type_) in relation_exclusion_list:
+                continue
+            for exporter in exporters:
+                exporter.write_relation(relation)
+
+    for exporter in exporters:
+        exporter.end()
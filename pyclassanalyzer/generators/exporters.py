@@ -0,0 +1,169 @@
+import json
+from typing import Dict, Any, Type
+from xml.sax.saxutils import escape, quoteattr
+
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, Relation, RelationType
+from pyclassanalyzer.generators.base import Exporter, export
+from pyclassanalyzer.generators.svg import SVGExporter
+from pyclassanalyzer.generators.html import HTMLExporter
+from pyclassanalyzer.generators.plantuml import PlantUMLExporter
+
+
+def node_to_dict(node: ClassNode) -> Dict[str, Any]:
+    """Convert a class node to a JSON-serializable dict."""
+    return {
+        "name": node.name,
+        "type": str(node.type_),
+        "annotations": list(node.annotations or []),
+        "attributes": sorted(node.attributes or []),
+        "functions": [
+            {"name": func.name, "fields": list(func.fields or [])}
+            for func in node.functions or []
+        ],
+    }
+
+
+def relation_to_dict(relation: Relation) -> Dict[str, str]:
+    """Convert a relation to a JSON-serializable dict."""
+    return {
+        "source": relation.source,
+        "target": relation.target,
+        "type": str(relation.type_),
+    }
+
+
+class JSONExporter(Exporter):
+    """Write `{"title", "nodes": [...], "relations": [...]}` as a single JSON document."""
+    name = "json"
+    extension = ".json"
+
+    def begin(self, title: str) -> None:
+        self.stream.write('{"title": %s, "nodes": [' % json.dumps(title))
+        self._first = True
+        self._in_relations = False
+
+    def _write_item(self, item: Dict[str, Any]) -> None:
+        if not self._first:
+            self.stream.write(", ")
+        self._first = False
+        self.stream.write(json.dumps(item))
+
+    def write_node(self, node: ClassNode) -> None:
+        self._write_item(node_to_dict(node))
+
+    def write_relation(self, relation: Relation) -> None:
+        if not self._in_relations:
+            self._open_relations()
+        self._write_item(relation_to_dict(relation))
+
+    def _open_relations(self) -> None:
+        self.stream.write('], "relations": [')
+        self._first = True
+        self._in_relations = True
+
+    def end(self) -> None:
+        if not self._in_relations:
+            self._open_relations()
+        self.stream.write("]}\n")
+
+
+class JSONLinesExporter(Exporter):
+    """Write one JSON object per line, tagged with `kind` (node or relation)."""
+    name = "jsonl"
+    extension = ".jsonl"
+
+    def write_node(self, node: ClassNode) -> None:
+        self.stream.write(json.dumps({"kind": "node", **node_to_dict(node)}) + "\n")
+
+    def write_relation(self, relation: Relation) -> None:
+        self.stream.write(json.dumps({"kind": "relation", **relation_to_dict(relation)}) + "\n")
+
+
+class GraphMLExporter(Exporter):
+    name = "graphml"
+    extension = ".graphml"
+
+    def begin(self, title: str) -> None:
+        self.stream.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="type" for="node" attr.name="type" attr.type="string"/>\n'
+            '  <key id="attributes" for="node" attr.name="attributes" attr.type="string"/>\n'
+            '  <key id="functions" for="node" attr.name="functions" attr.type="string"/>\n'
+            '  <key id="relation" for="edge" attr.name="type" attr.type="string"/>\n'
+            f'  <graph id={quoteattr(title)} edgedefault="directed">\n'
+        )
+
+    def write_node(self, node: ClassNode) -> None:
+        attributes = ",".join(sorted(node.attributes or []))
+        functions = ",".join(func.name for func in node.functions or [])
+        self.stream.write(
+            f'    <node id={quoteattr(node.name)}>'
+            f'<data key="type">{escape(str(node.type_))}</data>'
+            f'<data key="attributes">{escape(attributes)}</data>'
+            f'<data key="functions">{escape(functions)}</data>'
+            '</node>\n'
+        )
+
+    def write_relation(self, relation: Relation) -> None:
+        self.stream.write(
+            f'    <edge source={quoteattr(relation.source)} target={quoteattr(relation.target)}>'
+            f'<data key="relation">{escape(str(relation.type_))}</data>'
+            '</edge>\n'
+        )
+
+    def end(self) -> None:
+        self.stream.write("  </graph>\n</graphml>\n")
+
+
+def dot_quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class DOTExporter(Exporter):
+    """Write a Graphviz digraph. Edges are styled like the PlantUML relation symbols."""
+    name = "dot"
+    extension = ".dot"
+
+    edge_styles = {
+        RelationType.INHERITANCE: "arrowhead=empty",
+        RelationType.COMPOSITION: "dir=both, arrowtail=diamond, arrowhead=none",
+        RelationType.AGGREGATION: "dir=both, arrowtail=odiamond, arrowhead=none",
+        RelationType.DEPENDENCY: "style=dashed, arrowhead=vee",
+        RelationType.REALIZATION: "style=dashed, arrowhead=empty",
+    }
+
+    def begin(self, title: str) -> None:
+        self.stream.write(
+            f"digraph {dot_quote(title)} {{\n"
+            f"  label={dot_quote(title)};\n"
+            "  node [shape=box];\n"
+        )
+
+    def write_node(self, node: ClassNode) -> None:
+        label = node.name if node.type_.value == "class" else f"«{node.type_}»\n{node.name}"
+        self.stream.write(
+            f"  {dot_quote(node.name)} [label={dot_quote(label)}, type={dot_quote(str(node.type_))}];\n"
+        )
+
+    def write_relation(self, relation: Relation) -> None:
+        style = self.edge_styles.get(relation.type_, "")
+        attrs = f"type={dot_quote(str(relation.type_))}" + (f", {style}" if style else "")
+        self.stream.write(
+            f"  {dot_quote(relation.source)} -> {dot_quote(relation.target)} [{attrs}];\n"
+        )
+
+    def end(self) -> None:
+        self.stream.write("}\n")
+
+
+EXPORTERS: Dict[str, Type[Exporter]] = {
+    exporter.name: exporter
+    for exporter in (PlantUMLExporter, JSONExporter, JSONLinesExporter, GraphMLExporter, DOTExporter, SVGExporter, HTMLExporter)
+}
+
+
+def get_exporter(name: str) -> Type[Exporter]:
+    if name not in EXPORTERS:
+        raise ValueError(f"Unsupported format: {name} (supported: {', '.join(EXPORTERS)})")
+    return EXPORTERS[name]
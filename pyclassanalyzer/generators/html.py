@@ -0,0 +1,478 @@
+import json
+import os
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from pyclassanalyzer.network.classgraph import ClassNode, Relation
+from pyclassanalyzer.generators.base import Exporter
+from pyclassanalyzer.generators.manifest import OutputManifest
+from pyclassanalyzer.generators.plantuml import format_members, member_detail
+
+# Classes and relations per chunk file. A package larger than this is split
+# into several parts, so the memory of the pass does not grow with the graph.
+CHUNK_SIZE = 500
+# The chunks are written next to the page, in `<name>_files/`
+FILES_SUFFIX = "_files"
+INDEX_NAME = "index.js"
+# Name shown for the modules outside any package
+TOP_LEVEL = "(top level)"
+
+
+def chunk_name(package_id: int, part: int) -> str:
+    return f"p{package_id}_{part}.js"
+
+
+def script(callback: str, data: Any) -> str:
+    # Chunks are scripts rather than .json files, so the page also works
+    # when opened from the disk (browsers block fetch() on file:// URLs)
+    return f"pyclassanalyzer.{callback}({json.dumps(data, separators=(',', ':'))});\n"
+
+
+class HTMLExporter(Exporter):
+    """Write an interactive viewer for very large graphs.
+
+    The page is small and self-contained. The graph is split by package
+    into chunk files that the browser loads only when a package is
+    expanded or a class of it is shown, so a graph of tens of thousands
+    of classes opens instantly. `index.js` holds the package list and the
+    class names, for the package tree and the search.
+
+    The chunks are written while the graph is streamed: the classes and
+    relations of a package are buffered until `CHUNK_SIZE` of them are
+    collected. A relation is stored in the chunks of both of its packages,
+    so the neighbors of a class are known as soon as its package is loaded.
+    Unchanged chunks are not written again (see `OutputManifest`).
+    """
+    name = "html"
+    extension = ".html"
+
+    def __init__(self, stream, config=None, path: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> None:
+        super().__init__(stream, config=config, path=path or getattr(stream, 'name', None))
+        if not isinstance(self.path, str):
+            raise ValueError("The html format needs an output file path to write its chunks next to it")
+        self.chunk_size = chunk_size
+        self.files_dir = str(Path(self.path).with_name(Path(self.path).stem + FILES_SUFFIX))
+
+    def begin(self, title: str) -> None:
+        self._title = title
+        self._exclude_magic = False
+        if self._config is not None:
+            self._exclude_magic = 'magic' in self._config.get('exclude')['methods']
+        self._level, self._limit = member_detail(self._config)
+
+        os.makedirs(self.files_dir, exist_ok=True)
+        self._manifest = OutputManifest.load(self.files_dir)
+        self._written: Set[str] = set()
+        self._changed = False
+
+        self._packages: Dict[str, int] = {}
+        self._class_counts: List[int] = []
+        self._parts: List[int] = []
+        self._buffers: Dict[int, Dict[str, list]] = {}
+        # class name -> package id, also the class list of the index
+        self._package_of: Dict[str, int] = {}
+
+    def _package_id(self, package: str) -> int:
+        if package not in self._packages:
+            self._packages[package] = len(self._packages)
+            self._class_counts.append(0)
+            self._parts.append(0)
+        return self._packages[package]
+
+    def _append(self, package_id: int, kind: str, item: Any) -> None:
+        buffer = self._buffers.setdefault(package_id, {"nodes": [], "relations": []})
+        buffer[kind].append(item)
+        if len(buffer["nodes"]) + len(buffer["relations"]) >= self.chunk_size:
+            self._flush(package_id)
+
+    def _flush(self, package_id: int) -> None:
+        buffer = self._buffers.pop(package_id)
+        part = self._parts[package_id]
+        self._parts[package_id] += 1
+
+        name = chunk_name(package_id, part)
+        self._write(name, script("load", {"package": package_id, "part": part, **buffer}))
+
+    def _write(self, name: str, content: str) -> None:
+        self._changed |= self._manifest.write(os.path.join(self.files_dir, name), content)
+        self._written.add(name)
+
+    def write_node(self, node: ClassNode) -> None:
+        package = (node.module.package if node.module else None) or TOP_LEVEL
+        package_id = self._package_id(package)
+        self._class_counts[package_id] += 1
+        self._package_of[node.name] = package_id
+
+        attributes, methods = format_members(node, exclude_magic=self._exclude_magic,
+                                             level=self._level, limit=self._limit)
+        self._append(package_id, "nodes", {
+            "name": node.name,
+            "type": str(node.type_),
+            "module": node.module.name if node.module else None,
+            "attributes": attributes,
+            "methods": methods,
+        })
+
+    def write_relation(self, relation: Relation) -> None:
+        item = [relation.source, relation.target, str(relation.type_)]
+        source = self._package_of.get(relation.source)
+        target = self._package_of.get(relation.target)
+        for package_id in {source, target} - {None}:
+            self._append(package_id, "relations", item)
+
+    def end(self) -> None:
+        for package_id in list(self._buffers):
+            self._flush(package_id)
+
+        index = {
+            "title": self._title,
+            "packages": [
+                {"name": package, "classes": self._class_counts[i], "parts": self._parts[i]}
+                for package, i in self._packages.items()
+            ],
+            "classes": [[name, package_id] for name, package_id in self._package_of.items()],
+        }
+        self._write(INDEX_NAME, script("index", index))
+
+        # Chunks of packages that are gone or got smaller since the last run
+        for name in os.listdir(self.files_dir):
+            if name.endswith(".js") and name not in self._written:
+                os.remove(os.path.join(self.files_dir, name))
+                self._manifest.files.pop(name, None)
+                self._changed = True
+        if self._changed:
+            self._manifest.save(self.files_dir)
+
+        page = VIEWER.replace("__TITLE__", escape(self._title))
+        page = page.replace("__FILES__", json.dumps(os.path.basename(self.files_dir)))
+        self.stream.write(page)
+
+
+VIEWER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { margin: 0; display: flex; height: 100vh; font: 13px sans-serif; color: #222; }
+#side { width: 320px; display: flex; flex-direction: column; border-right: 1px solid #ccc; }
+#side h1 { font-size: 15px; margin: 10px; }
+#search { margin: 0 10px 10px; padding: 6px; }
+#results, #tree { overflow: auto; padding: 0 10px; }
+#results { max-height: 35%; }
+#tree { flex: 1; border-top: 1px solid #eee; }
+ul { list-style: none; margin: 0; padding-left: 14px; }
+li > span { cursor: pointer; white-space: nowrap; }
+.package::before { content: "\\25B8 "; color: #888; }
+.package.open::before { content: "\\25BE "; }
+.class { color: #0645ad; }
+.count { color: #888; }
+#main { flex: 1; display: flex; flex-direction: column; }
+#toolbar { padding: 8px; border-bottom: 1px solid #ccc; }
+#view { flex: 1; display: flex; overflow: hidden; }
+#graph { flex: 1; overflow: auto; }
+#details { width: 300px; overflow: auto; padding: 8px; border-left: 1px solid #eee; }
+#details h2 { font-size: 14px; word-break: break-all; }
+#details pre { margin: 0; font-size: 12px; }
+svg text { font-size: 11px; cursor: pointer; }
+svg .focus rect { stroke-width: 2.5; }
+line { stroke: #A80036; }
+line.dependency, line.realization { stroke-dasharray: 5,3; }
+line.inheritance { stroke: #2a6; }
+</style>
+</head>
+<body>
+<div id="side">
+<h1>__TITLE__</h1>
+<input id="search" placeholder="Search classes">
+<div id="results"></div>
+<div id="tree"></div>
+</div>
+<div id="main">
+<div id="toolbar">
+<button id="expand" disabled>Expand neighbors</button>
+<button id="reset" disabled>Reset</button>
+<span id="status"></span>
+</div>
+<div id="view"><div id="graph"></div><div id="details"></div></div>
+</div>
+<script>
+(function () {
+  "use strict";
+  var FILES = __FILES__;
+  // Classes drawn at most around the focused class
+  var MAX_NODES = 150;
+  var COLORS = { "class": "#ADD1B2", "enum": "#EB937F", "abstract": "#A9DCDF", "dataclass": "#FFDD55", "exception": "#FF7700" };
+  var state = { index: null, packageOf: {}, members: {}, loaded: {}, pending: {},
+                classes: {}, outgoing: {}, incoming: {}, seen: {}, focus: null, depth: 1 };
+
+  function $(id) { return document.getElementById(id); }
+  function element(tag, text, className) {
+    var node = document.createElement(tag);
+    if (text !== undefined) node.textContent = text;
+    if (className) node.className = className;
+    return node;
+  }
+  function push(map, key, value) { (map[key] = map[key] || []).push(value); }
+  function loadScript(name) {
+    var node = document.createElement("script");
+    node.src = FILES + "/" + name;
+    document.head.appendChild(node);
+  }
+
+  window.pyclassanalyzer = {
+    index: function (data) {
+      state.index = data;
+      data.classes.forEach(function (entry) {
+        state.packageOf[entry[0]] = entry[1];
+        push(state.members, entry[1], entry[0]);
+      });
+      renderTree();
+      $("status").textContent = data.classes.length + " classes in " + data.packages.length + " packages";
+    },
+    load: function (chunk) {
+      chunk.nodes.forEach(function (node) { state.classes[node.name] = node; });
+      chunk.relations.forEach(function (relation) {
+        var key = relation.join("\\u0000");
+        if (state.seen[key]) return;
+        state.seen[key] = true;
+        push(state.outgoing, relation[0], relation);
+        push(state.incoming, relation[1], relation);
+      });
+      var pending = state.pending[chunk.package];
+      pending.remaining -= 1;
+      if (pending.remaining === 0) {
+        delete state.pending[chunk.package];
+        state.loaded[chunk.package] = true;
+        pending.callbacks.forEach(function (callback) { callback(); });
+      }
+    }
+  };
+
+  function loadPackage(id, callback) {
+    if (state.loaded[id]) { callback(); return; }
+    if (state.pending[id]) { state.pending[id].callbacks.push(callback); return; }
+    var parts = state.index.packages[id].parts;
+    state.pending[id] = { remaining: parts, callbacks: [callback] };
+    for (var part = 0; part < parts; part++) loadScript("p" + id + "_" + part + ".js");
+  }
+
+  function loadPackages(ids, callback) {
+    var left = ids.length;
+    if (!left) { callback(); return; }
+    ids.forEach(function (id) { loadPackage(id, function () { if (--left === 0) callback(); }); });
+  }
+
+  function packagesOf(names) {
+    var ids = {};
+    names.forEach(function (name) { if (name in state.packageOf) ids[state.packageOf[name]] = true; });
+    return Object.keys(ids).map(Number);
+  }
+
+  function neighbors(name) {
+    var found = [];
+    (state.outgoing[name] || []).forEach(function (relation) { found.push(relation[1]); });
+    (state.incoming[name] || []).forEach(function (relation) { found.push(relation[0]); });
+    return found;
+  }
+
+  // Package tree: children are rendered, and chunks loaded, only when a package is expanded
+  function renderTree() {
+    var root = { children: {}, id: null };
+    state.index.packages.forEach(function (pkg, id) {
+      var node = root;
+      pkg.name.split(".").forEach(function (part) {
+        node = node.children[part] = node.children[part] || { children: {}, id: null };
+      });
+      node.id = id;
+    });
+    $("tree").appendChild(renderChildren(root, ""));
+  }
+
+  function renderChildren(node, prefix) {
+    var list = element("ul");
+    Object.keys(node.children).sort().forEach(function (part) {
+      var child = node.children[part];
+      var name = prefix ? prefix + "." + part : part;
+      var item = element("li");
+      var label = element("span", part, "package");
+      if (child.id !== null) label.appendChild(element("span", " " + state.index.packages[child.id].classes, "count"));
+      label.onclick = function () {
+        if (item.childNodes.length > 1) {
+          item.removeChild(item.lastChild);
+          label.classList.remove("open");
+          return;
+        }
+        label.classList.add("open");
+        var content = renderChildren(child, name);
+        item.appendChild(content);
+        if (child.id !== null) {
+          loadPackage(child.id, function () {
+            (state.members[child.id] || []).forEach(function (className) {
+              var entry = element("li");
+              entry.appendChild(classLink(className));
+              content.appendChild(entry);
+            });
+          });
+        }
+      };
+      item.appendChild(label);
+      list.appendChild(item);
+    });
+    return list;
+  }
+
+  function classLink(name) {
+    var link = element("span", name, "class");
+    link.onclick = function () { focus(name, 1); };
+    return link;
+  }
+
+  $("search").oninput = function () {
+    var query = this.value.toLowerCase();
+    var results = $("results");
+    results.textContent = "";
+    if (!query || !state.index) return;
+    var shown = 0;
+    for (var i = 0; i < state.index.classes.length && shown < 50; i++) {
+      var name = state.index.classes[i][0];
+      if (name.toLowerCase().indexOf(query) < 0) continue;
+      var item = element("div");
+      item.appendChild(classLink(name));
+      results.appendChild(item);
+      shown++;
+    }
+  };
+
+  // Classes within `depth` hops of the focused class, loading the packages level by level
+  function neighborhood(start, depth, callback) {
+    var distance = {};
+    distance[start] = 0;
+    var frontier = [start];
+    var level = 0;
+    var count = 1;
+    function step() {
+      if (level === depth || !frontier.length) { callback(distance); return; }
+      loadPackages(packagesOf(frontier), function () {
+        var next = [];
+        frontier.forEach(function (name) {
+          neighbors(name).forEach(function (other) {
+            if (other in distance || count >= MAX_NODES) return;
+            distance[other] = level + 1;
+            next.push(other);
+            count++;
+          });
+        });
+        level++;
+        frontier = next;
+        step();
+      });
+    }
+    step();
+  }
+
+  function focus(name, depth) {
+    state.focus = name;
+    state.depth = depth;
+    $("expand").disabled = $("reset").disabled = false;
+    $("status").textContent = "Loading...";
+    neighborhood(name, depth, function (distance) {
+      loadPackages(packagesOf([name]), function () {
+        draw(distance);
+        showDetails(name);
+        var shown = Object.keys(distance).length;
+        $("status").textContent = shown + " classes within " + depth + " hops of " + name +
+          (shown >= MAX_NODES ? " (truncated)" : "");
+      });
+    });
+  }
+
+  $("expand").onclick = function () { focus(state.focus, state.depth + 1); };
+  $("reset").onclick = function () { focus(state.focus, 1); };
+
+  function draw(distance) {
+    var rings = [];
+    Object.keys(distance).forEach(function (name) { push(rings, distance[name], name); });
+    var radius = 170;
+    var size = 2 * radius * (rings.length - 1) + 300;
+    var center = size / 2;
+    var position = {};
+    rings.forEach(function (names, level) {
+      names.sort();
+      names.forEach(function (name, i) {
+        var angle = 2 * Math.PI * i / names.length + level * 0.4;
+        position[name] = [center + level * radius * Math.cos(angle), center + level * radius * Math.sin(angle)];
+      });
+    });
+
+    var svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="' + size + '" height="' + size + '">'];
+    Object.keys(position).forEach(function (name) {
+      (state.outgoing[name] || []).forEach(function (relation) {
+        var target = position[relation[1]];
+        if (!target) return;
+        var source = position[name];
+        svg.push('<line class="' + relation[2] + '" x1="' + source[0] + '" y1="' + source[1] +
+                 '" x2="' + target[0] + '" y2="' + target[1] + '"><title>' + relation[2] + '</title></line>');
+      });
+    });
+    svg.push("</svg>");
+    var graph = $("graph");
+    graph.innerHTML = svg.join("");
+
+    var canvas = graph.firstChild;
+    Object.keys(position).forEach(function (name) {
+      var cls = state.classes[name];
+      var group = document.createElementNS("http://www.w3.org/2000/svg", "g");
+      if (name === state.focus) group.setAttribute("class", "focus");
+      var label = document.createElementNS("http://www.w3.org/2000/svg", "text");
+      label.textContent = name.split(".").pop();
+      var width = label.textContent.length * 6.5 + 12;
+      var rect = document.createElementNS("http://www.w3.org/2000/svg", "rect");
+      var x = position[name][0], y = position[name][1];
+      rect.setAttribute("x", x - width / 2);
+      rect.setAttribute("y", y - 10);
+      rect.setAttribute("width", width);
+      rect.setAttribute("height", 20);
+      rect.setAttribute("fill", cls ? COLORS[cls.type] || COLORS["class"] : "#eee");
+      rect.setAttribute("stroke", "#A80036");
+      label.setAttribute("x", x);
+      label.setAttribute("y", y + 4);
+      label.setAttribute("text-anchor", "middle");
+      var title = document.createElementNS("http://www.w3.org/2000/svg", "title");
+      title.textContent = name;
+      group.appendChild(title);
+      group.appendChild(rect);
+      group.appendChild(label);
+      group.onclick = function () { focus(name, 1); };
+      canvas.appendChild(group);
+    });
+  }
+
+  function showDetails(name) {
+    var details = $("details");
+    details.textContent = "";
+    var cls = state.classes[name];
+    details.appendChild(element("h2", name));
+    if (!cls) return;
+    details.appendChild(element("div", cls.type + (cls.module ? " in " + cls.module : "")));
+    [["Attributes", cls.attributes], ["Methods", cls.methods]].forEach(function (section) {
+      details.appendChild(element("h3", section[0]));
+      details.appendChild(element("pre", section[1].join("\\n") || "-"));
+    });
+    [["Outgoing", state.outgoing[name] || [], 1], ["Incoming", state.incoming[name] || [], 0]].forEach(function (section) {
+      details.appendChild(element("h3", section[0] + " (" + section[1].length + ")"));
+      section[1].forEach(function (relation) {
+        var item = element("div", relation[2] + " ");
+        item.appendChild(classLink(relation[section[2]]));
+        details.appendChild(item);
+      });
+    });
+  }
+
+  loadScript("index.js");
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,359 @@
+import time
+from typing import Dict, List, Tuple, Iterable
+
+from pyclassanalyzer.network.classgraph import Relation, RelationType
+
+Point = Tuple[float, float]
+# Relations drawn from the child up to the parent
+INHERITANCE_TYPES = (RelationType.INHERITANCE, RelationType.REALIZATION)
+
+
+class Layout:
+    """Result of a layered layout.
+
+    Attributes:
+        boxes: class name -> (x, y, width, height) of its box.
+        edges: the relations with the polyline points to draw them.
+        width, height: the size of the drawing.
+        crossings: the number of edge crossings between adjacent layers.
+    """
+
+    def __init__(self) -> None:
+        self.boxes: Dict[str, Tuple[float, float, float, float]] = {}
+        self.edges: List[Tuple[Relation, List[Point]]] = []
+        self.width: float = 0
+        self.height: float = 0
+        self.crossings: int = 0
+
+
+class LayeredLayout:
+    """Sugiyama-style layered layout of a class diagram.
+
+    1. Ranking: classes are layered by all their relations: parents above
+       children, and the other relations from their source down to their target
+       (ex. owner above part), following a topological order.
+       Cycles are broken by ignoring back edges, the inheritance edges being
+       followed first so the hierarchies keep their direction.
+    2. Normalization: edges spanning several layers are split by dummy vertices.
+    3. Crossing reduction: layers are reordered by the barycenter of their
+       neighbors in alternating down/up sweeps, keeping the best ordering.
+    4. Coordinates: vertices are pulled towards their neighbors
+       without overlapping, and wide layers are wrapped into several rows.
+
+    Steps 3 and 4 stop as soon as `time_budget` seconds are spent,
+    so the layout of very large graphs stays bounded.
+
+    Since every relation takes part in the ranking, an edge always spans
+    at least one layer. Edges between two classes of the same layer (with
+    a ranking overridden by a subclass) are still routed through the gap
+    above the layer instead of across its boxes.
+    """
+
+    def __init__(self, time_budget: float = 2.0, max_sweeps: int = 24,
+                 h_gap: float = 30, v_gap: float = 60, dummy_gap: float = 10,
+                 max_row_width: float = 8000, max_dummies: int = 200000, margin: float = 20) -> None:
+        self.time_budget = time_budget
+        self.max_sweeps = max_sweeps
+        self.h_gap = h_gap
+        self.v_gap = v_gap
+        self.dummy_gap = dummy_gap
+        self.max_row_width = max_row_width
+        self.max_dummies = max_dummies
+        self.margin = margin
+
+    def layout(self, sizes: Dict[str, Tuple[float, float]], relations: Iterable[Relation]) -> Layout:
+        """Lay out the classes.
+
+        Args:
+            sizes (Dict[str, Tuple[float, float]]): class name -> (width, height) of its box.
+            relations (Iterable[Relation]): The relations between the classes.
+
+        Returns:
+            Layout: The positions of the boxes and the edge routes.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        relations = [rel for rel in relations
+                     if rel.source in sizes and rel.target in sizes and rel.source != rel.target]
+
+        order, rank = self._rank(list(sizes), relations)
+
+        # Vertices are indexed; the classes come first, then the dummies.
+        names = order
+        index = {name: i for i, name in enumerate(names)}
+        vertex_rank = [rank[name] for name in names]
+        widths = [sizes[name][0] for name in names]
+        heights = [sizes[name][1] for name in names]
+
+        up: List[List[int]] = [[] for _ in names]
+        down: List[List[int]] = [[] for _ in names]
+        chains: List[Tuple[Relation, List[int]]] = []
+        # Edges whose ends are in the same layer, routed around the boxes
+        same_layer: List[Relation] = []
+
+        for rel in relations:
+            u, v = index[rel.source], index[rel.target]
+            chain = [u]
+            # Walk from the source to the target, one layer at a time
+            step = 1 if vertex_rank[v] > vertex_rank[u] else -1
+            current = u
+            span = abs(vertex_rank[v] - vertex_rank[u])
+            if span == 0:
+                same_layer.append(rel)
+                continue
+            if span > 1 and len(vertex_rank) - len(names) + span - 1 > self.max_dummies:
+                span = 0  # too many dummies: draw the edge straight
+            if span:
+                for r in range(vertex_rank[u] + step, vertex_rank[v], step):
+                    dummy = len(vertex_rank)
+                    vertex_rank.append(r)
+                    widths.append(0)
+                    heights.append(0)
+                    up.append([])
+                    down.append([])
+                    self._link(current, dummy, vertex_rank, up, down)
+                    chain.append(dummy)
+                    current = dummy
+                self._link(current, v, vertex_rank, up, down)
+            chain.append(v)
+            chains.append((rel, chain))
+
+        layer_count = max(vertex_rank, default=-1) + 1
+        layers: List[List[int]] = [[] for _ in range(layer_count)]
+        for vertex, r in enumerate(vertex_rank):
+            layers[r].append(vertex)
+
+        crossings = self._reduce_crossings(layers, up, down, deadline)
+        xs, ys = self._assign_coordinates(layers, up, down, widths, heights, deadline)
+
+        result = Layout()
+        result.crossings = crossings
+        for name in names:
+            i = index[name]
+            result.boxes[name] = (xs[i], ys[i], widths[i], heights[i])
+
+        for rel, chain in chains:
+            points = [(xs[i] + widths[i] / 2, ys[i] + heights[i] / 2) for i in chain]
+            points[0] = clip(result.boxes[rel.source], points[1])
+            points[-1] = clip(result.boxes[rel.target], points[-2])
+            result.edges.append((rel, points))
+        for k, rel in enumerate(same_layer):
+            result.edges.append((rel, self._route_around(result.boxes[rel.source], result.boxes[rel.target], k)))
+
+        if result.boxes:
+            result.width = max(x + w for x, _, w, _ in result.boxes.values()) + self.margin
+            result.height = max(y + h for _, y, _, h in result.boxes.values()) + self.margin
+        return result
+
+    @staticmethod
+    def _link(a: int, b: int, rank: List[int], up: List[List[int]], down: List[List[int]]) -> None:
+        if rank[a] < rank[b]:
+            down[a].append(b)
+            up[b].append(a)
+        else:
+            up[a].append(b)
+            down[b].append(a)
+
+    def _route_around(self, source: Tuple[float, float, float, float],
+                      target: Tuple[float, float, float, float], k: int) -> List[Point]:
+        """Route an edge between two boxes of the same layer through the gap above
+        the lower of their rows (the same row unless the layer was wrapped).
+        `k` staggers the height of the parallel routes.
+        """
+        sx, sy, sw, sh = source
+        tx, ty, tw, th = target
+        offset = min(self.v_gap / 2, self.margin, 8 + 6 * (k % 4))
+        y = max(sy, ty) - offset
+        # Leave each box by its top when it is in the lower row, by its bottom otherwise
+        start = (sx + sw / 2, sy if sy >= ty else sy + sh)
+        end = (tx + tw / 2, ty if ty >= sy else ty + th)
+        return [start, (start[0], y), (end[0], y), end]
+
+    def _rank(self, names: List[str], relations: List[Relation]) -> Tuple[List[str], Dict[str, int]]:
+        """Rank the classes, parents and relation sources first.
+
+        Returns:
+            Tuple[List[str], Dict[str, int]]: The topological order and the rank of each class.
+        """
+        # class -> the classes to place above it, the inheritance edges first
+        parents: Dict[str, List[str]] = {name: [] for name in names}
+        for rel in relations:
+            if rel.type_ in INHERITANCE_TYPES:
+                parents[rel.source].append(rel.target)
+        for rel in relations:
+            if rel.type_ not in INHERITANCE_TYPES:
+                parents[rel.target].append(rel.source)
+
+        # Iterative post-order DFS over child -> parent edges:
+        # parents finish before their children.
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1: on stack, 2: done
+        for start in names:
+            if start in state:
+                continue
+            state[start] = 1
+            stack = [(start, iter(parents[start]))]
+            while stack:
+                node, it = stack[-1]
+                for parent in it:
+                    if parent not in state:
+                        state[parent] = 1
+                        stack.append((parent, iter(parents[parent])))
+                        break
+                else:
+                    stack.pop()
+                    state[node] = 2
+                    order.append(node)
+
+        rank: Dict[str, int] = {}
+        for name in order:
+            # A parent without rank yet is reached by a back edge of a cycle
+            ranked = [rank[p] for p in parents[name] if p in rank]
+            rank[name] = max(ranked) + 1 if ranked else 0
+        return order, rank
+
+    def _reduce_crossings(self, layers: List[List[int]], up: List[List[int]], down: List[List[int]],
+                          deadline: float) -> int:
+        position = [0] * len(up)
+        for layer in layers:
+            for i, v in enumerate(layer):
+                position[v] = i
+
+        best = count_crossings(layers, down, position)
+        best_layers = [list(layer) for layer in layers]
+        stale = 0
+
+        for sweep in range(self.max_sweeps):
+            if best == 0 or time.perf_counter() > deadline:
+                break
+
+            if sweep % 2 == 0:
+                indices, neighbors = range(1, len(layers)), up
+            else:
+                indices, neighbors = range(len(layers) - 2, -1, -1), down
+
+            for i in indices:
+                layer = layers[i]
+                keys = {}
+                for v in layer:
+                    adjacent = neighbors[v]
+                    if adjacent:
+                        keys[v] = (sum(position[a] for a in adjacent) / len(adjacent), position[v])
+                    else:
+                        keys[v] = (position[v], position[v])
+                layer.sort(key=keys.__getitem__)
+                for j, v in enumerate(layer):
+                    position[v] = j
+
+            crossings = count_crossings(layers, down, position)
+            if crossings < best:
+                best = crossings
+                best_layers = [list(layer) for layer in layers]
+                stale = 0
+            else:
+                stale += 1
+                if stale >= 2:
+                    break
+
+        layers[:] = best_layers
+        return best
+
+    def _assign_coordinates(self, layers: List[List[int]], up: List[List[int]], down: List[List[int]],
+                            widths: List[float], heights: List[float],
+                            deadline: float) -> Tuple[List[float], List[float]]:
+        xs = [0.0] * len(widths)
+        ys = [0.0] * len(widths)
+
+        def gap(v: int) -> float:
+            return self.h_gap if widths[v] else self.dummy_gap
+
+        # Pack each layer, wrapping it into rows when it is too wide
+        rows: List[List[int]] = []
+        for layer in layers:
+            row: List[int] = []
+            right = self.margin
+            for v in layer:
+                if row and right + widths[v] > self.max_row_width:
+                    rows.append(row)
+                    row, right = [], self.margin
+                xs[v] = right
+                right += widths[v] + gap(v)
+                row.append(v)
+            rows.append(row)
+
+        # Pull the vertices towards the center of their neighbors.
+        # Only rows that were not wrapped take part, since a wrapped layer
+        # has no meaningful horizontal alignment.
+        wrapped = len(rows) != len(layers)
+        for iteration in range(4 if not wrapped else 0):
+            if time.perf_counter() > deadline:
+                break
+            indices = range(len(rows)) if iteration % 2 == 0 else range(len(rows) - 1, -1, -1)
+            for i in indices:
+                right = self.margin
+                for v in rows[i]:
+                    adjacent = up[v] + down[v]
+                    x = xs[v]
+                    if adjacent:
+                        center = sum(xs[a] + widths[a] / 2 for a in adjacent) / len(adjacent)
+                        x = center - widths[v] / 2
+                    xs[v] = max(x, right)
+                    right = xs[v] + widths[v] + gap(v)
+
+        top = self.margin
+        for row in rows:
+            height = max((heights[v] for v in row), default=0)
+            for v in row:
+                ys[v] = top
+            top += height + self.v_gap
+
+        # Normalize to the left margin
+        if xs:
+            shift = min(xs) - self.margin
+            xs = [x - shift for x in xs]
+        return xs, ys
+
+
+def count_crossings(layers: List[List[int]], down: List[List[int]], position: List[int]) -> int:
+    """Count the crossings between each pair of adjacent layers
+    as the inversions of the edge endpoints, in O(E log V).
+    """
+    total = 0
+    for layer in layers[:-1]:
+        targets = []
+        for v in layer:  # the layer is already sorted by position
+            targets.extend(sorted(position[w] for w in down[v]))
+        if len(targets) < 2:
+            continue
+
+        # Fenwick tree over the positions of the lower layer
+        size = max(targets) + 1
+        tree = [0] * (size + 1)
+        seen = 0
+        for t in targets:
+            # the number of endpoints already seen to the right of t
+            i, not_greater = t + 1, 0
+            while i > 0:
+                not_greater += tree[i]
+                i -= i & -i
+            total += seen - not_greater
+            i = t + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+            seen += 1
+    return total
+
+
+def clip(box: Tuple[float, float, float, float], toward: Point) -> Point:
+    """Return the point where the line from the center of `box` to `toward` leaves the box."""
+    x, y, w, h = box
+    cx, cy = x + w / 2, y + h / 2
+    dx, dy = toward[0] - cx, toward[1] - cy
+    if dx == 0 and dy == 0:
+        return cx, cy
+
+    scale = min(
+        (w / 2) / abs(dx) if dx else float("inf"),
+        (h / 2) / abs(dy) if dy else float("inf"),
+    )
+    return cx + dx * scale, cy + dy * scale
@@ -0,0 +1,126 @@
+import hashlib
+import os
+from typing import Dict
+
+from pydantic import BaseModel
+
+MANIFEST_NAME = ".pyclassanalyzer-manifest.json"
+
+
+class ManifestEntry(BaseModel):
+    fingerprint: str
+    # Stamp of the written file, to notice the files modified by someone else
+    mtime: int
+    size: int
+
+
+class OutputManifest(BaseModel):
+    """Fingerprints of the files written to an output directory.
+
+    The outputs are generated deterministically, so the fingerprint of the
+    content identifies the (sub)graph together with the configuration and
+    the title it was drawn with. A renderer can compare the fingerprints
+    with the ones it has rendered to process only the changed diagrams.
+
+    Attributes:
+        files: file name -> fingerprint of its content and stamp of the file.
+    """
+    files: Dict[str, ManifestEntry] = {}
+
+    @classmethod
+    def load(cls, directory: str) -> "OutputManifest":
+        """Load the manifest of a directory, or an empty one if it is missing or broken."""
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                return cls.model_validate_json(f.read())
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, directory: str) -> None:
+        path = os.path.join(directory, MANIFEST_NAME)
+        # Write to a temporary file first, so an interrupted run never leaves a broken manifest
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.model_dump_json(indent=2))
+        os.replace(temp_path, path)
+
+    def is_current(self, path: str, fingerprint: str) -> bool:
+        """Check if the file on disk was written with this fingerprint and was not modified since."""
+        entry = self.files.get(os.path.basename(path))
+        if entry is None or entry.fingerprint != fingerprint:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (entry.mtime, entry.size)
+
+    def write(self, path: str, content: str) -> bool:
+        """Write the content unless the file already holds it, and record it.
+        The manifest itself is not saved, so many files can be written before one `save`.
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged.
+        """
+        fingerprint = content_fingerprint(content)
+        if self.is_current(path, fingerprint):
+            return False
+
+        with open(path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        self._record(path, fingerprint)
+        return True
+
+    def replace(self, path: str, temp_path: str) -> bool:
+        """Move a finished temporary file over the file unless it already holds the same content, and record it.
+        This is `write` for the outputs streamed to disk, which are never held in memory as a whole.
+
+        Returns:
+            bool: True if the file was replaced, False if it was unchanged (the temporary file is removed).
+        """
+        fingerprint = file_fingerprint(temp_path)
+        if self.is_current(path, fingerprint):
+            os.remove(temp_path)
+            return False
+
+        os.replace(temp_path, path)
+        self._record(path, fingerprint)
+        return True
+
+    def _record(self, path: str, fingerprint: str) -> None:
+        stat = os.stat(path)
+        self.files[os.path.basename(path)] = ManifestEntry(
+            fingerprint=fingerprint, mtime=stat.st_mtime_ns, size=stat.st_size)
+
+
+def content_fingerprint(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    """The fingerprint of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Write the content unless the manifest shows the file already holds it.
+
+    Args:
+        path (str): The output file path.
+        content (str): The text to write.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = OutputManifest.load(directory)
+    if not manifest.write(path, content):
+        return False
+    manifest.save(directory)
+    return True
@@ -0,0 +1,56 @@
+import csv
+import json
+from pathlib import Path
+from typing import List, TextIO
+
+from pyclassanalyzer.network.metrics import ClassMetrics, DesignMetrics, PackageMetrics
+
+METRIC_FORMATS = ['csv', 'json']
+
+CLASS_COLUMNS = list(ClassMetrics.model_fields)
+PACKAGE_COLUMNS = list(PackageMetrics.model_fields)
+
+
+def write_metrics_json(metrics: DesignMetrics, stream: TextIO) -> None:
+    """Write `{"classes": [...], "packages": [...]}`."""
+    json.dump(metrics.model_dump(), stream, indent=2)
+    stream.write("\n")
+
+
+def write_metrics_csv(rows: List, columns: List[str], stream: TextIO) -> None:
+    writer = csv.DictWriter(stream, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row.model_dump())
+
+
+def save_metrics(metrics: DesignMetrics, output_path: str, format: str) -> List[str]:
+    """Save the design metrics next to the diagram.
+
+    Args:
+        metrics (DesignMetrics): The metrics to save.
+        output_path (str): The base path. Its extension is replaced.
+        format (str): "json" writes `<name>.metrics.json`;
+            "csv" writes `<name>.classes.csv` and `<name>.packages.csv`.
+
+    Returns:
+        List[str]: The written file paths.
+    """
+    if format not in METRIC_FORMATS:
+        raise ValueError(f"Unsupported metrics format: {format} (supported: {', '.join(METRIC_FORMATS)})")
+
+    base = Path(output_path)
+    if format == 'json':
+        path = base.with_suffix('.metrics.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            write_metrics_json(metrics, f)
+        return [str(path)]
+
+    paths = []
+    for suffix, rows, columns in (('.classes.csv', metrics.classes, CLASS_COLUMNS),
+                                  ('.packages.csv', metrics.packages, PACKAGE_COLUMNS)):
+        path = base.with_suffix(suffix)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            write_metrics_csv(rows, columns, f)
+        paths.append(str(path))
+    return paths
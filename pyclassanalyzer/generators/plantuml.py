@@ -1,19 +1,30 @@
+import logging
 import os
-from typing import List
+import re
+from io import StringIO
+from typing import List, Optional, Tuple
 
-from pyclassanalyzer.network.classgraph import RelationType, ClassNode, ClassType
+from pyclassanalyzer.network.classgraph import RelationType, ClassNode, ClassType, Relation
+from pyclassanalyzer.network.collapse import PackageGraph
+from pyclassanalyzer.generators.base import Exporter, export
+from pyclassanalyzer.generators.manifest import write_if_changed
 from pyclassanalyzer.utils.class_type import is_private, is_protected, is_magic
+from pyclassanalyzer.utils.log import logger
 
 INDENT = "  "
+# Levels of detail of the class members, from the smallest diagram to the complete one
+MEMBER_LEVELS = ("none", "public", "summary", "all")
 
-def get_symbol(name:str) -> str:
-    symbol = '+'
+def visibility(name:str) -> str:
+    """Return the PlantUML visibility symbol of a member: + public, - private, # protected."""
     if is_private(name):
-        symbol = '-'
-    elif is_protected(name):
-        symbol = '#'
-    
-    return f"{symbol}{name}"
+        return '-'
+    if is_protected(name):
+        return '#'
+    return '+'
+
+def get_symbol(name:str) -> str:
+    return f"{visibility(name)}{name}"
 
     
 def streamline_fields(fields) -> str :
@@ -25,6 +36,95 @@ def streamline_fields(fields) -> str :
     else:
         return f"{fields[0]}, ..."
 
+def package_alias(package: str) -> str:
+    """Return a PlantUML identifier for a dotted package name.
+    
+    Distinct names get distinct identifiers: "_" is escaped as "__", "." becomes "_0"
+    and any other non-word character "_x<code>_". ex) a.b -> pkg_a_0b, a_b -> pkg_a__b
+    """
+    def escape(match: "re.Match") -> str:
+        char = match.group()
+        if char == "_":
+            return "__"
+        if char == ".":
+            return "_0"
+        return f"_x{ord(char):x}_"
+    
+    return "pkg_" + re.sub(r"\W|_", escape, package)
+
+def member_detail(config) -> Tuple[str, Optional[int]]:
+    """Read the `[members]` configuration: how much of each class to draw.
+    
+    Example:
+        [members]
+        level = "public"  # none, public, summary or all
+        max = 20          # members per class, 0 for no limit
+    
+    Returns:
+        Tuple[str, Optional[int]]: The level and the maximum number of members per class.
+    """
+    members = getattr(config, 'data', {}).get('members') or {}
+    level = members.get('level') or 'all'
+    if level not in MEMBER_LEVELS:
+        raise ValueError(f"Unsupported members level: {level} (supported: {', '.join(MEMBER_LEVELS)})")
+    return level, members.get('max') or None
+
+def format_members(node: ClassNode, exclude_magic: bool = False,
+                   level: str = "all", limit: Optional[int] = None) -> Tuple[List[str], List[str]]:
+    """Format the attributes and methods of a class with their visibility symbols.
+    
+    Args:
+        node (ClassNode): The class node.
+        exclude_magic (bool): Whether to skip magic methods.
+        level (str): How much to show, one of `MEMBER_LEVELS`.
+            - none: no members, only the class and its relations.
+            - public: the members that are neither private nor protected.
+            - summary: the number of attributes and of methods.
+            - all: every member.
+        limit (Optional[int]): The maximum number of members. The first ones are kept,
+            followed by "… N more".
+    
+    Returns:
+        Tuple[List[str], List[str]]: The formatted attributes and methods.
+    
+    NOTE:
+        The `__init__()` method is key to analyzing the relationship types between classes.
+        We filter out magic methods after gathering all function lists.
+    """
+    if level == "none":
+        return [], []
+    
+    functions = [func for func in node.functions or [] if not (exclude_magic and is_magic(func.name))]
+    if level == "summary":
+        return ([f"{len(node.attributes)} attributes"] if node.attributes else [],
+                [f"{len(functions)} methods"] if functions else [])
+    
+    # (symbol, member), so the visibility of a member is computed once
+    # and only the members shown are formatted
+    attributes = [(visibility(attr), attr) for attr in sorted(node.attributes or [])]
+    methods = [(visibility(func.name), func) for func in functions]
+    if level == "public":
+        attributes = [member for member in attributes if member[0] == '+']
+        methods = [member for member in methods if member[0] == '+']
+    
+    hidden = 0
+    if limit is not None and len(attributes) + len(methods) > limit:
+        hidden = len(attributes) + len(methods) - limit
+        methods = methods[:max(0, limit - len(attributes))]
+        attributes = attributes[:limit]
+    
+    attributes = [f"{symbol}{attr}" for symbol, attr in attributes]
+    methods = [f"{symbol}{func.name}({streamline_fields(getattr(func, 'fields', []))})"
+               for symbol, func in methods]
+    if hidden:
+        # Closes the last compartment shown
+        if methods or not attributes:
+            methods.append(f"… {hidden} more")
+        else:
+            attributes.append(f"… {hidden} more")
+    
+    return attributes, methods
+
 class PlantUMLGenerator:    
     def __init__(self, config):
         
@@ -35,6 +135,11 @@ class PlantUMLGenerator:
             RelationType.DEPENDENCY: "..>",
         }
         self._config = config
+        # If "magic" is included in the [exclude] methods in the TOML config,
+        # skip processing the Visit function 
+        self._exclude_magic = 'magic' in config.get('exclude')['methods']
+        # The [members] configuration bounds the size of the boxes, and so the layout time
+        self._level, self._limit = member_detail(config)
     
     def _generate_class(self, node:ClassNode) -> str:
         """Generates a PlantUML class definition for the provided class node.
@@ -76,23 +181,10 @@ class PlantUMLGenerator:
         else:
             line.append(f"class {node.name} {{")
         
-        if hasattr(node, 'attributes') and node.attributes:
-            for attr in node.attributes:
-                line.append(f"  {get_symbol(attr)}")
-        
-        if hasattr(node, 'functions') and node.functions:
-            for func in node.functions:
-                # If "magic" is included in the [exclude] methods in the TOML config,
-                # skip processing the Visit function 
-                       
-                # NOTE: The `__init__()` method is key to analyzing the relationship types between classes.
-                # We filter out magic methods after gathering all function lists.
-                exclude_magic = True if 'magic' in self._config.get('exclude')['methods'] else False
-                if exclude_magic and is_magic(func.name):
-                    continue
-                  
-                params = streamline_fields(getattr(func, 'fields', []))
-                line.append(f"  {get_symbol(func.name)}({params})")
+        attributes, methods = format_members(node, exclude_magic=self._exclude_magic,
+                                             level=self._level, limit=self._limit)
+        for member in attributes + methods:
+            line.append(f"  {member}")
         
         line.append("}")
         return "\n".join(line)
@@ -114,101 +206,98 @@ class PlantUMLGenerator:
             
     
     def debug_class_graph(self, class_graph):
-        print("=== ClassGraph 디버깅 정보 ===")
+        """Log the classes and relations of the graph at the debug level."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        logger.debug("=== ClassGraph 디버깅 정보 ===")
         
         # 노드 정보 출력
-        print(f"총 노드 수: {len(class_graph.nodes) if hasattr(class_graph, 'nodes') else 'nodes 속성 없음'}")
+        logger.debug(f"총 노드 수: {len(class_graph.nodes) if hasattr(class_graph, 'nodes') else 'nodes 속성 없음'}")
         if hasattr(class_graph, 'nodes'):
             for name, node in class_graph.nodes.items():
-                print(f"노드: {name}")
-                print(f"  - 타입: {type(node)}")
-                print(f"  - 속성들: {[attr for attr in dir(node) if not attr.startswith('_')]}")
+                logger.debug(f"노드: {name}")
+                logger.debug(f"  - 타입: {type(node)}")
+                logger.debug(f"  - 속성들: {[attr for attr in dir(node) if not attr.startswith('_')]}")
                 if hasattr(node, 'attributes'):
-                    print(f"  - attributes: {node.attributes}")
+                    logger.debug(f"  - attributes: {node.attributes}")
                 if hasattr(node, 'functions'):
-                    print(f"  - functions: {[f.name for f in node.functions] if node.functions else []}")
+                    logger.debug(f"  - functions: {[f.name for f in node.functions] if node.functions else []}")
         
         # 관계 정보 출력
-        print(f"\n총 관계 수: {len(class_graph.relations) if hasattr(class_graph, 'relations') else 'relations 속성 없음'}")
+        logger.debug(f"총 관계 수: {len(class_graph.relations) if hasattr(class_graph, 'relations') else 'relations 속성 없음'}")
         if hasattr(class_graph, 'relations'):
             for i, relation in enumerate(class_graph.relations):
-                print(f"관계 {i+1}:")
-                print(f"  - 소스: {relation.source if hasattr(relation, 'source') else 'source 없음'}")
-                print(f"  - 타겟: {relation.target if hasattr(relation, 'target') else 'target 없음'}")
-                print(f"  - 타입: {relation.type_ if hasattr(relation, 'type_') else 'type_ 없음'}")
+                logger.debug(f"관계 {i+1}:")
+                logger.debug(f"  - 소스: {relation.source if hasattr(relation, 'source') else 'source 없음'}")
+                logger.debug(f"  - 타겟: {relation.target if hasattr(relation, 'target') else 'target 없음'}")
+                logger.debug(f"  - 타입: {relation.type_ if hasattr(relation, 'type_') else 'type_ 없음'}")
         
         # 상속 관계만 필터링해서 확인
         if hasattr(class_graph, 'relations'):
             inheritance_relations = [r for r in class_graph.relations 
                                    if hasattr(r, 'type_') and r.type_ == RelationType.INHERITANCE]
-            print(f"\n상속 관계 수: {len(inheritance_relations)}")
+            logger.debug(f"상속 관계 수: {len(inheritance_relations)}")
             for rel in inheritance_relations:
-                print(f"  {rel.source} --|> {rel.target}")
+                logger.debug(f"  {rel.source} --|> {rel.target}")
 
     
     def generate_plantuml(self, class_graph, title: str = "Class Diagram") -> str:
         """ClassGraph를 완전한 PlantUML 다이어그램으로 변환"""
         
+        stream = StringIO()
+        export(class_graph, [PlantUMLExporter(stream, config=self._config, generator=self)], self._config, title)
+        return stream.getvalue()
+    
+    def generate_package_overview(self, package_graph: PackageGraph, title: str = "Package Overview") -> str:
+        """Convert a package graph into a PlantUML diagram with packages as nodes.
+        
+        Each edge is labeled with the number of relations per relation type,
+        and relations inside a package are not drawn.
+        
+        Args:
+            package_graph (PackageGraph): The class graph folded into its packages.
+            title (str): The title of the diagram.
+        
+        Returns:
+            str: A PlantUML-formatted package diagram.
+        """
+        
         lines = ["@startuml"]
         lines.append(f"title {title}")
         lines.append("")
-        
-        # Set style
         lines.extend([
-            "skinparam classFontStyle bold",
+            "skinparam packageStyle rectangle",
             ""
         ])
         
-        class_exclusion_list = self._config.get('exclude')['classes']
-        
-        # 모든 클래스 정의 생성
-        if hasattr(class_graph, 'nodes') and class_graph.nodes:
-            for node_name, node in class_graph.nodes.items():
-                
-                if class_exclusion_list and \
-                    node.type_.__str__() in class_exclusion_list:
-                        continue
-                    
-                class_def = self._generate_class(node)
-                lines.append(class_def)
-                lines.append("")
-        else:
-            lines.append("' No classes found")
-            print("경고: 클래스가 발견되지 않았습니다!")
+        aliases = {}
+        for package, count in sorted(package_graph.packages.items()):
+            alias = package_alias(package)
+            aliases[package] = alias
+            lines.append(f'package "{package}" as {alias} <<{count} classes>> {{')
+            lines.append("}")
+        lines.append("")
         
-        # 모든 관계 정의 생성
-        if hasattr(class_graph, 'relations') and class_graph.relations:
-            lines.append("' Relationships")
-            for relation in class_graph.relations:
-                try:
-                    
-                    if class_exclusion_list:
-                        if class_graph.get_node_type(relation.source) in class_exclusion_list or \
-                            class_graph.get_node_type(relation.target) in class_exclusion_list:
-                            continue
-                    
-                    # Do not generate a relationship in the configuration.
-                    if self._config.get('exclude')['relationships'] and \
-                        relation.type_.__str__() in self._config.get('exclude')['relationships']:
-                        continue
-                    
-                    rel_def = self._generate_relation(relation)
-                    lines.append(rel_def)
-                    print(f"관계 추가됨: {rel_def}")  
-                except Exception as e:
-                    print(f"관계 생성 실패: {e}, 관계: {relation}")
-        else:
-            lines.append("' No relationships found")
-            print("경고: 관계가 발견되지 않았습니다!")
+        lines.append("' Relationships")
+        for (source, target), counts in sorted(package_graph.edges.items()):
+            if source == target:
+                continue
+            label = ", ".join(f"{type_} {count}" for type_, count in
+                              sorted(counts.items(), key=lambda item: item[0].value))
+            lines.append(f"{aliases[source]} --> {aliases[target]} : {label}")
         
         lines.append("")
         lines.append("@enduml")
-        
         return "\n".join(lines)
     
     def save_to_file(self, class_graph, file_path: str, title: str = "Class Diagram"):
         """PlantUML 다이어그램을 파일로 저장"""
         plantuml_content = self.generate_plantuml(class_graph, title)
+        return self.write_file(plantuml_content, file_path)
+    
+    def write_file(self, plantuml_content: str, file_path: str) -> bool:
+        """PlantUML 텍스트를 파일로 저장"""
         
         # 디렉토리가 존재하지 않으면 생성
         directory = os.path.dirname(file_path)
@@ -220,12 +309,14 @@ class PlantUMLGenerator:
             file_path += '.puml'
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(plantuml_content)
-            print(f"PlantUML 다이어그램이 성공적으로 저장되었습니다: {file_path}")
+            # Skip the write when the manifest shows the same diagram is already there
+            if write_if_changed(file_path, plantuml_content):
+                logger.info(f"PlantUML 다이어그램이 성공적으로 저장되었습니다: {file_path}")
+            else:
+                logger.info(f"변경 사항이 없어 저장을 건너뜁니다: {file_path}")
             return True
         except Exception as e:
-            print(f"파일 저장 중 오류 발생: {e}")
+            logger.error(f"파일 저장 중 오류 발생: {e}")
             return False
     
     def generate_hierarchical_layout(self, class_graph) -> List[str]:
@@ -247,4 +338,46 @@ class PlantUMLGenerator:
                 for child in children:
                     layout_hints.append(f"!define {child}_LEVEL 2")
         
-        return layout_hints
\ No newline at end of file
+        return layout_hints
+
+
+class PlantUMLExporter(Exporter):
+    """Stream the PlantUML class diagram, so it can share a traversal with the other outputs.
+    
+    The diagram is the same as `PlantUMLGenerator.generate_plantuml`.
+    """
+    name = "plantuml"
+    extension = ".puml"
+    
+    def __init__(self, stream, config=None, path: Optional[str] = None,
+                 generator: Optional[PlantUMLGenerator] = None) -> None:
+        super().__init__(stream, config=config, path=path)
+        self.generator = generator or PlantUMLGenerator(config=config)
+    
+    def begin(self, title: str) -> None:
+        self._nodes = 0
+        self._relations = 0
+        self.stream.write(f"@startuml\ntitle {title}\n\nskinparam classFontStyle bold\n\n")
+    
+    def write_node(self, node: ClassNode) -> None:
+        self._nodes += 1
+        self.stream.write(self.generator._generate_class(node) + "\n\n")
+    
+    def _close_classes(self) -> None:
+        if not self._nodes:
+            self.stream.write("' No classes found\n")
+            logger.warning("클래스가 발견되지 않았습니다!")
+    
+    def write_relation(self, relation: Relation) -> None:
+        if not self._relations:
+            self._close_classes()
+            self.stream.write("' Relationships\n")
+        self._relations += 1
+        self.stream.write(self.generator._generate_relation(relation) + "\n")
+    
+    def end(self) -> None:
+        if not self._relations:
+            self._close_classes()
+            self.stream.write("' No relationships found\n")
+            logger.warning("관계가 발견되지 않았습니다!")
+        self.stream.write("\n@enduml")
@@ -0,0 +1,38 @@
+from typing import Dict, List
+
+from pyclassanalyzer.network.classgraph import ClassNode, Relation
+from pyclassanalyzer.generators.base import Exporter
+
+
+class SummaryExporter(Exporter):
+    """Print the analysis summary: the classes and the number of relations per type.
+
+    It counts what it is fed, so it can share the traversal of the other outputs.
+    """
+    name = "summary"
+
+    def begin(self, title: str) -> None:
+        self._classes: List[str] = []
+        self._relation_counts: Dict[str, int] = {}
+
+    def write_node(self, node: ClassNode) -> None:
+        self._classes.append(node.name)
+
+    def write_relation(self, relation: Relation) -> None:
+        rel_type = str(relation.type_)
+        self._relation_counts[rel_type] = self._relation_counts.get(rel_type, 0) + 1
+
+    def end(self) -> None:
+        lines = [
+            "Analysis completed!",
+            f"- Found {len(self._classes)} classes",
+            f"- Found {sum(self._relation_counts.values())} relations",
+        ]
+        if self._classes:
+            lines.append("- Class list:")
+            lines.extend(f"  * {name}" for name in self._classes)
+        if self._relation_counts:
+            lines.append("- Relation list:")
+            lines.extend(f"  * {rel_type}: {count}개" for rel_type, count in sorted(self._relation_counts.items()))
+        lines.append("-" * 40)
+        self.stream.write("\n".join(lines) + "\n")
@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from pyclassanalyzer.network.classgraph import ClassNode, ClassType, Relation, RelationType
+from pyclassanalyzer.generators.base import Exporter
+from pyclassanalyzer.generators.layout import LayeredLayout, Layout
+from pyclassanalyzer.generators.plantuml import format_members, member_detail
+
+FONT_SIZE = 12
+CHAR_WIDTH = 7.2  # monospace glyph width at FONT_SIZE
+LINE_HEIGHT = 16
+PADDING = 8
+SPOT_SIZE = 18
+MIN_WIDTH = 80
+TITLE_HEIGHT = 36
+
+# ClassType -> (spot letter, spot color), in the same way as PlantUML
+SPOTS = {
+    ClassType.CLASS: ("C", "#ADD1B2"),
+    ClassType.ENUM: ("E", "#EB937F"),
+    ClassType.ABSTRACT: ("A", "#A9DCDF"),
+    ClassType.DATACLASS: ("D", "#FFDD55"),
+    ClassType.EXCEPTION: ("X", "#FF7700"),
+}
+
+# RelationType -> SVG attributes of the edge
+EDGE_STYLES = {
+    RelationType.INHERITANCE: 'marker-end="url(#inheritance)"',
+    RelationType.REALIZATION: 'stroke-dasharray="6,4" marker-end="url(#inheritance)"',
+    RelationType.COMPOSITION: 'marker-start="url(#composition)"',
+    RelationType.AGGREGATION: 'marker-start="url(#aggregation)"',
+    RelationType.DEPENDENCY: 'stroke-dasharray="6,4" marker-end="url(#arrow)"',
+    RelationType.ASSOCIATION: 'marker-end="url(#arrow)"',
+}
+
+DEFS = """<defs>
+<marker id="inheritance" viewBox="0 0 12 12" refX="12" refY="6" markerWidth="12" markerHeight="12" orient="auto-start-reverse"><path d="M0,0 L12,6 L0,12 Z" fill="#FFFFFF" stroke="#A80036"/></marker>
+<marker id="composition" viewBox="0 0 16 10" refX="16" refY="5" markerWidth="16" markerHeight="10" orient="auto-start-reverse"><path d="M0,5 L8,0 L16,5 L8,10 Z" fill="#A80036"/></marker>
+<marker id="aggregation" viewBox="0 0 16 10" refX="16" refY="5" markerWidth="16" markerHeight="10" orient="auto-start-reverse"><path d="M0,5 L8,0 L16,5 L8,10 Z" fill="#FFFFFF" stroke="#A80036"/></marker>
+<marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="10" markerHeight="10" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10" fill="none" stroke="#A80036"/></marker>
+</defs>"""
+
+
+class ClassBox:
+    """Text lines and size of a class box."""
+
+    def __init__(self, node: ClassNode, exclude_magic: bool,
+                 level: str = "all", limit: Optional[int] = None) -> None:
+        self.node = node
+        self.attributes, self.methods = format_members(node, exclude_magic=exclude_magic,
+                                                       level=level, limit=limit)
+
+        longest = max([len(node.name) * CHAR_WIDTH + SPOT_SIZE + PADDING] +
+                      [len(line) * CHAR_WIDTH for line in self.attributes + self.methods])
+        self.width = max(MIN_WIDTH, longest + 2 * PADDING)
+        self.height = (LINE_HEIGHT + PADDING                         # header
+                       + max(1, len(self.attributes)) * LINE_HEIGHT  # attributes compartment
+                       + max(1, len(self.methods)) * LINE_HEIGHT     # methods compartment
+                       + PADDING)
+
+    def render(self, x: float, y: float) -> str:
+        node = self.node
+        letter, color = SPOTS.get(node.type_, SPOTS[ClassType.CLASS])
+        name_style = ' font-style="italic"' if node.type_ == ClassType.ABSTRACT else ''
+
+        parts = [
+            f'<g class={quoteattr(f"class {node.type_}")}>',
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{self.width:.1f}" height="{self.height:.1f}" '
+            f'fill="#FEFECE" stroke="#A80036"/>',
+        ]
+
+        # header: spot + name
+        header = y + PADDING + LINE_HEIGHT / 2
+        spot_x = x + PADDING + SPOT_SIZE / 2
+        parts.append(f'<circle cx="{spot_x:.1f}" cy="{header:.1f}" r="{SPOT_SIZE / 2:.1f}" '
+                     f'fill="{color}" stroke="#A80036"/>')
+        parts.append(f'<text x="{spot_x:.1f}" y="{header + 4:.1f}" text-anchor="middle" '
+                     f'font-weight="bold">{letter}</text>')
+        parts.append(f'<text x="{x + PADDING * 2 + SPOT_SIZE:.1f}" y="{header + 4:.1f}" '
+                     f'font-weight="bold"{name_style}>{escape(node.name)}</text>')
+
+        # compartments
+        top = y + PADDING + LINE_HEIGHT
+        for lines in (self.attributes, self.methods):
+            parts.append(f'<line x1="{x:.1f}" y1="{top + 2:.1f}" x2="{x + self.width:.1f}" '
+                         f'y2="{top + 2:.1f}" stroke="#A80036"/>')
+            for i, line in enumerate(lines):
+                parts.append(f'<text x="{x + PADDING:.1f}" y="{top + (i + 1) * LINE_HEIGHT:.1f}">'
+                             f'{escape(line)}</text>')
+            top += max(1, len(lines)) * LINE_HEIGHT
+
+        parts.append('</g>')
+        return "".join(parts)
+
+
+def render_svg(boxes: Dict[str, ClassBox], layout: Layout, title: str) -> str:
+    """Render the laid out class boxes and edges as an SVG document."""
+    width = max(layout.width, len(title) * CHAR_WIDTH * 1.5 + 40)
+    height = layout.height + TITLE_HEIGHT
+
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="monospace" font-size="{FONT_SIZE}">',
+        f'<title>{escape(title)}</title>',
+        DEFS,
+        f'<rect width="100%" height="100%" fill="#FFFFFF"/>',
+        f'<text x="{width / 2:.1f}" y="24" text-anchor="middle" font-size="{FONT_SIZE * 1.5:.0f}" '
+        f'font-weight="bold">{escape(title)}</text>',
+        f'<g transform="translate(0,{TITLE_HEIGHT})">',
+    ]
+
+    for relation, points in layout.edges:
+        path = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+        style = EDGE_STYLES.get(relation.type_, "")
+        lines.append(
+            f'<polyline class={quoteattr(str(relation.type_))} points="{path}" fill="none" '
+            f'stroke="#A80036" {style}/>'
+        )
+
+    for name, box in boxes.items():
+        x, y, _, _ = layout.boxes[name]
+        lines.append(box.render(x, y))
+
+    lines.append('</g>')
+    lines.append('</svg>')
+    return "\n".join(lines) + "\n"
+
+
+class SVGExporter(Exporter):
+    """Render the class diagram directly as SVG, without Java or Graphviz.
+
+    The layout needs the whole graph, so the nodes and relations are
+    buffered and the diagram is laid out and written at the end.
+    """
+    name = "svg"
+    extension = ".svg"
+
+    def __init__(self, stream, config=None, path=None, time_budget: float = 2.0) -> None:
+        super().__init__(stream, config=config, path=path)
+        self.layout = LayeredLayout(time_budget=time_budget)
+
+    def begin(self, title: str) -> None:
+        self._title = title
+        self._boxes: Dict[str, ClassBox] = {}
+        self._relations: List[Relation] = []
+
+        exclude_magic = False
+        if self._config is not None:
+            exclude_magic = 'magic' in self._config.get('exclude')['methods']
+        self._exclude_magic = exclude_magic
+        self._level, self._limit = member_detail(self._config)
+
+    def write_node(self, node: ClassNode) -> None:
+        self._boxes[node.name] = ClassBox(node, exclude_magic=self._exclude_magic,
+                                          level=self._level, limit=self._limit)
+
+    def write_relation(self, relation: Relation) -> None:
+        self._relations.append(relation)
+
+    def end(self) -> None:
+        sizes: Dict[str, Tuple[float, float]] = {
+            name: (box.width, box.height) for name, box in self._boxes.items()
+        }
+        layout = self.layout.layout(sizes, self._relations)
+        self.stream.write(render_svg(self._boxes, layout, self._title))
@@ -0,0 +1,151 @@
+"""Graph algorithms shared by the class graph analyses.
+
+The functions work on plain adjacency mappings, so they do not depend on the models.
+"""
+from typing import Dict, List, Iterable, Hashable, Tuple, Set, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+def strongly_connected_components(nodes: Iterable[T], successors: Dict[T, List[T]]) -> List[List[T]]:
+    """Find the strongly connected components with Tarjan's algorithm.
+
+    The recursion is unrolled, so deep graphs do not hit the recursion limit.
+
+    Args:
+        nodes (Iterable[T]): The nodes of the graph.
+        successors (Dict[T, List[T]]): node -> its direct successors.
+
+    Returns:
+        List[List[T]]: The components in reverse topological order (sinks first).
+    """
+    index: Dict[T, int] = {}
+    lowlink: Dict[T, int] = {}
+    on_stack: Set[T] = set()
+    stack: List[T] = []
+    components: List[List[T]] = []
+    counter = 0
+
+    for start in nodes:
+        if start in index:
+            continue
+
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(successors.get(start, ())))]
+
+        while work:
+            node, it = work[-1]
+            for succ in it:
+                if succ not in index:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(successors.get(succ, ()))))
+                    break
+                if succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def condensation(nodes: Iterable[T], successors: Dict[T, List[T]]) -> Tuple[List[List[T]], Dict[T, int], List[Set[int]]]:
+    """Condense the strongly connected components into a DAG.
+
+    Args:
+        nodes (Iterable[T]): The nodes of the graph.
+        successors (Dict[T, List[T]]): node -> its direct successors.
+
+    Returns:
+        Tuple: The components (sinks first), node -> component id,
+        and component id -> successor component ids.
+        Successor ids are always smaller than the id of their predecessor.
+    """
+    components = strongly_connected_components(nodes, successors)
+
+    component_of: Dict[T, int] = {}
+    for i, component in enumerate(components):
+        for node in component:
+            component_of[node] = i
+
+    dag: List[Set[int]] = [set() for _ in components]
+    for node, succs in successors.items():
+        cu = component_of[node]
+        for succ in succs:
+            cv = component_of[succ]
+            if cu != cv:
+                dag[cu].add(cv)
+
+    return components, component_of, dag
+
+
+def transitive_reduction(edges: Iterable[Tuple[T, T]]) -> Set[Tuple[T, T]]:
+    """Find the edges implied by other paths of the graph.
+
+    The reachability of every component of the condensation is computed
+    once as a bitset (a Python int), in reverse topological order, so
+    each edge is checked with bit operations instead of a traversal.
+
+    An edge between two components is redundant when its target is
+    reachable through another successor of its source, or when an earlier
+    edge already connects the same two components.
+    Edges inside a cycle are always kept.
+
+    Args:
+        edges (Iterable[Tuple[T, T]]): The (source, target) edges.
+
+    Returns:
+        Set[Tuple[T, T]]: The redundant edges.
+    """
+    edges = list(edges)
+    successors: Dict[T, List[T]] = {}
+    for source, target in edges:
+        successors.setdefault(source, []).append(target)
+        successors.setdefault(target, [])
+
+    components, component_of, dag = condensation(list(successors), successors)
+
+    # Components are numbered sinks first, so a successor always has a smaller id.
+    # Visiting the successors from the largest id (the closest in topological order)
+    # ensures that an indirect path is known before the direct edge is checked.
+    reach: List[int] = [0] * len(components)
+    redundant_pairs: Set[Tuple[int, int]] = set()
+    for cu in range(len(components)):
+        covered = 0
+        for cv in sorted(dag[cu], reverse=True):
+            if covered >> cv & 1:
+                redundant_pairs.add((cu, cv))
+            else:
+                covered |= reach[cv]
+        reach[cu] = covered | (1 << cu)
+
+    # Between two components, a single edge is enough to keep the reachability
+    redundant: Set[Tuple[T, T]] = set()
+    kept_pairs: Set[Tuple[int, int]] = set()
+    for source, target in edges:
+        pair = (component_of[source], component_of[target])
+        if pair[0] == pair[1]:
+            continue
+        if pair in redundant_pairs or pair in kept_pairs:
+            redundant.add((source, target))
+        else:
+            kept_pairs.add(pair)
+    return redundant
@@ -1,7 +1,11 @@
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Iterable, Tuple, Any, Callable
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+
+from pyclassanalyzer.network.algorithms import transitive_reduction
+from pyclassanalyzer.network.matrix import CSRAdjacency, build_csr, reachability_counts, k_hop_neighborhoods, _as_list
+from pyclassanalyzer.network.reachability import ReachabilityIndex
 
 class ModuleType(Enum):
     INTERNAL = "internal"
@@ -28,10 +32,14 @@ class RelationType(Enum):
 class ModuleDef(BaseModel):
     name: str
     type_: Optional[ModuleType] = None
+    # Dotted name of the package containing the module
+    package: Optional[str] = None
     
 class FunctionDef(BaseModel):
     name: str 
     fields: Optional[List[str]] = []
+    # Members accessed through `self` in the method body (attributes and methods)
+    uses: Optional[List[str]] = []
     
 class ClassType(Enum):
     """Types of classes for display perpose"""
@@ -54,6 +62,10 @@ class ClassNode(BaseModel):
     name: str
     attributes: Optional[Set[str]] = set()
     functions: Optional[List[FunctionDef]] = []
+    
+    # Where the class is defined: the module file and the line of its `class` statement
+    file: Optional[str] = None
+    line: Optional[int] = None
  
     def add_function(self, func: FunctionDef):
         self.functions.append(func)
@@ -94,15 +106,44 @@ class Relation(BaseModel):
                    self.target == other.target)
         return False
 
+# Query types answered by `ClassGraph.query`
+QUERY_TYPES = ("ancestors", "descendants", "neighbors", "incoming", "outgoing")
+# What `ClassGraph.merge` does with two different classes of the same name
+MERGE_POLICIES = ("keep_first", "qualify", "error")
+
+
+class MergeConflict(ValueError):
+    """Raised by `ClassGraph.merge` when both graphs define different classes of the same name."""
+    
+    def __init__(self, names: List[str]) -> None:
+        self.names = sorted(names)
+        super().__init__(f"Conflicting classes: {', '.join(self.names)}")
+
+
 class ClassGraph(BaseModel):
     nodes: Dict[str, ClassNode] = {}
     
     # After v1.0.5,
     # use Set[Relation] instead of List[Relation] for faster lookup
     relations: Set[Relation] = set()
+    
+    # Bumped on every change, to invalidate the cached views of the graph
+    _version: int = PrivateAttr(default=0)
+    # Derived views (adjacency matrices, reachability indexes), keyed by kind and arguments
+    _views: Dict[tuple, Tuple[tuple, Any]] = PrivateAttr(default_factory=dict)
+    # Relations with an endpoint not in the graph yet, by the missing class name.
+    # They are resolved when a merged graph defines the class.
+    _unresolved: Dict[str, Set[Relation]] = PrivateAttr(default_factory=dict)
 
     def add_node(self, node: ClassNode):
         self.nodes[node.name] = node
+        self._version += 1
+    
+    @property
+    def version(self) -> Tuple[int, int, int]:
+        """Stamp of the graph contents. It changes whenever a node or a relation
+        is added or removed through the methods of the graph."""
+        return (self._version, len(self.nodes), len(self.relations))
     
     def remove_node(self, name:str) -> bool:
         if name not in self.nodes:
@@ -113,6 +154,7 @@ class ClassGraph(BaseModel):
                               if rel.source == name or rel.target == name}
         self.relations -= relations_to_remove
         del self.nodes[name]
+        self._version += 1
         return True 
 
     def add_relation(self, relation: Relation) -> bool:
@@ -123,12 +165,103 @@ class ClassGraph(BaseModel):
         # Check duplication - return True only if relation was added (not already present)
         if relation not in self.relations:
             self.relations.add(relation)
+            self._version += 1
+            return True
+        return False
+    
+    def defer_relation(self, relation: Relation) -> bool:
+        """Add the relation, or keep it until both of its classes are in the graph (see `merge`).
+        
+        Returns:
+            bool: True if the relation was added now.
+        """
+        if self.add_relation(relation):
             return True
+        
+        missing = relation.source if relation.source not in self.nodes else relation.target
+        if missing not in self.nodes:
+            self._unresolved.setdefault(missing, set()).add(relation)
         return False
     
+    @property
+    def unresolved(self) -> Set[Relation]:
+        """The relations kept by `defer_relation` whose classes are not all in the graph."""
+        return {rel for relations in self._unresolved.values() for rel in relations}
+    
+    def merge(self, other: "ClassGraph", on_conflict: str = "keep_first",
+              label: Optional[str] = None) -> Dict[str, str]:
+        """Add the classes and relations of another graph, ex) a shard analyzed separately.
+        
+        Only `other` is traversed, so the cost is proportional to its size
+        (plus the relations it resolves). Merge the smaller graph into the larger one,
+        or use `union`.
+        
+        Args:
+            other (ClassGraph): The graph to add. It is not modified; unchanged classes are shared.
+            on_conflict (str): What to do with a class of `other` whose name is taken here
+                by a different class (same name, other module). One of `MERGE_POLICIES`.
+                - keep_first: keep the class of this graph, the relations of `other` go to it.
+                - qualify: add the class of `other` as `<label>.<name>`,
+                  or `<module>.<name>` without label.
+                - error: raise `MergeConflict` before anything is changed.
+                The same class in both graphs (same name and module) is not a conflict.
+            label (Optional[str]): The prefix of the qualified names.
+        
+        Returns:
+            Dict[str, str]: name in `other` -> name in this graph, for the renamed classes.
+        
+        NOTE:
+            The unresolved relations of both graphs (see `defer_relation`) are
+            resolved once both of their classes are present.
+        """
+        if on_conflict not in MERGE_POLICIES:
+            raise ValueError(f"Unsupported conflict policy: {on_conflict} (supported: {', '.join(MERGE_POLICIES)})")
+        
+        conflicts = [name for name, node in other.nodes.items()
+                     if name in self.nodes and self.nodes[name].module != node.module]
+        if conflicts and on_conflict == "error":
+            raise MergeConflict(conflicts)
+        
+        renamed: Dict[str, str] = {}
+        if on_conflict == "qualify":
+            for name in conflicts:
+                module = other.nodes[name].module
+                prefix = label or (module.name if module else None)
+                qualified = f"{prefix}.{name}" if prefix else name
+                if qualified in self.nodes or qualified in other.nodes or qualified in renamed.values():
+                    raise MergeConflict([name])
+                renamed[name] = qualified
+        
+        added = []
+        for name, node in other.nodes.items():
+            new_name = renamed.get(name, name)
+            if new_name in self.nodes:
+                continue
+            self.nodes[new_name] = node if new_name == name else node.model_copy(update={"name": new_name})
+            added.append(new_name)
+        
+        def rename(rel: Relation) -> Relation:
+            if rel.source not in renamed and rel.target not in renamed:
+                return rel
+            return Relation(source=renamed.get(rel.source, rel.source),
+                            target=renamed.get(rel.target, rel.target), type_=rel.type_)
+        
+        for rel in other.relations:
+            self.relations.add(rename(rel))
+        for relations in other._unresolved.values():
+            for rel in relations:
+                self.defer_relation(rename(rel))
+        for name in added:
+            for rel in self._unresolved.pop(name, ()):
+                self.defer_relation(rel)
+        
+        self._version += 1
+        return renamed
+    
     def remove_relation(self, relation: Relation) -> bool:
         if relation in self.relations:
             self.relations.remove(relation)
+            self._version += 1
             return True
         return False
     
@@ -160,6 +293,209 @@ class ClassGraph(BaseModel):
                 neighbors.add(rel.source)
         return neighbors
     
+    def get_neighborhood(self, names: Iterable[str], depth: int = 1) -> Set[str]:
+        """Return the classes within `depth` hops from any of `names`,
+        regardless of the relation direction. The seeds are included.
+        """
+        found = {name for name in names if name in self.nodes}
+        frontier = set(found)
+        
+        for _ in range(depth):
+            if not frontier:
+                break
+            
+            reached = set()
+            for rel in self.relations:
+                if rel.source in frontier:
+                    reached.add(rel.target)
+                if rel.target in frontier:
+                    reached.add(rel.source)
+            
+            frontier = reached - found
+            found |= frontier
+        
+        return found
+    
+    def subgraph(self, names: Iterable[str]) -> "ClassGraph":
+        """Return a new graph induced on the given classes.
+        Relations are kept only if both endpoints are included.
+        """
+        names = {name for name in names if name in self.nodes}
+        
+        graph = ClassGraph()
+        for name, node in self.nodes.items():
+            if name in names:
+                graph.add_node(node)
+        
+        graph.relations = {rel for rel in self.relations
+                           if rel.source in names and rel.target in names}
+        return graph
+    
+    def transitive_reduction(self, types: Optional[Iterable[RelationType]] = None) -> Dict[RelationType, int]:
+        """Remove the relations implied by other paths of the same relation type.
+        
+        Example:
+            If A ..> B, B ..> C and A ..> C, then A ..> C is removed.
+        
+        Args:
+            types (Optional[Iterable[RelationType]]): The relation types to reduce. All types by default.
+        
+        Returns:
+            Dict[RelationType, int]: The number of removed relations per type.
+        """
+        types = set(types) if types is not None else set(RelationType)
+        
+        edges_by_type: Dict[RelationType, List] = {}
+        for rel in self.relations:
+            if rel.type_ in types and rel.source != rel.target:
+                edges_by_type.setdefault(rel.type_, []).append((rel.source, rel.target))
+        
+        removed: Dict[RelationType, int] = {}
+        for type_, edges in edges_by_type.items():
+            redundant = transitive_reduction(edges)
+            
+            for source, target in redundant:
+                self.relations.discard(Relation(source=source, target=target, type_=type_))
+            if redundant:
+                removed[type_] = len(redundant)
+        
+        self._version += 1
+        return removed
+    
+    @property
+    def class_index(self) -> Dict[str, int]:
+        """class name -> row/column of the class in `adjacency()`.
+        Classes are numbered in insertion order, so the index is stable
+        as long as no class is removed.
+        """
+        return self.adjacency().index
+    
+    def adjacency(self, type_: Optional[RelationType] = None) -> CSRAdjacency:
+        """Return the CSR adjacency matrix of the relations of one type (all types if None).
+        The matrix is cached until the graph changes.
+        """
+        return self._view(("adjacency", type_),
+                          lambda: build_csr(self, types=[type_] if type_ is not None else None))
+    
+    def sorted_nodes(self) -> List[ClassNode]:
+        """Return the classes sorted by name, so the outputs do not depend on the analysis order."""
+        return self._view(("sorted_nodes",), lambda: [self.nodes[name] for name in sorted(self.nodes)])
+    
+    def sorted_relations(self) -> List[Relation]:
+        """Return the relations sorted by source, target and type, so the outputs do not depend on the set order."""
+        return self._view(("sorted_relations",),
+                          lambda: sorted(self.relations, key=lambda rel: (rel.source, rel.target, rel.type_.value)))
+    
+    def reachability(self, type_: Optional[RelationType] = None, reverse: bool = False) -> ReachabilityIndex:
+        """Return the reachability index of the relations of one type (all types if None).
+        With `reverse`, the index answers ancestor queries instead of descendant queries.
+        The index is built once and cached until the graph changes.
+        """
+        def build() -> ReachabilityIndex:
+            adjacency = self.adjacency(type_)
+            return ReachabilityIndex(adjacency.transpose() if reverse else adjacency)
+        
+        return self._view(("reachability", type_, reverse), build)
+    
+    def is_subclass(self, child: str, parent: str) -> bool:
+        """Check if `child` inherits from `parent`, directly or not.
+        A class is not a subclass of itself, unless inheritance forms a cycle.
+        """
+        return self.reachability(RelationType.INHERITANCE).reaches(child, parent)
+    
+    def relation_index(self) -> Tuple[Dict[str, List[Relation]], Dict[str, List[Relation]]]:
+        """Return the outgoing relations by source and the incoming relations by target.
+        Built in a single pass and cached until the graph changes.
+        """
+        def build() -> Tuple[Dict[str, List[Relation]], Dict[str, List[Relation]]]:
+            outgoing: Dict[str, List[Relation]] = {}
+            incoming: Dict[str, List[Relation]] = {}
+            for rel in self.relations:
+                outgoing.setdefault(rel.source, []).append(rel)
+                incoming.setdefault(rel.target, []).append(rel)
+            return outgoing, incoming
+        
+        return self._view(("relation_index",), build)
+    
+    def query(self, queries: Dict[str, Iterable[str]]) -> Dict[str, Dict[str, Any]]:
+        """Answer many queries at once.
+        
+        The relations are indexed by endpoint once, and ancestors/descendants are
+        read from the cached reachability indexes, so each answer costs only the
+        size of its result instead of a traversal of the whole graph.
+        
+        Args:
+            queries (Dict[str, Iterable[str]]): query type -> class names.
+                The query types are `QUERY_TYPES`.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: query type -> class name -> result, the same as
+            the per-class methods: a set of class names for ancestors, descendants
+            and neighbors, a list of relations for incoming and outgoing.
+        
+        Example:
+            graph.query({"ancestors": ["Dog"], "neighbors": ["Dog", "Cat"]})
+        """
+        unsupported = [type_ for type_ in queries if type_ not in QUERY_TYPES]
+        if unsupported:
+            raise ValueError(f"Unsupported query type: {', '.join(unsupported)} (supported: {', '.join(QUERY_TYPES)})")
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for type_, names in queries.items():
+            if type_ in ("ancestors", "descendants"):
+                index = self.reachability(reverse=type_ == "ancestors")
+                results[type_] = {name: index.descendants(name) for name in names}
+                continue
+            
+            outgoing, incoming = self.relation_index()
+            if type_ == "outgoing":
+                results[type_] = {name: list(outgoing.get(name, ())) for name in names}
+            elif type_ == "incoming":
+                results[type_] = {name: list(incoming.get(name, ())) for name in names}
+            else:
+                results[type_] = {
+                    name: {rel.target for rel in outgoing.get(name, ())} | {rel.source for rel in incoming.get(name, ())}
+                    for name in names
+                }
+        return results
+    
+    def _view(self, key: tuple, build: Callable[[], Any]) -> Any:
+        cached = self._views.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        
+        view = build()
+        self._views[key] = (self.version, view)
+        return view
+    
+    def degree_vectors(self, type_: Optional[RelationType] = None) -> Tuple[List[int], List[int]]:
+        """Return the in-degree and out-degree of every class, indexed by `class_index`."""
+        adjacency = self.adjacency(type_)
+        return _as_list(adjacency.in_degree()), _as_list(adjacency.out_degree())
+    
+    def reachability_counts(self, type_: Optional[RelationType] = None, reverse: bool = False) -> Dict[str, int]:
+        """Return the number of descendants (or ancestors if `reverse`) of every class at once."""
+        adjacency = self.adjacency(type_)
+        counts = reachability_counts(adjacency.transpose() if reverse else adjacency)
+        return dict(zip(adjacency.names, counts))
+    
+    def k_hop_neighborhoods(self, names: Iterable[str], k: int = 1,
+                            type_: Optional[RelationType] = None, direction: str = "out") -> Dict[str, Set[str]]:
+        """Return the classes within `k` hops of each of `names`, computed for all of them together.
+        
+        Args:
+            names (Iterable[str]): The seed classes. Unknown classes are ignored.
+            k (int): The maximum number of hops.
+            type_ (Optional[RelationType]): The relation type to follow. All types if None.
+            direction (str): "out", "in" or "both".
+        """
+        adjacency = self.adjacency(type_)
+        seeds = [name for name in dict.fromkeys(names) if name in adjacency.index]
+        neighborhoods = k_hop_neighborhoods(adjacency, [adjacency.index[name] for name in seeds], k, direction)
+        return {seed: {adjacency.names[i] for i in found} for seed, found in zip(seeds, neighborhoods)}
+    
+    # NOTE: `get_descendants` and `get_ancestors` walk the graph on every call.
+    # For many queries on the same graph, use `query()` or `reachability()` instead.
     def get_descendants(self, name:str) -> Set[str]:
         descendants = set()
         visited = set()
@@ -245,3 +581,41 @@ class ClassGraph(BaseModel):
 
         
     
+
+
+def union(graphs: Iterable[ClassGraph], on_conflict: str = "keep_first",
+          labels: Optional[Iterable[Optional[str]]] = None) -> ClassGraph:
+    """Combine graphs analyzed separately (shards) into a new graph.
+    
+    The largest graph is copied, which only copies its containers, and the
+    others are merged into the copy from the largest to the smallest.
+    The inputs are not modified.
+    
+    Args:
+        graphs (Iterable[ClassGraph]): The shards.
+        on_conflict (str): The conflict policy of `ClassGraph.merge`. With keep_first and
+            qualify, the classes of the larger shard (then the earlier one) keep their names.
+        labels (Optional[Iterable[Optional[str]]]): The prefix of the qualified names of each shard.
+    
+    Example:
+        shards = [analyze(path, keep_unresolved=True) for path in ("libs/core", "services/api")]
+        graph = union(shards, on_conflict="qualify")
+    """
+    graphs = list(graphs)
+    labels = list(labels) if labels is not None else [None] * len(graphs)
+    if len(labels) != len(graphs):
+        raise ValueError("labels must have one entry per graph")
+    
+    order = sorted(range(len(graphs)), key=lambda i: (-len(graphs[i].nodes) - len(graphs[i].relations), i))
+    if not order:
+        return ClassGraph()
+    
+    base = graphs[order[0]]
+    graph = ClassGraph()
+    graph.nodes = dict(base.nodes)
+    graph.relations = set(base.relations)
+    graph._unresolved = {name: set(relations) for name, relations in base._unresolved.items()}
+    
+    for i in order[1:]:
+        graph.merge(graphs[i], on_conflict=on_conflict, label=labels[i])
+    return graph
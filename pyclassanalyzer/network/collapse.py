@@ -0,0 +1,85 @@
+from typing import Dict, Optional, Set, Tuple
+
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, RelationType
+
+UNKNOWN_PACKAGE = "(unknown)"
+
+
+def package_of(node: ClassNode, depth: Optional[int] = None) -> str:
+    """Return the package of a class, truncated to `depth` dotted components.
+
+    ex) pkg.sub.inner with depth=2 -> pkg.sub
+    """
+    package = node.module.package if node.module and node.module.package else UNKNOWN_PACKAGE
+    if depth is not None and depth > 0:
+        package = ".".join(package.split(".")[:depth])
+    return package
+
+
+def in_package(package: str, prefix: str) -> bool:
+    """Check if the package is `prefix` itself or one of its subpackages."""
+    return package == prefix or package.startswith(prefix + ".")
+
+
+class PackageGraph:
+    """Class graph folded into its packages.
+
+    Attributes:
+        packages: package -> number of classes.
+        edges: (source package, target package) -> number of relations per type.
+            Relations inside a package are counted with source == target.
+    """
+
+    def __init__(self) -> None:
+        self.packages: Dict[str, int] = {}
+        self.edges: Dict[Tuple[str, str], Dict[RelationType, int]] = {}
+
+    def weight(self, source: str, target: str) -> int:
+        return sum(self.edges.get((source, target), {}).values())
+
+
+def collapse_to_packages(class_graph: ClassGraph, depth: Optional[int] = None, config=None) -> PackageGraph:
+    """Fold the classes into their packages in a single O(N+E) pass.
+
+    Args:
+        class_graph (ClassGraph): The class graph.
+        depth (Optional[int]): The number of dotted components of the package names to keep.
+            Packages deeper than `depth` are merged into their ancestor.
+        config: If given, `exclude.classes` and `exclude.relationships` are applied.
+
+    Returns:
+        PackageGraph: The packages and the weighted package-to-package edges.
+    """
+    class_exclusion_list = []
+    relation_exclusion_list = []
+    if config is not None:
+        class_exclusion_list = config.get('exclude')['classes'] or []
+        relation_exclusion_list = config.get('exclude')['relationships'] or []
+
+    collapsed = PackageGraph()
+    package_by_class: Dict[str, str] = {}
+    for name, node in class_graph.nodes.items():
+        if str(node.type_) in class_exclusion_list:
+            continue
+        package = package_of(node, depth)
+        package_by_class[name] = package
+        collapsed.packages[package] = collapsed.packages.get(package, 0) + 1
+
+    for rel in class_graph.relations:
+        if str(rel.type_) in relation_exclusion_list:
+            continue
+        source = package_by_class.get(rel.source)
+        target = package_by_class.get(rel.target)
+        if source is None or target is None:
+            continue
+
+        counts = collapsed.edges.setdefault((source, target), {})
+        counts[rel.type_] = counts.get(rel.type_, 0) + 1
+
+    return collapsed
+
+
+def classes_in_package(class_graph: ClassGraph, package: str) -> Set[str]:
+    """Return the classes of a package and its subpackages, to drill down into it."""
+    return {name for name, node in class_graph.nodes.items()
+            if in_package(package_of(node), package)}
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pyclassanalyzer.network.classgraph import ClassNode, Relation
+
+# Bumped when the extracted facts change, so the caches written before are not reused
+FACTS_VERSION = 2
+
+
+class FileIssue(BaseModel):
+    """Why a module was left out of the analysis.
+
+    Attributes:
+        kind: "skipped" by a limit or a skip pattern, or "failed" while it was analyzed.
+        reason: human readable reason. ex) SyntaxError: invalid syntax (line 3)
+    """
+    kind: str
+    reason: str
+
+
+class ModuleFacts(BaseModel):
+    """Plain summary of the class facts extracted from a single module.
+
+    The AST of a module is only needed while its facts are extracted.
+    Once summarized, the tree can be released and the graph is built from
+    these facts alone, so memory scales with the graph instead of the source.
+
+    NOTE:
+        `relations` are raw candidates. Their targets may be builtins or
+        classes of other modules, and they are resolved only when all the
+        modules have been summarized.
+    """
+    path: str
+    classes: List[ClassNode] = []
+    relations: List[Relation] = []
+    # Set when the module was skipped or could not be analyzed
+    issue: Optional[FileIssue] = None
+    # Seconds spent to parse and visit the module, to schedule the next analysis
+    cost: float = 0.0
+
+
+class ScanCache(BaseModel):
+    """Module summaries of a source root saved between runs.
+
+    Attributes:
+        fingerprint: digest of the configuration used for the extraction.
+        stamps: module path -> (mtime_ns, size) when it was summarized.
+        modules: module path -> its summary.
+    """
+    fingerprint: str
+    stamps: Dict[str, Tuple[int, int]] = {}
+    modules: Dict[str, ModuleFacts] = {}
+
+
+class FactsCache:
+    """Module summaries shared by the analyses of one process.
+
+    Entries are keyed by the configuration fingerprint and the module path,
+    and are only returned while the module keeps the same (mtime, size) stamp.
+    The least recently used entries are dropped beyond `max_modules`.
+    It is safe to use from several threads.
+    """
+
+    def __init__(self, max_modules: int = 100_000) -> None:
+        self.max_modules = max_modules
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], ModuleFacts]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str, path: str, stamp: Tuple[int, int]) -> Optional[ModuleFacts]:
+        """Return a copy of the summary, so the caller can not alter the cached one."""
+        key = (fingerprint, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != tuple(stamp):
+                return None
+            self._entries.move_to_end(key)
+            facts = entry[1]
+        return facts.model_copy(deep=True)
+
+    def put(self, fingerprint: str, path: str, stamp: Tuple[int, int], facts: ModuleFacts) -> None:
+        key = (fingerprint, path)
+        facts = facts.model_copy(deep=True)
+        with self._lock:
+            self._entries[key] = (tuple(stamp), facts)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_modules:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,247 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyclassanalyzer.network.classgraph import ClassGraph
+
+# Only the standard library is imported here: the queries are answered
+# without loading the models, so a lookup costs little more than the interpreter.
+
+# Bumped when the schema changes, an index of another version must be rebuilt
+INDEX_VERSION = 1
+# Relations meaning "inherits from"
+INHERITANCE_TYPES = ("inheritance", "realization")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    qualname TEXT NOT NULL,
+    short TEXT NOT NULL,
+    module TEXT,
+    type TEXT NOT NULL,
+    file TEXT,
+    line INTEGER,
+    bases TEXT NOT NULL,
+    members TEXT NOT NULL
+);
+CREATE TABLE relations (
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (target, type, source)
+) WITHOUT ROWID;
+"""
+# Created after the rows are inserted, which is faster than maintaining them
+INDEXES = """
+CREATE INDEX classes_qualname ON classes (qualname);
+CREATE INDEX classes_short ON classes (short);
+CREATE INDEX relations_source ON relations (source, type);
+"""
+
+
+class IndexedClass(NamedTuple):
+    """A class as recorded in the symbol index.
+
+    Attributes:
+        name: the name in the class graph. ex) Config, a.src.Config
+        qualname: the module and the class name. ex) myproject.config.Config
+        module: the dotted module name.
+        type: the class type. ex) class, enum, dataclass
+        file: the absolute path of the module file.
+        line: the line of the `class` statement.
+        bases: the analyzed classes it inherits from.
+        members: {"attributes": [...], "methods": [...]}
+    """
+    name: str
+    qualname: str
+    module: Optional[str]
+    type: str
+    file: Optional[str]
+    line: Optional[int]
+    bases: List[str]
+    members: Dict[str, List[str]]
+
+    def location(self) -> str:
+        """`file:line`, the format understood by editors and terminals."""
+        if not self.file:
+            return "?"
+        return f"{self.file}:{self.line}" if self.line else self.file
+
+    def to_dict(self) -> Dict[str, object]:
+        return self._asdict()
+
+
+def write_index(graph: "ClassGraph", path: str, root: Optional[str] = None) -> str:
+    """Write the symbol index of a class graph to an SQLite file.
+
+    The file is written next to the target and moved over it when complete,
+    so the queries running meanwhile keep reading the previous index.
+
+    Args:
+        graph (ClassGraph): The analyzed class graph.
+        path (str): The index file.
+        root (Optional[str]): The analyzed directories, recorded for reference.
+
+    Returns:
+        str: The written file path.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    names = sorted(graph.nodes)
+    ids = {name: i for i, name in enumerate(names, start=1)}
+    bases: Dict[str, List[str]] = {}
+    for rel in graph.relations:
+        if str(rel.type_) in INHERITANCE_TYPES:
+            bases.setdefault(rel.source, []).append(rel.target)
+
+    def class_rows():
+        for name in names:
+            node = graph.nodes[name]
+            short = name.rsplit(".", 1)[-1]
+            module = node.module.name if node.module else None
+            members = {
+                "attributes": sorted(node.attributes or []),
+                "methods": [func.name for func in node.functions or []],
+            }
+            yield (
+                ids[name], name, f"{module}.{short}" if module else name, short, module,
+                str(node.type_), os.path.abspath(node.file) if node.file else None, node.line,
+                json.dumps(sorted(bases.get(name, []))), json.dumps(members),
+            )
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SCHEMA)
+        connection.executemany("INSERT INTO classes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", class_rows())
+        connection.executemany("INSERT INTO relations VALUES (?, ?, ?)",
+                               ((ids[rel.source], ids[rel.target], str(rel.type_)) for rel in graph.relations))
+        connection.executescript(INDEXES)
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(INDEX_VERSION)),
+            ("created", str(int(time.time()))),
+            ("root", root or ""),
+        ])
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(temp_path, path)
+    return path
+
+
+class SymbolIndex:
+    """Read-only lookups in an index written by `write_index`.
+
+    Every query is answered by the SQLite indexes, without analyzing the sources again.
+    A class can be named by its graph name, its qualified name or its short name;
+    a short name defined in several modules matches all of them.
+
+    Example:
+        with SymbolIndex("outputs/index.db") as index:
+            for class_ in index.subclasses("BaseModel", transitive=True):
+                print(class_.location(), class_.qualname)
+
+    Raises:
+        FileNotFoundError: If the index does not exist.
+        ValueError: If the file is not an index of this version.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No index: {path}")
+
+        self._connection = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row is None or row[0] != str(INDEX_VERSION):
+            self.close()
+            raise ValueError(f"Not an index of version {INDEX_VERSION}, rebuild it: {path}")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _classes(self, query: str, parameters: Sequence = ()) -> List[IndexedClass]:
+        rows = self._connection.execute(
+            f"SELECT name, qualname, module, type, file, line, bases, members FROM classes "
+            f"WHERE id IN ({query}) ORDER BY qualname, name", parameters)
+        return [IndexedClass(*row[:6], json.loads(row[6]), json.loads(row[7])) for row in rows]
+
+    def _resolve(self, name: str) -> List[int]:
+        """The ids of the classes called `name`, the most precise kind of name first."""
+        for column in ("name", "qualname", "short"):
+            ids = [row[0] for row in self._connection.execute(f"SELECT id FROM classes WHERE {column} = ?", (name,))]
+            if ids:
+                return ids
+        return []
+
+    def where(self, name: str) -> List[IndexedClass]:
+        """Where the classes called `name` are defined."""
+        ids = self._resolve(name)
+        return self._classes(_placeholders(ids), ids) if ids else []
+
+    def subclasses(self, name: str, transitive: bool = False) -> List[IndexedClass]:
+        """The classes inheriting from `name`, directly or, if `transitive`, through other classes."""
+        return self._incoming(name, INHERITANCE_TYPES, transitive)
+
+    def dependents(self, name: str, types: Optional[Iterable[str]] = None,
+                   transitive: bool = False) -> List[IndexedClass]:
+        """The classes with a relation to `name`, of the given types or of any type.
+
+        With `transitive`, the classes depending on them are included, and so on.
+        """
+        return self._incoming(name, tuple(types) if types else None, transitive)
+
+    def find(self, pattern: str) -> List[IndexedClass]:
+        """The classes whose short, qualified or graph name matches a glob pattern.
+
+        A pattern without wildcards matches the names containing it. ex) Scan -> *Scan*
+        The match is case-sensitive.
+        """
+        if not any(char in pattern for char in "*?["):
+            pattern = f"*{pattern}*"
+        query = "SELECT id FROM classes WHERE short GLOB ? OR qualname GLOB ? OR name GLOB ?"
+        return self._classes(query, (pattern,) * 3)
+
+    def _incoming(self, name: str, types: Optional[Sequence[str]], transitive: bool) -> List[IndexedClass]:
+        ids = self._resolve(name)
+        if not ids:
+            return []
+
+        type_filter = f"AND relations.type IN ({_placeholders(types)})" if types else ""
+        type_parameters = list(types or [])
+        direct = f"SELECT source FROM relations WHERE target IN ({_placeholders(ids)}) {type_filter}"
+        if not transitive:
+            return self._classes(direct, [*ids, *type_parameters])
+
+        # UNION drops the classes already found, so cycles end the recursion
+        query = (f"WITH RECURSIVE found(id) AS ({direct} UNION "
+                 f"SELECT relations.source FROM relations JOIN found ON relations.target = found.id "
+                 f"{type_filter}) SELECT id FROM found")
+        return self._classes(query, [*ids, *type_parameters, *type_parameters])
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join("?" * len(values))
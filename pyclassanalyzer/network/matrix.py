@@ -0,0 +1,439 @@
+"""Sparse-matrix views of the class graph.
+
+NumPy is optional. When it is installed, the adjacency arrays are NumPy
+arrays and the computations are vectorized; otherwise the same algorithms
+run on plain lists.
+"""
+import random
+from collections import deque
+from typing import Dict, List, Optional, Iterable, Callable, Sequence, TYPE_CHECKING
+
+from pyclassanalyzer.network.algorithms import condensation
+
+if TYPE_CHECKING:
+    from pyclassanalyzer.network.classgraph import ClassGraph, RelationType
+
+_UNRESOLVED = object()
+# numpy once resolved by `_numpy`, or None if it is not installed
+_np = _UNRESOLVED
+
+
+def _numpy():
+    """Return numpy, or None if it is not installed, importing it on first use.
+
+    NumPy takes longer to import than a whole cached analysis, and most runs
+    never build a matrix, so it is only loaded by the functions that need it.
+    """
+    global _np
+    if _np is _UNRESOLVED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - depends on the environment
+            numpy = None
+        _np = numpy
+    return _np
+
+
+class CSRAdjacency:
+    """Compressed sparse row adjacency matrix of the class graph.
+
+    Row `i` holds the targets of the relations whose source is `names[i]`:
+    `indices[indptr[i]:indptr[i + 1]]`. Parallel relations of different
+    types are kept as separate entries, self relations are left out of the
+    rows and only recorded in `loops`.
+
+    Attributes:
+        names: index -> class name, in the insertion order of the graph.
+        index: class name -> index.
+        indptr: row pointers, of length `size + 1`.
+        indices: column indices, of length `nnz`.
+        loops: the sorted indices of the classes with a relation to themselves.
+    """
+
+    def __init__(self, names: List[str], indptr, indices, index: Optional[Dict[str, int]] = None,
+                 loops: Optional[List[int]] = None) -> None:
+        self.names = names
+        self.index: Dict[str, int] = index if index is not None else {name: i for i, name in enumerate(names)}
+        self.indptr = indptr
+        self.indices = indices
+        self.loops: List[int] = loops or []
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def successors(self, i: int):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def out_degree(self):
+        np = _numpy()
+        if np is not None:
+            return np.diff(self.indptr)
+        return [self.indptr[i + 1] - self.indptr[i] for i in range(self.size)]
+
+    def in_degree(self):
+        np = _numpy()
+        if np is not None:
+            return np.bincount(self.indices, minlength=self.size)
+        degree = [0] * self.size
+        for j in self.indices:
+            degree[j] += 1
+        return degree
+
+    def sources(self):
+        """Return the row index of every entry, aligned with `indices`."""
+        np = _numpy()
+        if np is not None:
+            return np.repeat(np.arange(self.size), np.diff(self.indptr))
+        return [i for i in range(self.size) for _ in range(self.indptr[i], self.indptr[i + 1])]
+
+    def transpose(self) -> "CSRAdjacency":
+        """Return the adjacency with every relation reversed (rows are targets)."""
+        np = _numpy()
+        if np is not None:
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(self.size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=self.size), out=indptr[1:])
+            return CSRAdjacency(self.names, indptr, self.sources()[order], index=self.index, loops=self.loops)
+        return _counting_sort(self.names, self.index, list(self.indices), self.sources(), self.loops)
+
+
+def build_csr(class_graph: "ClassGraph", types: Optional[Iterable["RelationType"]] = None) -> CSRAdjacency:
+    """Build the CSR adjacency of the class graph in O(N + E).
+
+    Args:
+        class_graph (ClassGraph): The class graph.
+        types (Optional[Iterable[RelationType]]): The relation types to include. All types by default.
+
+    Returns:
+        CSRAdjacency: The adjacency matrix.
+    """
+    types = set(types) if types is not None else None
+    names = list(class_graph.nodes)
+    index = {name: i for i, name in enumerate(names)}
+
+    src: List[int] = []
+    dst: List[int] = []
+    loops = set()
+    for rel in class_graph.relations:
+        if types is not None and rel.type_ not in types:
+            continue
+        u = index.get(rel.source)
+        v = index.get(rel.target)
+        if u is None or v is None:
+            continue
+        if u == v:
+            loops.add(u)
+            continue
+        src.append(u)
+        dst.append(v)
+
+    size = len(names)
+    np = _numpy()
+    if np is not None:
+        src_array = np.asarray(src, dtype=np.int64)
+        dst_array = np.asarray(dst, dtype=np.int64)
+        order = np.argsort(src_array, kind="stable")
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src_array, minlength=size), out=indptr[1:])
+        return CSRAdjacency(names, indptr, dst_array[order], index=index, loops=sorted(loops))
+
+    return _counting_sort(names, index, src, dst, sorted(loops))
+
+
+def _counting_sort(names: List[str], index: Dict[str, int], src: List[int], dst: List[int],
+                   loops: List[int]) -> CSRAdjacency:
+    """Build the CSR arrays from (src, dst) pairs by counting sort on `src`."""
+    size = len(names)
+    indptr = [0] * (size + 1)
+    for u in src:
+        indptr[u + 1] += 1
+    for i in range(size):
+        indptr[i + 1] += indptr[i]
+    cursor = indptr[:-1]
+    indices = [0] * len(src)
+    for u, v in zip(src, dst):
+        indices[cursor[u]] = v
+        cursor[u] += 1
+    return CSRAdjacency(names, indptr, indices, index=index, loops=loops)
+
+
+def pagerank(adjacency: CSRAdjacency, damping: float = 0.85,
+             tol: float = 1e-8, max_iter: int = 100) -> List[float]:
+    """Compute the PageRank of every class by power iteration.
+
+    A relation passes importance from its source to its target,
+    so the classes that many others build on rank highest.
+
+    Returns:
+        List[float]: The score of each class index.
+    """
+    n = adjacency.size
+    if n == 0:
+        return []
+
+    np = _numpy()
+    if np is not None:
+        out_degree = adjacency.out_degree().astype(np.float64)
+        sources = adjacency.sources()
+        dangling = out_degree == 0
+        safe_degree = np.where(dangling, 1.0, out_degree)
+
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            share = (x / safe_degree)[sources]
+            spread = np.bincount(adjacency.indices, weights=share, minlength=n)
+            new = damping * (spread + x[dangling].sum() / n) + (1 - damping) / n
+            converged = np.abs(new - x).sum() < tol
+            x = new
+            if converged:
+                break
+        return x.tolist()
+
+    out_degree = adjacency.out_degree()
+    x = [1.0 / n] * n
+    for _ in range(max_iter):
+        spread = [0.0] * n
+        dangling = 0.0
+        for i in range(n):
+            start, end = adjacency.indptr[i], adjacency.indptr[i + 1]
+            if start == end:
+                dangling += x[i]
+                continue
+            share = x[i] / (end - start)
+            for j in adjacency.indices[start:end]:
+                spread[j] += share
+        base = damping * dangling / n + (1 - damping) / n
+        new = [base + damping * value for value in spread]
+        converged = sum(abs(a - b) for a, b in zip(new, x)) < tol
+        x = new
+        if converged:
+            break
+    return x
+
+
+def betweenness(adjacency: CSRAdjacency, samples: int = 64, seed: int = 0) -> List[float]:
+    """Approximate the betweenness centrality with Brandes' algorithm
+    from `samples` randomly chosen sources.
+
+    Returns:
+        List[float]: The (unnormalized) score of each class index.
+    """
+    n = adjacency.size
+    scores = [0.0] * n
+    if n == 0:
+        return scores
+
+    indptr = list(adjacency.indptr)
+    indices = list(adjacency.indices)
+    sources = range(n) if samples >= n else random.Random(seed).sample(range(n), samples)
+
+    for s in sources:
+        stack = []
+        predecessors: List[List[int]] = [[] for _ in range(n)]
+        sigma = [0] * n
+        sigma[s] = 1
+        distance = [-1] * n
+        distance[s] = 0
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            stack.append(v)
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if distance[w] < 0:
+                    distance[w] = distance[v] + 1
+                    queue.append(w)
+                if distance[w] == distance[v] + 1:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        delta = [0.0] * n
+        while stack:
+            w = stack.pop()
+            for v in predecessors[w]:
+                delta[v] += sigma[v] / sigma[w] * (1 + delta[w])
+            if w != s:
+                scores[w] += delta[w]
+
+    scale = n / len(sources)
+    return [score * scale for score in scores]
+
+
+def reachability_counts(adjacency: CSRAdjacency, block: int = 8192) -> List[int]:
+    """Count the classes reachable from every class, for all classes at once.
+
+    The count of a class is the size of `ClassGraph.get_descendants`:
+    a class on a cycle, or with a relation to itself, reaches itself. Use `adjacency.transpose()`
+    to count the ancestors instead.
+
+    The graph is condensed into its strongly connected components, and the
+    reachable classes of each component are accumulated as bitsets (Python ints)
+    in reverse topological order. The classes are processed in blocks of
+    `block` bits, so the memory stays in O(N * block) instead of O(N^2).
+
+    Returns:
+        List[int]: The number of reachable classes of each class index.
+    """
+    n = adjacency.size
+    indptr = _as_list(adjacency.indptr)
+    indices = _as_list(adjacency.indices)
+    successors = {i: indices[indptr[i]:indptr[i + 1]] for i in range(n)}
+    components, component_of, dag = condensation(range(n), successors)
+
+    # Successors of a component always have smaller ids, so ascending ids
+    # visit every component after all the components it reaches.
+    dag = [list(succs) for succs in dag]
+    counts = [0] * len(components)
+    for start in range(0, n, block):
+        member_bits = [0] * len(components)
+        for i in range(start, min(start + block, n)):
+            member_bits[component_of[i]] |= 1 << (i - start)
+
+        reach = [0] * len(components)
+        for c, succs in enumerate(dag):
+            bits = 0
+            for d in succs:
+                bits |= reach[d] | member_bits[d]
+            reach[c] = bits
+            counts[c] += _popcount(bits)
+
+    # Every class of a cycle reaches all the classes of its component
+    looped = {component_of[i] for i in adjacency.loops}
+    return [counts[c] + (len(components[c]) if len(components[c]) > 1 or c in looped else 0)
+            for c in (component_of[i] for i in range(n))]
+
+
+def k_hop_neighborhoods(adjacency: CSRAdjacency, seeds: Sequence[int], k: int,
+                        direction: str = "out") -> List[List[int]]:
+    """Find the classes within `k` hops of many seeds in a single traversal.
+
+    Every class carries a bitset of the seeds that reached it, and all the
+    seeds advance one hop at a time together. With NumPy, the bitsets are rows
+    of 64-bit words, and each hop is one gather and one `bitwise_or.reduceat`
+    over the relations.
+
+    Args:
+        adjacency (CSRAdjacency): The adjacency matrix.
+        seeds (Sequence[int]): The class indices to start from.
+        k (int): The maximum number of hops.
+        direction (str): "out" follows the relations, "in" walks them backwards
+            and "both" ignores their direction.
+
+    Returns:
+        List[List[int]]: The sorted class indices reached from each seed, the seed included.
+    """
+    if direction not in ("out", "in", "both"):
+        raise ValueError(f"Unsupported direction: {direction} (supported: out, in, both)")
+
+    # A hop moves the seed bits from a class to its neighbors, so each class
+    # gathers the bits of the rows that point at it: the transposed matrix.
+    transposed = adjacency.transpose()
+    gathers = {"out": [transposed], "in": [adjacency], "both": [transposed, adjacency]}[direction]
+
+    n = adjacency.size
+    np = _numpy()
+    if np is not None:
+        words = max(1, (len(seeds) + 63) // 64)
+        reached = np.zeros((n, words), dtype=np.uint64)
+        for s, seed in enumerate(seeds):
+            reached[seed, s // 64] |= np.uint64(1 << (s % 64))
+
+        frontier = reached.copy()
+        for _ in range(k):
+            new = np.zeros_like(reached)
+            for gather in gathers:
+                rows = np.flatnonzero(np.diff(gather.indptr))
+                if len(rows):
+                    values = frontier[gather.indices]
+                    new[rows] |= np.bitwise_or.reduceat(values, gather.indptr[rows], axis=0)
+            frontier = new & ~reached
+            if not frontier.any():
+                break
+            reached |= frontier
+
+        neighborhoods = []
+        for s in range(len(seeds)):
+            column = reached[:, s // 64] >> np.uint64(s % 64) & np.uint64(1)
+            neighborhoods.append(np.flatnonzero(column).tolist())
+        return neighborhoods
+
+    reached_bits = [0] * n
+    for s, seed in enumerate(seeds):
+        reached_bits[seed] |= 1 << s
+
+    frontier_bits = list(reached_bits)
+    for _ in range(k):
+        new_bits = [0] * n
+        for gather in gathers:
+            for v in range(n):
+                bits = 0
+                for u in gather.indices[gather.indptr[v]:gather.indptr[v + 1]]:
+                    bits |= frontier_bits[u]
+                new_bits[v] |= bits
+        frontier_bits = [new & ~old for new, old in zip(new_bits, reached_bits)]
+        if not any(frontier_bits):
+            break
+        reached_bits = [old | new for old, new in zip(reached_bits, frontier_bits)]
+
+    neighborhoods = [[] for _ in seeds]
+    for v, bits in enumerate(reached_bits):
+        while bits:
+            low = bits & -bits
+            neighborhoods[low.bit_length() - 1].append(v)
+            bits ^= low
+    return neighborhoods
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _popcount = int.bit_count  # noqa: F811
+
+
+def _as_list(values) -> List[float]:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+RANKINGS: Dict[str, Callable[[CSRAdjacency], List[float]]] = {
+    "pagerank": pagerank,
+    "in-degree": lambda adjacency: _as_list(adjacency.in_degree()),
+    "out-degree": lambda adjacency: _as_list(adjacency.out_degree()),
+    "degree": lambda adjacency: [a + b for a, b in zip(_as_list(adjacency.in_degree()),
+                                                       _as_list(adjacency.out_degree()))],
+    "betweenness": betweenness,
+}
+
+
+def rank_classes(class_graph: "ClassGraph", metric: str = "pagerank") -> List[str]:
+    """Return the class names from the most to the least important.
+    Ties are broken by name, so the ranking is deterministic.
+    """
+    if metric not in RANKINGS:
+        raise ValueError(f"Unsupported ranking: {metric} (supported: {', '.join(RANKINGS)})")
+
+    adjacency = class_graph.adjacency()
+    scores = RANKINGS[metric](adjacency)
+    order = sorted(range(adjacency.size), key=lambda i: (-scores[i], adjacency.names[i]))
+    return [adjacency.names[i] for i in order]
+
+
+def top_classes(class_graph: "ClassGraph", limit: int, metric: str = "pagerank") -> "ClassGraph":
+    """Keep the `limit` most important classes and the relations among them.
+
+    Args:
+        class_graph (ClassGraph): The class graph.
+        limit (int): The maximum number of classes.
+        metric (str): The importance measure (see `RANKINGS`).
+
+    Returns:
+        ClassGraph: The induced subgraph, or the graph itself if it is small enough.
+    """
+    if len(class_graph.nodes) <= limit:
+        return class_graph
+    return class_graph.subgraph(rank_classes(class_graph, metric)[:limit])
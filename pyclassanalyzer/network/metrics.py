@@ -0,0 +1,225 @@
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, RelationType
+from pyclassanalyzer.network.collapse import package_of, in_package
+from pyclassanalyzer.network.matrix import _as_list, _numpy
+
+
+class ClassMetrics(BaseModel):
+    """Design metrics of a class.
+
+    Attributes:
+        fan_in: number of distinct classes with a relation to this class.
+        fan_out: number of distinct classes this class has a relation to.
+        dit: depth of inheritance tree, counted within the analyzed classes.
+        noc: number of children (direct subclasses).
+        lcom: lack of cohesion of methods (LCOM4), the number of groups of
+            methods that share no attribute and do not call each other.
+    """
+    name: str
+    package: str
+    fan_in: int = 0
+    fan_out: int = 0
+    dit: int = 0
+    noc: int = 0
+    lcom: int = 0
+
+
+class PackageMetrics(BaseModel):
+    """Robert C. Martin's package coupling metrics.
+
+    Attributes:
+        classes: number of classes in the package.
+        ca: afferent coupling, classes outside the package that depend on it.
+        ce: efferent coupling, classes inside the package that depend on other packages.
+        instability: Ce / (Ca + Ce), 0 for a package without coupling.
+    """
+    name: str
+    classes: int = 0
+    ca: int = 0
+    ce: int = 0
+    instability: float = 0.0
+
+
+class DesignMetrics(BaseModel):
+    classes: List[ClassMetrics] = []
+    packages: List[PackageMetrics] = []
+
+    def focus(self, package: str) -> "DesignMetrics":
+        """Keep only the rows of a package and its subpackages."""
+        return DesignMetrics(
+            classes=[row for row in self.classes if in_package(row.package, package)],
+            packages=[row for row in self.packages if in_package(row.name, package)],
+        )
+
+
+def compute_metrics(class_graph: ClassGraph, depth: Optional[int] = None) -> DesignMetrics:
+    """Compute the class and package metrics in one pass over the indexed relations.
+
+    The relations are read from the cached CSR adjacency of the graph,
+    deduplicated once as (source, target) index pairs, and every count is
+    a histogram over those pairs. The inheritance depth is memoized, so
+    no class is visited twice.
+
+    Args:
+        class_graph (ClassGraph): The class graph.
+        depth (Optional[int]): The number of dotted components of the package names to keep.
+
+    Returns:
+        DesignMetrics: The metrics, sorted by package and name.
+    """
+    adjacency = class_graph.adjacency()
+    inheritance = class_graph.adjacency(RelationType.INHERITANCE)
+    names = adjacency.names
+    n = len(names)
+
+    package_names: List[str] = []
+    package_ids: Dict[str, int] = {}
+    package_of_class: List[int] = []
+    for node in class_graph.nodes.values():
+        package = package_of(node, depth)
+        if package not in package_ids:
+            package_ids[package] = len(package_names)
+            package_names.append(package)
+        package_of_class.append(package_ids[package])
+
+    # Distinct (source, target) pairs over all relation types
+    sources, targets = distinct_pairs(adjacency.sources(), adjacency.indices, n)
+    fan_out = histogram(sources, n)
+    fan_in = histogram(targets, n)
+
+    # A class depending on another package counts once for its own package (Ce)
+    # and once for every package it depends on (Ca)
+    efferent_classes = set()
+    afferent_pairs = set()
+    for source, target in zip(sources, targets):
+        source_package, target_package = package_of_class[source], package_of_class[target]
+        if source_package != target_package:
+            efferent_classes.add(source)
+            afferent_pairs.add((target_package, source))
+    ce = histogram([package_of_class[i] for i in efferent_classes], len(package_names))
+    ca = histogram([package for package, _ in afferent_pairs], len(package_names))
+    sizes = histogram(package_of_class, len(package_names))
+
+    indptr = _as_list(inheritance.indptr)
+    parents = _as_list(inheritance.indices)
+    depths = inheritance_depths([parents[indptr[i]:indptr[i + 1]] for i in range(n)])
+    children = _as_list(inheritance.in_degree())
+
+    classes = [
+        ClassMetrics.model_construct(
+            name=name,
+            package=package_names[package_of_class[i]],
+            fan_in=fan_in[i],
+            fan_out=fan_out[i],
+            dit=depths[i],
+            noc=children[i],
+            lcom=lcom(node),
+        )
+        for i, (name, node) in enumerate(zip(names, class_graph.nodes.values()))
+    ]
+    classes.sort(key=lambda row: (row.package, row.name))
+
+    packages = [
+        PackageMetrics.model_construct(
+            name=package_names[p],
+            classes=sizes[p],
+            ca=ca[p],
+            ce=ce[p],
+            instability=round(ce[p] / (ca[p] + ce[p]), 4) if ca[p] + ce[p] else 0.0,
+        )
+        for p in range(len(package_names))
+    ]
+    packages.sort(key=lambda row: row.name)
+
+    return DesignMetrics.model_construct(classes=classes, packages=packages)
+
+
+def distinct_pairs(sources, targets, n: int) -> Tuple[List[int], List[int]]:
+    """Deduplicate the (source, target) index pairs of parallel relations."""
+    np = _numpy()
+    if np is not None:
+        codes = np.unique(np.asarray(sources, dtype=np.int64) * n + np.asarray(targets, dtype=np.int64))
+        return (codes // n).tolist(), (codes % n).tolist()
+
+    pairs = sorted(set(zip(sources, targets)))
+    return [s for s, _ in pairs], [t for _, t in pairs]
+
+
+def histogram(values: List[int], size: int) -> List[int]:
+    """Count the occurrences of each integer in `range(size)`."""
+    np = _numpy()
+    if np is not None:
+        return np.bincount(np.asarray(values, dtype=np.int64), minlength=size).tolist()
+
+    counts = [0] * size
+    for value in values:
+        counts[value] += 1
+    return counts
+
+
+def inheritance_depths(parents: List[List[int]]) -> List[int]:
+    """Compute the depth of inheritance tree of every class, each class once.
+
+    Args:
+        parents (List[List[int]]): class index -> indices of its direct parents.
+
+    A class without an analyzed parent has depth 0. In an inheritance
+    cycle, the edge closing the cycle is ignored.
+    """
+    depths: List[int] = [-1] * len(parents)
+    visiting = [False] * len(parents)
+
+    for start in range(len(parents)):
+        if depths[start] >= 0:
+            continue
+
+        visiting[start] = True
+        stack = [(start, iter(parents[start]))]
+        while stack:
+            node, it = stack[-1]
+            for parent in it:
+                if depths[parent] < 0 and not visiting[parent]:
+                    visiting[parent] = True
+                    stack.append((parent, iter(parents[parent])))
+                    break
+            else:
+                stack.pop()
+                visiting[node] = False
+                depths[node] = max((depths[p] + 1 for p in parents[node] if depths[p] >= 0), default=0)
+
+    return depths
+
+
+def lcom(node: ClassNode) -> int:
+    """LCOM4 of a class: the number of connected components of its methods,
+    where two methods are connected if they use the same attribute or one calls the other.
+
+    `__init__` is left out, since it usually sets every attribute and
+    would join all the methods into a single component.
+    """
+    methods = [func for func in node.functions or [] if func.name != '__init__']
+    if not methods:
+        return 0
+
+    method_index = {func.name: i for i, func in enumerate(methods)}
+    root = list(range(len(methods)))
+
+    def find(i: int) -> int:
+        while root[i] != i:
+            root[i] = root[root[i]]
+            i = root[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    for i, func in enumerate(methods):
+        for name in func.uses or []:
+            if name in method_index:
+                j = method_index[name]
+            else:
+                j = owner.setdefault(name, i)
+            root[find(i)] = find(j)
+
+    return len({find(i) for i in range(len(methods))})
@@ -5,6 +5,7 @@ from typing import Optional, Dict, List, Generator, Tuple
 from pydantic import BaseModel, Field
 
 from pyclassanalyzer.utils.path import split_path
+from pyclassanalyzer.utils.log import logger
 
 
 PACKAGE = "package"
@@ -62,7 +63,13 @@ class PackageTree:
                 
                 current = current.create_child(name=part, type_=type_)
     
-    def traverse(self, base_path: str, excludes:List[str]) -> Generator[Tuple[str, ast.AST], None, None]:
+    def modules(self, base_path: str, excludes: List[str]) -> Generator[str, None, None]:
+        """Yield the paths of all modules in the tree without reading them.
+
+        Args:
+            base_path (str): The path of the root package.
+            excludes (List[str]): Package names to skip.
+        """
 
         def _dfs(node: PackageNode, path: List[str]):
             current_path = path + [node.value.name]
@@ -71,27 +78,22 @@ class PackageTree:
                 return
             
             if node.value.type_ == MODULE:
-                                
-                full_path = os.path.join(base_path, *current_path[1:])
-
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    tree = ast.parse(content)
-                    yield full_path, tree
+                yield os.path.join(base_path, *current_path[1:])
 
             for child in node.childs.values():
                 yield from _dfs(child, current_path)
 
         yield from _dfs(self.root, [])
-            
-    
-            
-            
-        
-    
-
-        
-    
     
+    def traverse(self, base_path: str, excludes:List[str]) -> Generator[Tuple[str, ast.AST], None, None]:
+        """Yield the parsed modules of the tree. Modules that can not be read or parsed are skipped."""
 
-    
\ No newline at end of file
+        for full_path in self.modules(base_path=base_path, excludes=excludes):
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                tree = ast.parse(content)
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.warning(f"Failed: {full_path}: {type(e).__name__}: {e}")
+                continue
+            yield full_path, tree
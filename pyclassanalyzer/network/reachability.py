@@ -0,0 +1,81 @@
+from typing import List, Set
+
+from pyclassanalyzer.network.algorithms import condensation
+from pyclassanalyzer.network.matrix import CSRAdjacency, _as_list
+
+
+class ReachabilityIndex:
+    """Transitive closure of a class graph, as one bitset per component.
+
+    The graph is condensed into its strongly connected components, and the
+    components reachable from each component are accumulated once, in reverse
+    topological order, as a Python int with one bit per component.
+    Afterwards a reachability query is a single bit test and a descendant set
+    is read from the bits, without walking the graph again.
+
+    The descendants follow the semantics of `ClassGraph.get_descendants`:
+    a class on a cycle, or with a relation to itself, is its own descendant.
+
+    Attributes:
+        adjacency: the adjacency matrix the index was built from.
+    """
+
+    def __init__(self, adjacency: CSRAdjacency) -> None:
+        self.adjacency = adjacency
+
+        n = adjacency.size
+        indptr = _as_list(adjacency.indptr)
+        indices = _as_list(adjacency.indices)
+        successors = {i: indices[indptr[i]:indptr[i + 1]] for i in range(n)}
+        components, component_of, dag = condensation(range(n), successors)
+
+        self._components: List[List[int]] = components
+        self._component_of: List[int] = [component_of[i] for i in range(n)]
+
+        looped = {self._component_of[i] for i in adjacency.loops}
+        # Successors of a component always have smaller ids,
+        # so they are complete when their predecessors are visited.
+        self._reach: List[int] = [0] * len(components)
+        for c, succs in enumerate(dag):
+            bits = 0
+            for d in succs:
+                bits |= self._reach[d] | (1 << d)
+            if len(components[c]) > 1 or c in looped:
+                bits |= 1 << c
+            self._reach[c] = bits
+
+    def reaches(self, source: str, target: str) -> bool:
+        """Check if `target` is a descendant of `source`. Unknown classes reach nothing."""
+        index = self.adjacency.index
+        if source not in index or target not in index:
+            return False
+        return bool(self._reach[self._component_of[index[source]]] >> self._component_of[index[target]] & 1)
+
+    def descendants(self, name: str) -> Set[str]:
+        """Return the classes reachable from `name`."""
+        index = self.adjacency.index
+        if name not in index:
+            return set()
+        return self._members(self._reach[self._component_of[index[name]]])
+
+    def count(self, name: str) -> int:
+        """Return the number of classes reachable from `name`."""
+        index = self.adjacency.index
+        if name not in index:
+            return 0
+        bits = self._reach[self._component_of[index[name]]]
+        total = 0
+        while bits:
+            low = bits & -bits
+            total += len(self._components[low.bit_length() - 1])
+            bits ^= low
+        return total
+
+    def _members(self, bits: int) -> Set[str]:
+        names = self.adjacency.names
+        members: Set[str] = set()
+        while bits:
+            low = bits & -bits
+            members.update(names[i] for i in self._components[low.bit_length() - 1])
+            bits ^= low
+        return members
@@ -0,0 +1,91 @@
+import fnmatch
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from pyclassanalyzer.network.facts import FileIssue
+
+
+class FileTimeout(TimeoutError):
+    """Raised when a single module takes longer than `limits.timeout` to analyze."""
+
+
+class FileLimits(BaseModel):
+    """Per-file guards of the analysis, read from the `[limits]` section of the config.
+
+    Example:
+        [limits]
+        max_file_size = 2097152
+        timeout = 30
+        skip = ["*_pb2.py", "*/migrations/*"]
+
+    Attributes:
+        max_file_size: larger modules are skipped, in bytes. 0 for no limit.
+        timeout: seconds allowed to analyze a single module. 0 for no limit.
+        skip: glob patterns of the modules to skip, matched against the
+            path relative to the source root (with "/") and the file name.
+    """
+    max_file_size: int = 2 * 1024 * 1024
+    timeout: float = 30.0
+    skip: List[str] = []
+
+    @classmethod
+    def from_config(cls, config) -> "FileLimits":
+        data = getattr(config, 'data', {}).get('limits') or {}
+        return cls(**{key: value for key, value in data.items() if key in cls.model_fields})
+
+    def check(self, path: str, base_path: str) -> Optional[FileIssue]:
+        """Return why the module must be skipped, without reading it. None if it can be analyzed."""
+        relative = os.path.relpath(path, base_path).replace(os.sep, "/")
+        name = os.path.basename(path)
+        for pattern in self.skip:
+            if fnmatch.fnmatch(relative, pattern) or fnmatch.fnmatch(name, pattern):
+                return FileIssue(kind="skipped", reason=f"matches skip pattern {pattern!r}")
+
+        if self.max_file_size > 0:
+            size = os.path.getsize(path)
+            if size > self.max_file_size:
+                return FileIssue(kind="skipped", reason=f"{size} bytes exceeds max_file_size {self.max_file_size}")
+        return None
+
+
+@contextmanager
+def time_limit(seconds: float) -> Iterator[None]:
+    """Raise `FileTimeout` in the block once `seconds` have elapsed.
+
+    The alarm is only available on the main thread of platforms with
+    `signal.setitimer`. Elsewhere the block runs without a limit, and the
+    worker timeouts of the parallel analysis are the remaining guard.
+    An alarm the application has already armed is kept: the block runs
+    without a limit if it is due first, otherwise it is armed again on exit
+    with its remaining time, and the previous handler is restored.
+    """
+    if seconds <= 0 or not hasattr(signal, 'setitimer') or \
+       threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    remaining, interval = signal.getitimer(signal.ITIMER_REAL)
+    if remaining and remaining <= seconds:
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise FileTimeout(f"timed out after {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    start = time.monotonic()
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if remaining:
+            # A tiny delay still fires an alarm that came due meanwhile
+            signal.setitimer(signal.ITIMER_REAL, max(remaining - (time.monotonic() - start), 1e-6), interval)
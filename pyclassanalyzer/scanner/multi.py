@@ -0,0 +1,200 @@
+import glob
+import os
+import re
+from typing import Dict, List, Optional, Iterable
+
+from pyclassanalyzer.config import TomlConfig
+from pyclassanalyzer.network.classgraph import ClassGraph, ModuleDef, Relation
+from pyclassanalyzer.network.facts import FactsCache, FileIssue
+from pyclassanalyzer.scanner.scanner import GraphScanner
+from pyclassanalyzer.scanner.schedule import extract_scheduled
+from pyclassanalyzer.utils.path import find_root_name
+
+
+def expand_roots(patterns: Iterable[str]) -> List[str]:
+    """Expand the glob patterns into the source root directories.
+
+    ex) ["services/*/src", "libs/*"] -> ["services/a/src", "services/b/src", "libs/core"]
+
+    Roots are returned in the given order without duplicates.
+    Patterns matching no directory are ignored.
+    """
+    roots: Dict[str, None] = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                roots[os.path.normpath(path)] = None
+    return list(roots)
+
+
+def root_labels(roots: List[str]) -> Dict[str, str]:
+    """Give each root the shortest unique dotted label made of its last path components.
+
+    ex) services/a/src, services/b/src, libs/core -> a.src, b.src, core
+    """
+    parts = {root: [re.sub(r"\W", "_", part) for part in os.path.abspath(root).split(os.sep) if part]
+             for root in roots}
+    depth = {root: 1 for root in roots}
+
+    while True:
+        labels = {root: ".".join(parts[root][-depth[root]:]) for root in roots}
+        seen: Dict[str, List[str]] = {}
+        for root, label in labels.items():
+            seen.setdefault(label, []).append(root)
+
+        collisions = [root for same in seen.values() if len(same) > 1 for root in same
+                      if depth[root] < len(parts[root])]
+        if not collisions:
+            return labels
+        for root in collisions:
+            depth[root] += 1
+
+
+class MultiRootScanner(GraphScanner):
+    """Analyze several source roots and merge them into one class graph.
+
+    Each root keeps its own module summaries (and its own cache file),
+    so when one root changes only its modules are parsed again.
+    The changed modules of all the roots are parsed in parallel worker
+    processes, scheduled longest first (see `schedule.extract_scheduled`).
+
+    Classes are qualified with the label of their root, ex) `a.src.Config`,
+    so the same class name in two roots does not collide. Their packages
+    are qualified in the same way, ex) `a.src.config`.
+    """
+
+    def __init__(self, roots: List[str], config: TomlConfig,
+                 workers: Optional[int] = None, cache_dir: Optional[str] = None,
+                 memory_cache: Optional[FactsCache] = None) -> None:
+        super().__init__(path=os.path.commonpath([os.path.abspath(root) for root in roots]), config=config,
+                         workers=workers, memory_cache=memory_cache)
+
+        self.scanners: Dict[str, GraphScanner] = {}
+        for root, label in root_labels(roots).items():
+            cache_path = os.path.join(cache_dir, f"{label}.json") if cache_dir else None
+            self.scanners[label] = GraphScanner(path=root, config=config, cache_path=cache_path,
+                                                memory_cache=memory_cache)
+
+    def analyze(self):
+        self.graph = ClassGraph()
+        for scanner in self.scanners.values():
+            scanner.module_facts = {}
+            scanner._stamps = {}
+            if scanner.cache_path:
+                scanner.load_cache(scanner.cache_path)
+        self.refresh()
+
+    def refresh(self) -> List[str]:
+        """Re-analyze the changed modules of every root, then merge the roots.
+
+        Returns:
+            List[str]: The paths of the added, changed and removed modules.
+        """
+        changed: List[str] = []
+        pending = {}
+        reused = {}
+        for label, scanner in self.scanners.items():
+            updated, removed = scanner.pending_changes()
+            scanner.drop_modules(removed)
+            changed.extend(removed)
+            if updated:
+                pending[label] = updated
+            elif removed and scanner.cache_path:
+                scanner.save_cache(scanner.cache_path)
+            reused[label], _ = scanner.reuse_modules(updated)
+
+        to_parse = {label: [(path, stamp) for path, stamp in updated if path not in reused[label]]
+                    for label, updated in pending.items()}
+        results = self._extract({label: updated for label, updated in to_parse.items() if updated})
+        for label, updated in pending.items():
+            scanner = self.scanners[label]
+            scanner.store_modules(updated, reused[label], dict(results.get(label, [])))
+            changed.extend(path for path, _ in updated)
+            if scanner.cache_path:
+                scanner.save_cache(scanner.cache_path)
+
+        if changed or not self.graph.nodes:
+            self.graph = merge_roots({
+                label: (find_root_name(scanner.path), scanner.module_facts.values())
+                for label, scanner in self.scanners.items()
+            })
+        return changed
+
+    @property
+    def issues(self) -> Dict[str, FileIssue]:
+        issues = {}
+        for scanner in self.scanners.values():
+            issues.update(scanner.issues)
+        return dict(sorted(issues.items()))
+
+    def _extract(self, pending: Dict[str, list]) -> Dict[str, list]:
+        # The modules of all the roots share one schedule, so a large root
+        # is spread over the workers instead of keeping one of them busy
+        jobs = {label: (self.scanners[label].path, [path for path, _ in updated])
+                for label, updated in pending.items()}
+        timings = {}
+        for label in pending:
+            timings.update(self.scanners[label].timings())
+        return extract_scheduled(jobs, self.config, self.workers, timings)
+
+
+def qualify_package(package: Optional[str], root_name: str, label: str) -> str:
+    """Replace the root package name with the root label. ex) (src.config, src, a.src) -> a.src.config"""
+    if not package or package == root_name:
+        return label
+    if package.startswith(root_name + "."):
+        return label + package[len(root_name):]
+    return f"{label}.{package}"
+
+
+def merge_roots(roots: Dict[str, tuple]) -> ClassGraph:
+    """Merge the module summaries of several roots into one graph of qualified classes.
+
+    Args:
+        roots (Dict[str, tuple]): root label -> (root package name, module summaries).
+
+    Returns:
+        ClassGraph: The merged graph.
+
+    NOTE:
+        A relation target is looked up in the root of its source first.
+        Otherwise it is linked to the class of another root with that name,
+        when exactly one root defines it. Ambiguous targets are dropped.
+    """
+    roots = {label: (root_name, list(facts)) for label, (root_name, facts) in roots.items()}
+    graph = ClassGraph()
+
+    local: Dict[str, Dict[str, str]] = {}
+    owners: Dict[str, List[str]] = {}
+    for label, (root_name, facts) in roots.items():
+        names = local.setdefault(label, {})
+        for module in facts:
+            for class_ in module.classes:
+                qualified = f"{label}.{class_.name}"
+                module_def = class_.module or ModuleDef(name=class_.name)
+                graph.add_node(class_.model_copy(update={
+                    "name": qualified,
+                    "module": module_def.model_copy(update={
+                        "name": qualify_package(module_def.name, root_name, label),
+                        "package": qualify_package(module_def.package, root_name, label),
+                    }),
+                }))
+                if class_.name not in names:
+                    owners.setdefault(class_.name, []).append(label)
+                names[class_.name] = qualified
+
+    for label, (_, facts) in roots.items():
+        names = local[label]
+        for module in facts:
+            for relation in module.relations:
+                source = names.get(relation.source)
+                target = names.get(relation.target)
+                if target is None and len(owners.get(relation.target, ())) == 1:
+                    target = local[owners[relation.target][0]][relation.target]
+                if source is None or target is None:
+                    continue
+                graph.add_relation(Relation(source=source, target=target, type_=relation.type_))
+
+    return graph
+
@@ -1,41 +1,236 @@
 import ast
+import hashlib
+import json
 import os
-from datetime import datetime
-from typing import Optional, List
+import sys
+import threading
+from contextlib import ExitStack
+from io import StringIO
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple, TYPE_CHECKING
 
-from pyclassanalyzer.analyzer.package import PackageAnalyzer, analyze_module
-from pyclassanalyzer.visitors.visitor import Visitor
+from pyclassanalyzer.analyzer.package import PackageAnalyzer
 from pyclassanalyzer.network.classgraph import ClassGraph
+from pyclassanalyzer.network.facts import FACTS_VERSION, FactsCache, FileIssue, ModuleFacts, ScanCache
 from pyclassanalyzer.generators.plantuml import PlantUMLGenerator
+from pyclassanalyzer.scanner.schedule import extract_scheduled
 from pyclassanalyzer.config import TomlConfig
+from pyclassanalyzer.utils.log import logger, progress
+from pyclassanalyzer.utils.pathspec import PathFilter
+
+if TYPE_CHECKING:
+    from pyclassanalyzer.network.metrics import DesignMetrics
+
+# Tables of the configuration that only change how the outputs are drawn.
+# They are left out of the cache fingerprint, so changing them does not parse the modules again.
+OUTPUT_KEYS = ("members",)
+
+# The collapse, ranking, metrics and exporter modules are imported in the
+# methods using them: most runs only draw the diagram, and they pull in NumPy.
 
 
 class GraphScanner:
-    def __init__(self, path: str, config: TomlConfig):
+    def __init__(self, path: str, config: TomlConfig, cache_path: Optional[str] = None,
+                 workers: Optional[int] = 1, memory_cache: Optional[FactsCache] = None,
+                 keep_unresolved: bool = False):
         self.path = path
         self.config = config
+        # Worker processes to parse the modules, None for the CPU count
+        self.workers = workers
+        # Exclusions and inclusions of the walk, compiled once
+        self.path_filter = PathFilter.from_config(config)
+        # If set, the module summaries are kept in this file between runs
+        self.cache_path = cache_path
+        # If set, the module summaries are shared with the other scanners of the process
+        self.memory_cache = memory_cache
+        # If set, the relations to classes outside the root are kept for `ClassGraph.merge`
+        self.keep_unresolved = keep_unresolved
         self.graph = ClassGraph()
-        self.visitor = Visitor(graph=self.graph, config=config)
         self.plantuml_generator = PlantUMLGenerator(config=config)
+        
+        # Per-module summaries, keyed by the module path
+        self.module_facts: Dict[str, ModuleFacts] = {}
+        # (mtime, size) of each summarized module, for incremental refresh
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+    
+    @property
+    def project_name(self) -> str:
+        return os.path.basename(os.path.abspath(self.path))
     
     def analyze(self):
         """Analyze the class diagram from the package tree."""
         
+        self.graph = ClassGraph()
+        self.module_facts = {}
+        self._stamps = {}
+        if self.cache_path:
+            self.load_cache(self.cache_path)
+        self.refresh()
+    
+    def refresh(self) -> List[str]:
+        """Re-analyze only the modules changed since the last analysis.
+        
+        Returns:
+            List[str]: The paths of the added, changed and removed modules.
+        
+        NOTE:
+            Each module is summarized right after it is parsed,
+            and its AST is released before the next module is read.
+            Relations are resolved only after every class is known,
+            so the graph is rebuilt from all the summaries when anything changed.
+        """
+        
+        updated, removed = self.pending_changes()
+        reused, to_parse = self.reuse_modules(updated)
+        results = extract_scheduled({self.path: (self.path, [path for path, _ in to_parse])},
+                                    self.config, self.workers, self.timings())
+        self.store_modules(updated, reused, dict(results[self.path]))
+        self.drop_modules(removed)
+        
+        changed = [path for path, _ in updated] + removed
+        if changed and self.cache_path:
+            self.save_cache(self.cache_path)
+        if changed or not self.graph.nodes:
+            self.graph = build_graph(self.module_facts.values(), keep_unresolved=self.keep_unresolved)
+        return changed
+    
+    def pending_changes(self) -> Tuple[List[Tuple[str, Tuple[int, int]]], List[str]]:
+        """Find the modules to re-analyze, without parsing anything.
+        
+        Returns:
+            Tuple: The (path, stamp) of the new and modified modules,
+            and the paths of the removed modules.
+        """
+        
+        updated = []
+        paths = set()
+        with progress("discover") as reporter:
+            for path in self._discover_modules():
+                try:
+                    stamp = file_stamp(path)
+                except FileNotFoundError:
+                    # Deleted or renamed since it was listed, ex) an editor saving the file
+                    continue
+                paths.add(path)
+                if self._stamps.get(path) != stamp:
+                    updated.append((path, stamp))
+                reporter.advance()
+        logger.debug(f"{self.path}: {len(updated)} of {len(paths)} modules to parse")
+        
+        return updated, sorted(set(self.module_facts) - paths)
+    
+    @property
+    def issues(self) -> Dict[str, FileIssue]:
+        """The modules skipped or failed in the analysis, by path.
+        
+        They keep their stamp, so they are tried again only once they change.
+        """
+        return {path: facts.issue for path, facts in sorted(self.module_facts.items()) if facts.issue}
+    
+    def log_issues(self) -> None:
+        """Log the report of the skipped and failed modules."""
+        issues = self.issues
+        if not issues:
+            return
+        
+        for path, issue in issues.items():
+            if issue.kind == "failed":
+                logger.warning(f"Failed: {path}: {issue.reason}")
+            else:
+                logger.info(f"Skipped: {path}: {issue.reason}")
+        
+        failed = sum(1 for issue in issues.values() if issue.kind == "failed")
+        logger.warning(f"{len(issues) - failed} modules skipped, {failed} modules failed.")
+    
+    def reuse_modules(self, updated: List[Tuple[str, Tuple[int, int]]]) -> Tuple[Dict[str, ModuleFacts], List[Tuple[str, Tuple[int, int]]]]:
+        """Split the modules to analyze into the ones found in the memory cache and the ones to parse."""
+        if self.memory_cache is None:
+            return {}, updated
+        
+        fingerprint = config_fingerprint(self.config)
+        reused, to_parse = {}, []
+        for path, stamp in updated:
+            facts = self.memory_cache.get(fingerprint, path, stamp)
+            if facts is None:
+                to_parse.append((path, stamp))
+            else:
+                reused[path] = facts
+        return reused, to_parse
+    
+    def store_modules(self, updated: List[Tuple[str, Tuple[int, int]]],
+                      reused: Dict[str, ModuleFacts], parsed: Dict[str, ModuleFacts]) -> None:
+        """Keep the summaries of the updated modules, in discovery order."""
+        fingerprint = config_fingerprint(self.config) if self.memory_cache is not None else None
+        for path, stamp in updated:
+            if path in reused:
+                facts = reused[path]
+            else:
+                facts = parsed[path]
+                if self.memory_cache is not None:
+                    self.memory_cache.put(fingerprint, path, stamp, facts)
+            self.module_facts[path] = facts
+            self._stamps[path] = stamp
+    
+    def timings(self) -> Dict[str, Tuple[int, float]]:
+        """(size, seconds) of the modules measured in the previous analysis, to schedule the next one."""
+        return {path: (self._stamps[path][1], facts.cost)
+                for path, facts in self.module_facts.items() if facts.cost and path in self._stamps}
+    
+    def drop_modules(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            self.module_facts.pop(path, None)
+            self._stamps.pop(path, None)
+    
+    def load_cache(self, cache_path: str) -> bool:
+        """Load the module summaries saved by `save_cache`.
+        
+        The cache is ignored if it was written with another configuration,
+        since the configuration changes what is extracted.
+        
+        Returns:
+            bool: True if the cache was loaded.
+        """
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = ScanCache.model_validate_json(f.read())
+        except (OSError, ValueError):
+            return False
+        
+        if cache.fingerprint != config_fingerprint(self.config):
+            return False
+        
+        self.module_facts = dict(cache.modules)
+        self._stamps = {path: tuple(stamp) for path, stamp in cache.stamps.items()}
+        return True
+    
+    def save_cache(self, cache_path: str) -> None:
+        """Save the module summaries and their stamps, so the next run only parses the changed modules."""
+        
+        cache = ScanCache(
+            fingerprint=config_fingerprint(self.config),
+            stamps=self._stamps,
+            modules=self.module_facts,
+        )
+        
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Write to a temporary file first, so an interrupted run never leaves a broken cache
+        # (unique per writer, so concurrent analyses of the same root do not collide)
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(cache.model_dump_json())
+        os.replace(temp_path, cache_path)
+    
+    def _discover_modules(self) -> Iterator[str]:
         excludes = self.config.get('exclude')['directories']
         
-        package_analyzer = PackageAnalyzer(path=self.path)
+        package_analyzer = PackageAnalyzer(path=self.path, path_filter=self.path_filter)
         package_tree = package_analyzer.analyze()
         
-        # NOTE: To avoid read file twice, 
-        # collect all nodes first, then visit them again .
-        all_nodes = []
-        for _, tree in package_tree.traverse(base_path=self.path, excludes=excludes):
-            for node in tree.body:
-                all_nodes.append(node)
-                self.visitor.visit(node) 
-        
-        for node in all_nodes:
-            self.visitor.visit(node) 
+        return package_tree.modules(base_path=self.path, excludes=excludes)
     
     def print_plantuml(self, output_path: Optional[str] = None, title: Optional[str] = None):
         """Print the class diagram to the console.
@@ -47,8 +242,7 @@ class GraphScanner:
         
         # title
         if title is None:
-            project_name = os.path.basename(os.path.abspath(self.path))
-            title = f"{project_name} Class Diagram"
+            title = f"{self.project_name} Class Diagram"
         
         # print to console
         plantuml_content = self.plantuml_generator.generate_plantuml(self.graph, title)
@@ -62,9 +256,9 @@ class GraphScanner:
         if output_path:
             success = self.plantuml_generator.save_to_file(self.graph, output_path, title)
             if success:
-                print(f"PlantUML file saved: {output_path}")
+                logger.info(f"PlantUML file saved: {output_path}")
             else:
-                print("Failed to save file.")
+                logger.error("Failed to save file.")
         
         return plantuml_content
     
@@ -82,11 +276,191 @@ class GraphScanner:
             If the output_path is not specified, the class diagram is saved to the current directory.
         """
         
+        try:
+            self.save_outputs(output_path, ["plantuml"], title)
+        except OSError:
+            return False
+        return True
+    
+    def save_package_overview(self, output_path: str, depth: Optional[int] = None, title: Optional[str] = None) -> bool:
+        """Save a diagram with the packages as nodes instead of the classes.
+        
+        Args:
+            output_path (str): The path to save the diagram.
+            depth (Optional[int]): The number of dotted components of the package names to keep.
+            title (Optional[str]): The title of the diagram.
+            
+        Returns:
+            bool: True if the diagram is saved successfully, False otherwise.
+        """
+        
         if title is None:
-            project_name = os.path.basename(os.path.abspath(self.path))
-            title = f"{project_name} Class Diagram"
+            title = f"{self.project_name} Package Overview"
+        
+        from pyclassanalyzer.network.collapse import collapse_to_packages
+        
+        package_graph = collapse_to_packages(self.graph, depth=depth, config=self.config)
+        content = self.plantuml_generator.generate_package_overview(package_graph, title)
+        return self.plantuml_generator.write_file(content, output_path)
+    
+    def focus(self, package: str) -> None:
+        """Restrict the class graph to a package and its subpackages.
+        
+        Args:
+            package (str): The dotted package name. ex) pyclassanalyzer.network
+        """
+        from pyclassanalyzer.network.collapse import classes_in_package
         
-        return self.plantuml_generator.save_to_file(self.graph, output_path, title)
+        self.graph = self.graph.subgraph(classes_in_package(self.graph, package))
+    
+    def limit_classes(self, limit: int, metric: str = "pagerank") -> None:
+        """Keep only the most important classes when there are more than `limit`.
+        
+        Args:
+            limit (int): The maximum number of classes.
+            metric (str): The importance measure. ex) pagerank, in-degree, betweenness
+        """
+        from pyclassanalyzer.network.matrix import top_classes
+        
+        self.graph = top_classes(self.graph, limit, metric)
+    
+    def save_outputs(self, output_path: str, formats: List[str], title: Optional[str] = None,
+                     summary: bool = False) -> Dict[str, str]:
+        """Write any number of outputs from a single traversal of the class graph.
+        
+        Each format streams to a temporary file, which replaces the output only
+        if its content changed, as recorded in the manifest of the output directory.
+        PlantUML is buffered instead (see `PlantUMLGenerator.write_file`).
+        
+        Args:
+            output_path (str): The PlantUML path. The other formats replace its extension with theirs.
+            formats (List[str]): The output names (plantuml, json, jsonl, graphml, dot, svg, html).
+            title (Optional[str]): The title of the class diagram.
+            summary (bool): Whether to also print the analysis summary.
+            
+        Returns:
+            Dict[str, str]: format -> written file path.
+        
+        Raises:
+            OSError: If the PlantUML diagram can not be saved.
+        """
+        from pyclassanalyzer.generators.exporters import export, get_exporter
+        from pyclassanalyzer.generators.manifest import OutputManifest
+        from pyclassanalyzer.generators.summary import SummaryExporter
+        
+        if title is None:
+            title = f"{self.project_name} Class Diagram"
+        
+        exporter_classes = {name: get_exporter(name) for name in formats}
+        
+        paths = {}
+        temp_paths = {}
+        plantuml = None
+        try:
+            with ExitStack() as stack:
+                exporters = [SummaryExporter(sys.stdout)] if summary else []
+                for name, exporter_class in exporter_classes.items():
+                    if name == "plantuml":
+                        plantuml = StringIO()
+                        exporters.append(exporter_class(plantuml, config=self.config, path=output_path,
+                                                        generator=self.plantuml_generator))
+                        continue
+                    
+                    path = str(Path(output_path).with_suffix(exporter_class.extension))
+                    directory = os.path.dirname(path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    
+                    temp_paths[path] = f"{path}.{os.getpid()}.tmp"
+                    stream = stack.enter_context(open(temp_paths[path], 'w', encoding='utf-8'))
+                    exporters.append(exporter_class(stream, config=self.config, path=path))
+                    paths[name] = path
+                
+                export(self.graph, exporters, self.config, title)
+        except BaseException:
+            for temp_path in temp_paths.values():
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+        
+        if temp_paths:
+            # All the formats share the directory of the output path
+            directory = os.path.dirname(output_path) or "."
+            manifest = OutputManifest.load(directory)
+            for path, temp_path in temp_paths.items():
+                manifest.replace(path, temp_path)
+            manifest.save(directory)
+        
+        if plantuml is not None:
+            if not self.plantuml_generator.write_file(plantuml.getvalue(), output_path):
+                raise OSError(f"파일 저장 실패: {output_path}")
+            paths["plantuml"] = output_path
+        return paths
+    
+    def save_exports(self, output_path: str, formats: List[str], title: Optional[str] = None) -> List[str]:
+        """Save the class graph in machine-readable formats from a single traversal (see `save_outputs`).
+        
+        Returns:
+            List[str]: The written file paths.
+        """
+        return list(self.save_outputs(output_path, formats, title).values())
+    
+    def compute_metrics(self, depth: Optional[int] = None) -> "DesignMetrics":
+        """Compute the class and package design metrics of the analyzed graph.
+        
+        Args:
+            depth (Optional[int]): The number of dotted components of the package names to keep.
+        """
+        from pyclassanalyzer.network.metrics import compute_metrics
+        
+        return compute_metrics(self.graph, depth=depth)
+    
+    def save_queries(self, queries_path: str, output_path: str) -> str:
+        """Answer the queries of a JSON file in one batch and save the results.
+        
+        Args:
+            queries_path (str): JSON file mapping query types to class names.
+                ex) {"ancestors": ["Dog"], "neighbors": ["Dog", "Cat"]}
+            output_path (str): The base path. The results are saved to `<name>.queries.json`.
+            
+        Returns:
+            str: The written file path.
+        """
+        from pyclassanalyzer.generators.exporters import relation_to_dict
+        
+        with open(queries_path, 'r', encoding='utf-8') as f:
+            queries = json.load(f)
+        if not isinstance(queries, dict) or \
+           not all(isinstance(names, list) for names in queries.values()):
+            raise ValueError(f"Queries file must map query types to lists of class names: {queries_path}")
+        
+        results = {
+            type_: {
+                name: sorted(result) if isinstance(result, set) else [relation_to_dict(rel) for rel in result]
+                for name, result in answers.items()
+            }
+            for type_, answers in self.graph.query(queries).items()
+        }
+        
+        path = str(Path(output_path).with_suffix('.queries.json'))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        return path
+    
+    def save_index(self, index_path: str) -> str:
+        """Save the symbol index of the class graph, to answer queries without analyzing again
+        (see `network.index.SymbolIndex`).
+        
+        Args:
+            index_path (str): The SQLite file of the index.
+            
+        Returns:
+            str: The written file path.
+        """
+        from pyclassanalyzer.network.index import write_index
+        
+        return write_index(self.graph, index_path, root=os.path.abspath(self.path))
     
     def get_plantuml_content(self, title: Optional[str] = None) -> str:
         """Get the class diagram as a string.
@@ -99,48 +473,84 @@ class GraphScanner:
         """
         
         if title is None:
-            project_name = os.path.basename(os.path.abspath(self.path))
-            title = f"{project_name} Class Diagram"
+            title = f"{self.project_name} Class Diagram"
         
         return self.plantuml_generator.generate_plantuml(self.graph, title)
     
     def print_graph_count(self):
-        """Print the number of nodes and relations in the class graph."""
+        """Log the number of nodes and relations in the class graph."""
         
         node_cnt = len(self.graph.nodes)
         relation_cnt = len(self.graph.relations)
         
         if node_cnt == 0:
-            print("Warning: No classes found. Please check the path.")
+            logger.warning("No classes found. Please check the path.")
         else:
-            print(f"Total {node_cnt} classes and {relation_cnt} relations found.")
+            logger.info(f"Total {node_cnt} classes and {relation_cnt} relations found.")
     
     def print_analysis_summary(self):
-        """Print the analysis summary."""
-        
-        print(f"Analysis completed!")
-        print(f"- Found {len(self.graph.nodes)} classes")
-        print(f"- Found {len(self.graph.relations)} relations")
-        
-        if self.graph.nodes:
-            print("- Class list:")
-            for node_name in sorted(self.graph.nodes.keys()):
-                print(f"  * {node_name}")
-        
-        if self.graph.relations:
-            print("- Relation list:")
-            relation_counts = {}
-            for rel in self.graph.relations:
-                rel_type = rel.type_.value if hasattr(rel.type_, 'value') else str(rel.type_)
-                relation_counts[rel_type] = relation_counts.get(rel_type, 0) + 1
-            
-            for rel_type, count in relation_counts.items():
-                print(f"  * {rel_type}: {count}개")
+        """Print the analysis summary. Use `save_outputs(..., summary=True)` to print it
+        from the traversal writing the other outputs."""
+        from pyclassanalyzer.generators.base import export
+        from pyclassanalyzer.generators.summary import SummaryExporter
         
-        print("-" * 40)
+        export(self.graph, [SummaryExporter(sys.stdout)], self.config)
     
     def generate_auto_filename(self) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        project_name = os.path.basename(os.path.abspath(self.path))
-        return f"{project_name}_{timestamp}.puml"
-        
\ No newline at end of file
+        # No timestamp, so an unchanged diagram keeps its file and is not written again
+        return f"{self.project_name}.puml"
+
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """Return the (mtime, size) of a file to detect modifications."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def config_fingerprint(config: TomlConfig) -> str:
+    """Return a digest of the configuration and of the facts version,
+    to invalidate the caches written with another one."""
+    data = {key: value for key, value in getattr(config, 'data', {}).items() if key not in OUTPUT_KEYS}
+    content = json.dumps([FACTS_VERSION, data], sort_keys=True, default=str)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def build_graph(facts: Iterable[ModuleFacts], keep_unresolved: bool = False) -> ClassGraph:
+    """Build the class graph from the module summaries.
+    
+    Args:
+        facts (Iterable[ModuleFacts]): The module summaries.
+        keep_unresolved (bool): Whether to keep the relations to classes defined elsewhere,
+            for graphs of separate subtrees (shards) to be merged (see `ClassGraph.merge`).
+        
+    Returns:
+        ClassGraph: The class graph.
+    
+    NOTE:
+        All the classes are added first, so that relations between
+        modules can be resolved regardless of the module order.
+        Other relations are dropped: most of them point to builtins and functions.
+        With `keep_unresolved`, only the ones whose target looks like a class
+        (see `looks_like_class`) are kept, so the graph still scales with the classes.
+    """
+    facts = list(facts)
+    graph = ClassGraph()
+    
+    for module in facts:
+        for class_ in module.classes:
+            graph.add_node(class_)
+    
+    for module in facts:
+        for relation in module.relations:
+            if graph.add_relation(relation) or not keep_unresolved:
+                continue
+            if looks_like_class(relation.source) and looks_like_class(relation.target):
+                graph.defer_relation(relation)
+    
+    return graph
+
+
+def looks_like_class(name: str) -> bool:
+    """Check if a name can refer to a class, by the naming convention. ex) Config, models.User"""
+    last = name.rsplit(".", 1)[-1]
+    return last[:1].isupper()
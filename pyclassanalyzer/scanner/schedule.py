@@ -0,0 +1,239 @@
+import os
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from pyclassanalyzer.analyzer.package import analyze_module
+from pyclassanalyzer.network.classgraph import ModuleDef, ModuleType
+from pyclassanalyzer.network.facts import FileIssue, ModuleFacts
+from pyclassanalyzer.scanner.limits import FileLimits, FileTimeout, time_limit
+from pyclassanalyzer.visitors.visitor import Visitor
+from pyclassanalyzer.utils.log import logger, progress
+from pyclassanalyzer.utils.path import module_name
+
+# Seconds to parse and visit one byte of source, until timings of previous runs are known
+DEFAULT_SECONDS_PER_BYTE = 4e-7
+# Below this estimated total, starting worker processes costs more than it saves
+MIN_PARALLEL_SECONDS = 1.0
+# Smallest amount of work sent to a worker at once, to amortize the inter-process overhead
+MIN_CHUNK_SECONDS = 0.05
+# Chunks per worker: more chunks balance the load better, fewer cost less overhead
+CHUNKS_PER_WORKER = 4
+# Extra seconds given to a chunk over the per-file timeouts of its modules
+WORKER_GRACE = 30.0
+
+# (root label, module path)
+Item = Tuple[Hashable, str]
+
+
+def extract_module(visitor: Visitor, path: str, base_path: str, limits: Optional[FileLimits] = None) -> ModuleFacts:
+    """Parse a module and summarize its classes. The AST is released on return.
+    
+    A module that is skipped by the limits, or that can not be read, parsed
+    or analyzed, gives empty facts with the issue recorded, so one bad file
+    does not stop the analysis. The time spent is recorded in `cost`.
+    """
+    limits = limits or FileLimits()
+    name, package = module_name(path, base_path)
+    module = ModuleDef(name=name, type_=ModuleType.INTERNAL, package=package)
+    
+    start = time.perf_counter()
+    try:
+        issue = limits.check(path, base_path)
+        if issue is not None:
+            return ModuleFacts(path=path, issue=issue)
+        
+        with time_limit(limits.timeout):
+            tree = analyze_module(path)
+            facts = visitor.extract(tree, path, module=module)
+        facts.cost = time.perf_counter() - start
+        return facts
+    except FileTimeout as e:
+        reason = str(e)
+    except Exception as e:
+        reason = f"{type(e).__name__}: {e}"
+    
+    logger.debug(f"Failed to analyze {path}: {reason}")
+    return ModuleFacts(path=path, issue=FileIssue(kind="failed", reason=reason),
+                       cost=time.perf_counter() - start)
+
+
+def extract_chunk(items: List[Tuple[str, str]], config) -> List[Tuple[str, ModuleFacts]]:
+    """Summarize a chunk of (root path, module path).
+    
+    This is a plain function, so it can run in a worker process.
+    """
+    visitor = Visitor(config=config)
+    limits = FileLimits.from_config(config)
+    return [(path, extract_module(visitor, path, base_path, limits)) for base_path, path in items]
+
+
+def estimate_costs(sizes: Dict[Item, int], history: Dict[str, Tuple[int, float]]) -> Dict[Item, float]:
+    """Estimate the seconds needed to analyze each module.
+
+    Args:
+        sizes (Dict[Item, int]): module -> current size in bytes.
+        history (Dict[str, Tuple[int, float]]): module path -> (size, seconds) measured in a previous run.
+
+    Returns:
+        Dict[Item, float]: module -> estimated seconds.
+
+    NOTE:
+        A module measured before is scaled by its change of size.
+        Other modules are estimated from their size, at the rate measured
+        over the history, or at `DEFAULT_SECONDS_PER_BYTE` without history.
+    """
+    measured_bytes = sum(size for size, _ in history.values())
+    measured_seconds = sum(seconds for _, seconds in history.values())
+    rate = measured_seconds / measured_bytes if measured_bytes and measured_seconds else DEFAULT_SECONDS_PER_BYTE
+
+    costs = {}
+    for item, size in sizes.items():
+        previous = history.get(item[1])
+        if previous and previous[0] and previous[1]:
+            costs[item] = previous[1] * size / previous[0]
+        else:
+            costs[item] = size * rate
+    return costs
+
+
+def plan_chunks(costs: Dict[Item, float], workers: int) -> List[List[Item]]:
+    """Split the modules into chunks, longest first, for list scheduling on `workers` processes.
+
+    Modules costing more than a chunk are sent alone. The smaller ones are
+    packed together up to the chunk size, so the inter-process overhead is
+    paid per chunk instead of per module. Handing out the chunks in
+    decreasing cost to the first free worker keeps the makespan close to
+    total / workers, since only small chunks are left at the end.
+    """
+    total = sum(costs.values())
+    target = max(total / (max(workers, 1) * CHUNKS_PER_WORKER), MIN_CHUNK_SECONDS)
+
+    chunks: List[Tuple[float, List[Item]]] = []
+    current: List[Item] = []
+    current_cost = 0.0
+    for item in sorted(costs, key=lambda item: (-costs[item], item[1])):
+        if costs[item] >= target:
+            chunks.append((costs[item], [item]))
+            continue
+        current.append(item)
+        current_cost += costs[item]
+        if current_cost >= target:
+            chunks.append((current_cost, current))
+            current, current_cost = [], 0.0
+    if current:
+        chunks.append((current_cost, current))
+
+    chunks.sort(key=lambda chunk: -chunk[0])
+    return [items for _, items in chunks]
+
+
+def extract_scheduled(jobs: Dict[Hashable, Tuple[str, List[str]]], config, workers: Optional[int] = 1,
+                      history: Optional[Dict[str, Tuple[int, float]]] = None) -> Dict[Hashable, List[Tuple[str, ModuleFacts]]]:
+    """Summarize the modules of one or several roots, in parallel when it pays off.
+
+    Args:
+        jobs (Dict): root label -> (root path, module paths to summarize).
+        config: The configuration.
+        workers (Optional[int]): The number of worker processes. None for the CPU count.
+        history (Optional[Dict]): module path -> (size, seconds) measured in a previous run.
+
+    Returns:
+        Dict: root label -> (module path, summary) pairs.
+    """
+    workers = workers or os.cpu_count() or 1
+    limits = FileLimits.from_config(config)
+
+    sizes = {}
+    for label, (_, paths) in jobs.items():
+        for path in paths:
+            try:
+                sizes[(label, path)] = os.path.getsize(path)
+            except OSError:
+                sizes[(label, path)] = 0
+    costs = estimate_costs(sizes, history or {})
+    chunks = plan_chunks(costs, workers)
+
+    facts: Dict[Item, ModuleFacts] = {}
+    with progress("parse", total=len(sizes)) as reporter:
+        if workers == 1 or len(chunks) <= 1 or sum(costs.values()) < MIN_PARALLEL_SECONDS:
+            visitor = Visitor(config=config)
+            for label, path in sizes:
+                facts[(label, path)] = extract_module(visitor, path, jobs[label][0], limits)
+                reporter.advance()
+        else:
+            logger.debug(f"Scheduling {len(sizes)} modules in {len(chunks)} chunks on {workers} workers")
+            _run_chunks(chunks, jobs, config, workers, limits, facts, reporter)
+
+    # Back to the discovery order, so the graph does not depend on the schedule
+    results: Dict[Hashable, List[Tuple[str, ModuleFacts]]] = {label: [] for label in jobs}
+    for label, path in sizes:
+        results[label].append((path, facts[(label, path)]))
+    return results
+
+
+def _report_worker(worker_pids) -> None:
+    worker_pids.put(os.getpid())
+
+
+def _run_chunks(chunks: List[List[Item]], jobs: Dict, config, workers: int, limits: FileLimits,
+                facts: Dict[Item, ModuleFacts], reporter) -> None:
+    # Only imported when the analysis is large enough to run in parallel
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    def fail(chunk: List[Item], reason: str) -> None:
+        for item in chunk:
+            facts[item] = ModuleFacts(path=item[1], issue=FileIssue(kind="failed", reason=reason))
+        reporter.advance(len(chunk))
+
+    # Each worker reports its pid, so a timeout stops the workers of this pool only
+    worker_pids = multiprocessing.SimpleQueue()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_report_worker, initargs=(worker_pids,))
+    timed_out = False
+    waiting: set = set()
+    try:
+        # Submitted longest first; the pool hands each chunk to the next free worker
+        futures = {executor.submit(extract_chunk, [(jobs[label][0], path) for label, path in chunk], config): chunk
+                   for chunk in chunks}
+        started: Dict = {}
+        waiting = set(futures)
+        while waiting:
+            done, waiting = wait(waiting, timeout=1.0 if limits.timeout > 0 else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = futures[future]
+                try:
+                    for item, (_, result) in zip(chunk, future.result()):
+                        facts[item] = result
+                    reporter.advance(len(chunk))
+                except Exception as e:
+                    # ex) a worker killed by the system, which breaks the pool
+                    fail(chunk, f"worker failed: {type(e).__name__}: {e}")
+
+            if limits.timeout <= 0:
+                continue
+
+            # A worker stuck in a module the per-file timeout can not interrupt
+            now = time.monotonic()
+            for future in list(waiting):
+                if future.running():
+                    started.setdefault(future, now)
+                budget = limits.timeout * len(futures[future]) + WORKER_GRACE
+                if future in started and now - started[future] > budget:
+                    waiting.discard(future)
+                    timed_out = True
+                    logger.warning(f"Worker timed out on {len(futures[future])} modules")
+                    fail(futures[future], "worker timed out")
+    finally:
+        # The chunks not started yet, left after an error or a timeout
+        for future in waiting:
+            future.cancel()
+        if timed_out:
+            # The stuck workers would block the shutdown
+            pids = set()
+            while not worker_pids.empty():
+                pids.add(worker_pids.get())
+            for process in multiprocessing.active_children():
+                if process.pid in pids:
+                    process.terminate()
+        executor.shutdown(wait=not timed_out)
@@ -0,0 +1,316 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from pyclassanalyzer.config import TomlConfig, merge_config
+from pyclassanalyzer.network.classgraph import ClassGraph, QUERY_TYPES
+from pyclassanalyzer.generators.exporters import node_to_dict, relation_to_dict
+from pyclassanalyzer.generators.plantuml import MEMBER_LEVELS, PlantUMLGenerator
+from pyclassanalyzer.scanner.scanner import GraphScanner
+from pyclassanalyzer.utils.log import logger
+
+JSON = "application/json; charset=utf-8"
+TEXT = "text/plain; charset=utf-8"
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+Response = Tuple[int, str, str]
+
+# Rendered diagrams kept by the server, the least recently requested are dropped
+PLANTUML_CACHE_SIZE = 64
+
+
+class BadRequest(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisServer:
+    """Keep the analyzed class graph warm and answer requests over HTTP.
+
+    The server listens on a Unix socket or on localhost, and the graph is
+    refreshed incrementally in the background, so a request only pays for
+    the query itself.
+
+    Endpoints:
+        - GET  /stats
+        - GET  /plantuml?title=...&class=...&depth=...&members=none|public|summary|all&max_members=...
+        - GET  /subgraph?class=...&depth=...
+        - GET  /query?type=ancestors|descendants|neighbors|incoming|outgoing&class=...
+        - POST /refresh
+    """
+
+    def __init__(self, scanner: GraphScanner, refresh_interval: float = 2.0) -> None:
+        self.scanner = scanner
+        self.refresh_interval = refresh_interval
+
+        self.started_at = time.time()
+        self.last_refresh: Optional[float] = None
+        self.request_count = 0
+
+        # Rendered PlantUML text by graph generation and normalized parameters.
+        # The renders run in executor threads, so the cache has its own lock.
+        self._plantuml_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Incremented whenever the graph changes, after the new graph is in place
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def graph(self) -> ClassGraph:
+        return self.scanner.graph
+
+    async def start(self, socket_path: Optional[str] = None,
+                    host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Analyze the project and start listening.
+
+        Args:
+            socket_path (Optional[str]): The Unix socket to listen on. If given, `host` and `port` are ignored.
+            host (str): The host to listen on.
+            port (int): The port to listen on.
+        """
+        self._lock = asyncio.Lock()
+        await self.refresh()
+
+        if socket_path:
+            return await asyncio.start_unix_server(self._handle, path=socket_path)
+        return await asyncio.start_server(self._handle, host=host, port=port)
+
+    async def serve_forever(self, socket_path: Optional[str] = None,
+                            host: str = "127.0.0.1", port: int = 8765) -> None:
+        server = await self.start(socket_path=socket_path, host=host, port=port)
+
+        async with server:
+            tasks = [asyncio.ensure_future(server.serve_forever())]
+            if self.refresh_interval > 0:
+                tasks.append(asyncio.ensure_future(self._refresh_periodically()))
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def refresh(self) -> List[str]:
+        """Re-analyze the changed modules without blocking the clients.
+
+        Returns:
+            List[str]: The paths of the changed modules.
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            changed = await loop.run_in_executor(None, self.scanner.refresh)
+            if changed:
+                with self._cache_lock:
+                    self._generation += 1
+                    self._plantuml_cache.clear()
+            self.last_refresh = time.time()
+            return changed
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The server keeps answering from the previous graph, the next refresh tries again
+                logger.warning(f"Refresh failed: {type(e).__name__}: {e}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length:
+                    await reader.readexactly(length)
+
+                if method == "POST" and urlsplit(target).path == "/refresh":
+                    changed = await self.refresh()
+                    response = (200, JSON, json.dumps({"changed": changed}))
+                else:
+                    # Rendering a large graph takes a while, the other clients are served meanwhile
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(None, self.dispatch, method, target)
+            except ValueError:
+                response = (400, TEXT, "Malformed request")
+
+            self.request_count += 1
+            status, content_type, body = response
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # The client went away before the answer, there is nobody to answer
+            pass
+        finally:
+            writer.close()
+
+    def dispatch(self, method: str, target: str) -> Response:
+        """Answer a request from the warm graph.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request target including the query string.
+
+        Returns:
+            Response: The status, the content type and the body.
+        """
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        handlers = {
+            "/stats": self._stats,
+            "/plantuml": self._plantuml,
+            "/subgraph": self._subgraph,
+            "/query": self._query,
+        }
+        handler = handlers.get(url.path)
+        if handler is None:
+            return 404, TEXT, f"Unknown path: {url.path}"
+        if method != "GET":
+            return 405, TEXT, f"Method not allowed: {method}"
+
+        try:
+            return handler(params)
+        except BadRequest as e:
+            return e.status, TEXT, str(e)
+        except Exception as e:
+            return 500, TEXT, f"Error: {e}"
+
+    def _stats(self, params: Dict[str, str]) -> Response:
+        graph = self.graph
+        relation_counts: Dict[str, int] = {}
+        for rel in graph.relations:
+            relation_counts[str(rel.type_)] = relation_counts.get(str(rel.type_), 0) + 1
+
+        stats = {
+            "path": self.scanner.path,
+            "modules": len(self.scanner.module_facts),
+            "classes": len(graph.nodes),
+            "relations": len(graph.relations),
+            "relation_types": relation_counts,
+            "requests": self.request_count,
+            "uptime": time.time() - self.started_at,
+            "last_refresh": self.last_refresh,
+        }
+        return 200, JSON, json.dumps(stats)
+
+    def _focus(self, params: Dict[str, str]) -> ClassGraph:
+        """Return the graph, or the neighborhood of `class` within `depth` hops."""
+        name = params.get("class")
+        if not name:
+            return self.graph
+
+        graph = self.graph
+        if name not in graph.nodes:
+            raise BadRequest(404, f"Unknown class: {name}")
+
+        return graph.subgraph(graph.get_neighborhood([name], depth=self._depth(params)))
+
+    def _depth(self, params: Dict[str, str]) -> int:
+        try:
+            return int(params.get("depth", 1))
+        except ValueError:
+            raise BadRequest(400, "depth must be an integer")
+
+    def _plantuml(self, params: Dict[str, str]) -> Response:
+        members = self._members(params)
+        name = params.get("class")
+        title = params.get("title") or f"{name or self.scanner.project_name} Class Diagram"
+        # Read before the graph, so a diagram is never cached under a newer generation than its graph
+        with self._cache_lock:
+            generation = self._generation
+        key = (generation, title, name, self._depth(params) if name else None,
+               members.get("level"), members.get("max"))
+
+        with self._cache_lock:
+            content = self._plantuml_cache.get(key)
+            if content is not None:
+                self._plantuml_cache.move_to_end(key)
+                return 200, TEXT, content
+
+        content = self._generator(members).generate_plantuml(self._focus(params), title)
+        with self._cache_lock:
+            if generation == self._generation:
+                self._plantuml_cache[key] = content
+                while len(self._plantuml_cache) > PLANTUML_CACHE_SIZE:
+                    self._plantuml_cache.popitem(last=False)
+        return 200, TEXT, content
+
+    def _members(self, params: Dict[str, str]) -> Dict[str, object]:
+        """The `[members]` table asked by `members` and `max_members`, empty for the configured one."""
+        members: Dict[str, object] = {}
+        if params.get("members"):
+            if params["members"] not in MEMBER_LEVELS:
+                raise BadRequest(400, f"members must be one of {', '.join(MEMBER_LEVELS)}")
+            members["level"] = params["members"]
+        if params.get("max_members"):
+            try:
+                members["max"] = int(params["max_members"])
+            except ValueError:
+                raise BadRequest(400, "max_members must be an integer")
+        return members
+
+    def _generator(self, members: Dict[str, object]) -> PlantUMLGenerator:
+        """The generator of the scanner, or one drawing the members as given by `_members`."""
+        if not members:
+            return self.scanner.plantuml_generator
+        return PlantUMLGenerator(TomlConfig(merge_config(self.scanner.config.data, {"members": members})))
+
+    def _subgraph(self, params: Dict[str, str]) -> Response:
+        if not params.get("class"):
+            raise BadRequest(400, "class is required")
+
+        graph = self._focus(params)
+        body = {
+            "nodes": [node_to_dict(node) for node in graph.nodes.values()],
+            "relations": [relation_to_dict(rel) for rel in graph.relations],
+        }
+        return 200, JSON, json.dumps(body)
+
+    def _query(self, params: Dict[str, str]) -> Response:
+        type_ = params.get("type")
+        name = params.get("class")
+        if type_ not in QUERY_TYPES:
+            raise BadRequest(400, f"type must be one of {', '.join(QUERY_TYPES)}")
+        if not name:
+            raise BadRequest(400, "class is required")
+        if name not in self.graph.nodes:
+            raise BadRequest(404, f"Unknown class: {name}")
+
+        result = self.graph.query({type_: [name]})[type_][name]
+        if isinstance(result, set):
+            result = sorted(result)
+        else:
+            result = [relation_to_dict(rel) for rel in result]
+        return 200, JSON, json.dumps({"type": type_, "class": name, "result": result})
@@ -0,0 +1,99 @@
+import json
+import pytest
+from io import StringIO
+from xml.dom import minidom
+
+from pyclassanalyzer.generators.exporters import JSONExporter, export, get_exporter
+from pyclassanalyzer.generators.plantuml import PlantUMLExporter, PlantUMLGenerator
+from pyclassanalyzer.generators.summary import SummaryExporter
+from pyclassanalyzer.network.classgraph import (
+    ClassGraph, ClassNode, ClassType, Relation, RelationType,
+)
+
+
+class StubConfig:
+    def __init__(self, classes=None, relationships=None):
+        self.data = {
+            "exclude": {
+                "classes": classes or [],
+                "relationships": relationships or [],
+                "methods": [],
+            },
+        }
+
+    def get(self, key):
+        return self.data[key]
+
+
+@pytest.fixture
+def graph():
+    graph = ClassGraph()
+    graph.add_node(ClassNode(name="Base", attributes={"x"}))
+    graph.add_node(ClassNode(name="Child"))
+    graph.add_node(ClassNode(name="MyError", type_=ClassType.EXCEPTION))
+    graph.add_relation(Relation(source="Child", target="Base", type_=RelationType.INHERITANCE))
+    graph.add_relation(Relation(source="Child", target="MyError", type_=RelationType.DEPENDENCY))
+    return graph
+
+
+def test_export_writes_all_formats_in_one_traversal(graph):
+    streams = {name: StringIO() for name in ("json", "jsonl", "graphml", "dot")}
+    exporters = [get_exporter(name)(stream) for name, stream in streams.items()]
+
+    export(graph, exporters, StubConfig(), title="Test")
+
+    document = json.loads(streams["json"].getvalue())
+    assert document["title"] == "Test"
+    assert {node["name"] for node in document["nodes"]} == {"Base", "Child", "MyError"}
+    assert len(document["relations"]) == 2
+
+    lines = [json.loads(line) for line in streams["jsonl"].getvalue().splitlines()]
+    assert [line["kind"] for line in lines].count("relation") == 2
+
+    dom = minidom.parseString(streams["graphml"].getvalue())
+    assert len(dom.getElementsByTagName("node")) == 3
+    assert len(dom.getElementsByTagName("edge")) == 2
+
+    assert '"Child" -> "Base" [type="inheritance", arrowhead=empty];' in streams["dot"].getvalue()
+
+
+def test_export_respects_exclusions(graph):
+    stream = StringIO()
+
+    export(graph, [JSONExporter(stream)], StubConfig(classes=["exception"], relationships=["inheritance"]))
+
+    document = json.loads(stream.getvalue())
+    assert {node["name"] for node in document["nodes"]} == {"Base", "Child"}
+    assert document["relations"] == []
+
+
+def test_get_exporter_unsupported_format():
+    with pytest.raises(ValueError):
+        get_exporter("svgz")
+
+
+def test_plantuml_summary_and_exporters_share_one_traversal(graph, monkeypatch):
+    calls = []
+    sorted_nodes = ClassGraph.sorted_nodes
+    monkeypatch.setattr(ClassGraph, "sorted_nodes", lambda self: calls.append(1) or sorted_nodes(self))
+    config = StubConfig(classes=["exception"])
+    plantuml, summary, document = StringIO(), StringIO(), StringIO()
+
+    export(graph, [PlantUMLExporter(plantuml, config=config), SummaryExporter(summary), JSONExporter(document)],
+           config, title="Test")
+
+    assert len(calls) == 1
+    assert plantuml.getvalue() == PlantUMLGenerator(config).generate_plantuml(graph, "Test")
+    assert "Child --|> Base" in plantuml.getvalue()
+    assert "MyError" not in plantuml.getvalue()
+    assert summary.getvalue().splitlines()[:3] == ["Analysis completed!", "- Found 2 classes", "- Found 1 relations"]
+    assert "  * inheritance: 1개" in summary.getvalue()
+    assert len(json.loads(document.getvalue())["nodes"]) == 2
+
+
+def test_plantuml_exporter_without_classes():
+    stream = StringIO()
+
+    export(ClassGraph(), [PlantUMLExporter(stream, config=StubConfig())], StubConfig(), title="Empty")
+
+    assert stream.getvalue().endswith("' No classes found\n' No relationships found\n\n@enduml")
@@ -0,0 +1,91 @@
+import json
+import os
+from io import StringIO
+
+import pytest
+
+from pyclassanalyzer.generators.exporters import export
+from pyclassanalyzer.generators.html import HTMLExporter
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, ModuleDef, Relation, RelationType
+
+
+class StubConfig:
+    def __init__(self):
+        self.data = {"exclude": {"classes": [], "relationships": [], "methods": ["magic"]}}
+
+    def get(self, key):
+        return self.data[key]
+
+
+def make_graph(count=5):
+    graph = ClassGraph()
+    for i in range(count):
+        package = "app.core" if i % 2 == 0 else "app.web"
+        graph.add_node(ClassNode(name=f"C{i}", module=ModuleDef(name=f"{package}.mod", package=package)))
+    for i in range(1, count):
+        graph.add_relation(Relation(source=f"C{i}", target=f"C{i - 1}", type_=RelationType.DEPENDENCY))
+    return graph
+
+
+def write_html(graph, path, chunk_size=3):
+    with open(path, "w", encoding="utf-8") as f:
+        export(graph, [HTMLExporter(f, config=StubConfig(), chunk_size=chunk_size)], StubConfig(), title="Test")
+
+
+def read_script(path):
+    content = open(path, encoding="utf-8").read()
+    return json.loads(content[content.index("(") + 1:content.rindex(")")])
+
+
+def load_chunks(files_dir, index):
+    chunks = {}
+    for package_id, package in enumerate(index["packages"]):
+        for part in range(package["parts"]):
+            chunks.setdefault(package["name"], []).append(read_script(files_dir / f"p{package_id}_{part}.js"))
+    return chunks
+
+
+def test_html_writes_page_index_and_package_chunks(tmp_path):
+    path = tmp_path / "graph.html"
+    write_html(make_graph(), path)
+
+    page = path.read_text(encoding="utf-8")
+    assert "<title>Test</title>" in page
+    assert 'var FILES = "graph_files";' in page
+
+    files_dir = tmp_path / "graph_files"
+    index = read_script(files_dir / "index.js")
+    assert {package["name"]: package["classes"] for package in index["packages"]} == {"app.core": 3, "app.web": 2}
+    assert [name for name, _ in index["classes"]] == ["C0", "C1", "C2", "C3", "C4"]
+
+    chunks = load_chunks(files_dir, index)
+    core_nodes = [node["name"] for chunk in chunks["app.core"] for node in chunk["nodes"]]
+    assert core_nodes == ["C0", "C2", "C4"]
+    # Split into parts of at most `chunk_size` items
+    assert len(chunks["app.core"]) > 1
+    assert all(len(chunk["nodes"]) + len(chunk["relations"]) <= 3 for chunk in chunks["app.core"])
+    # A relation between packages is in the chunks of both packages
+    web_relations = [tuple(rel) for chunk in chunks["app.web"] for rel in chunk["relations"]]
+    core_relations = [tuple(rel) for chunk in chunks["app.core"] for rel in chunk["relations"]]
+    assert ("C1", "C0", "dependency") in web_relations
+    assert ("C1", "C0", "dependency") in core_relations
+
+
+def test_html_skips_unchanged_chunks_and_removes_stale_ones(tmp_path):
+    path = tmp_path / "graph.html"
+    write_html(make_graph(8), path)
+    files_dir = tmp_path / "graph_files"
+    before = {name: os.stat(files_dir / name).st_mtime_ns for name in os.listdir(files_dir)}
+
+    write_html(make_graph(8), path)
+    assert {name: os.stat(files_dir / name).st_mtime_ns for name in os.listdir(files_dir)} == before
+
+    write_html(make_graph(2), path)
+    index = read_script(files_dir / "index.js")
+    expected = {f"p{i}_{part}.js" for i, package in enumerate(index["packages"]) for part in range(package["parts"])}
+    assert {name for name in os.listdir(files_dir) if name.endswith(".js")} == expected | {"index.js"}
+
+
+def test_html_needs_a_file_path():
+    with pytest.raises(ValueError):
+        HTMLExporter(StringIO())
@@ -0,0 +1,75 @@
+import os
+
+from pyclassanalyzer.generators.manifest import MANIFEST_NAME, OutputManifest, write_if_changed
+from pyclassanalyzer.generators.plantuml import PlantUMLGenerator
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, Relation, RelationType
+
+
+class StubConfig:
+    def __init__(self):
+        self.data = {"exclude": {"classes": [], "relationships": [], "methods": []}}
+
+    def get(self, key):
+        return self.data[key]
+
+
+def build_graph(names, relations):
+    graph = ClassGraph()
+    for name in names:
+        graph.add_node(ClassNode(name=name, attributes={"z", "a", "m"}))
+    for source, target in relations:
+        graph.add_relation(Relation(source=source, target=target, type_=RelationType.DEPENDENCY))
+    return graph
+
+
+def test_generate_plantuml_does_not_depend_on_insertion_order():
+    generator = PlantUMLGenerator(config=StubConfig())
+    first = build_graph(["A", "B", "C"], [("A", "B"), ("B", "C"), ("A", "C")])
+    second = build_graph(["C", "A", "B"], [("A", "C"), ("B", "C"), ("A", "B")])
+
+    content = generator.generate_plantuml(first)
+
+    assert content == generator.generate_plantuml(second)
+    assert content.index("A ..> B") < content.index("A ..> C") < content.index("B ..> C")
+    assert "  +a\n  +m\n  +z" in content
+
+
+def test_write_if_changed_skips_unchanged_content(tmp_path):
+    path = str(tmp_path / "a.puml")
+
+    assert write_if_changed(path, "@startuml\n@enduml")
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_if_changed(path, "@startuml\n@enduml")
+
+    assert os.stat(path).st_mtime_ns == mtime
+    assert "a.puml" in OutputManifest.load(str(tmp_path)).files
+    assert os.path.exists(tmp_path / MANIFEST_NAME)
+
+
+def test_write_if_changed_rewrites_changed_or_modified_files(tmp_path):
+    path = str(tmp_path / "a.puml")
+    write_if_changed(path, "first")
+
+    assert write_if_changed(path, "second")
+
+    # Edited by hand since the last write
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("edited")
+    assert write_if_changed(path, "second")
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == "second"
+
+
+def test_replace_keeps_unchanged_files_and_removes_the_temporary_file(tmp_path):
+    path = str(tmp_path / "a.json")
+    temp_path = str(tmp_path / "a.json.tmp")
+    manifest = OutputManifest()
+    for content, replaced in (("{}", True), ("{}", False), ("[]", True)):
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        assert manifest.replace(path, temp_path) == replaced
+
+        assert not os.path.exists(temp_path)
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == content
@@ -0,0 +1,61 @@
+import pytest
+
+from pyclassanalyzer.config import TomlConfig
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, FunctionDef, Relation, RelationType
+from pyclassanalyzer.generators.plantuml import PlantUMLGenerator, format_members, member_detail
+
+
+@pytest.fixture
+def node():
+    return ClassNode(
+        name="Service",
+        attributes={"name", "_cache", "__secret"},
+        functions=[FunctionDef(name="__init__", fields=["name"]), FunctionDef(name="run"),
+                   FunctionDef(name="_load"), FunctionDef(name="stop")],
+    )
+
+
+def test_all_members_by_default(node):
+    assert format_members(node, exclude_magic=True) == (
+        ["-__secret", "#_cache", "+name"], ["+run()", "#_load()", "+stop()"])
+
+
+def test_public_members(node):
+    assert format_members(node, exclude_magic=True, level="public") == (["+name"], ["+run()", "+stop()"])
+
+
+def test_summary_and_none(node):
+    assert format_members(node, exclude_magic=True, level="summary") == (["3 attributes"], ["3 methods"])
+    assert format_members(node, level="none") == ([], [])
+
+
+def test_limit_keeps_the_first_members(node):
+    assert format_members(node, exclude_magic=True, limit=4) == (
+        ["-__secret", "#_cache", "+name"], ["+run()", "… 2 more"])
+    assert format_members(node, exclude_magic=True, limit=2) == (["-__secret", "#_cache", "… 4 more"], [])
+    assert format_members(node, exclude_magic=True, level="public", limit=2) == (["+name"], ["+run()", "… 1 more"])
+
+
+def test_member_detail_reads_the_config():
+    assert member_detail(TomlConfig({})) == ("all", None)
+    assert member_detail(TomlConfig({"members": {"level": "public", "max": 20}})) == ("public", 20)
+    with pytest.raises(ValueError):
+        member_detail(TomlConfig({"members": {"level": "private"}}))
+
+
+def test_plantuml_keeps_the_relations(node):
+    graph = ClassGraph()
+    graph.add_node(node)
+    graph.add_node(ClassNode(name="Base", attributes={"id"}))
+    graph.add_relation(Relation(source="Service", target="Base", type_=RelationType.INHERITANCE))
+
+    content = PlantUMLGenerator(TomlConfig({"members": {"level": "none"}})).generate_plantuml(graph)
+
+    assert "class Service {\n}" in content
+    assert "class Base {\n}" in content
+    assert "Service --|> Base" in content
+
+
+def test_plantuml_checks_the_member_config_on_creation():
+    with pytest.raises(ValueError):
+        PlantUMLGenerator(TomlConfig({"members": {"level": "private"}}))
@@ -0,0 +1,14 @@
+import re
+
+from pyclassanalyzer.generators.plantuml import package_alias
+
+
+def test_package_alias_is_a_plantuml_identifier():
+    assert package_alias("app.models") == "pkg_app_0models"
+    assert re.fullmatch(r"\w+", package_alias("app-v2.models"))
+
+
+def test_package_alias_keeps_distinct_packages_apart():
+    packages = ["a.b", "a_b", "a-b", "a__b", "a._b", "a_.b", "a.0b", "a_0b", "a+b"]
+
+    assert len({package_alias(package) for package in packages}) == len(packages)
@@ -0,0 +1,105 @@
+import pytest
+from io import StringIO
+from xml.dom import minidom
+
+from pyclassanalyzer.generators.layout import LayeredLayout, count_crossings
+from pyclassanalyzer.generators.svg import SVGExporter
+from pyclassanalyzer.network.classgraph import (
+    ClassNode, ClassType, FunctionDef, Relation, RelationType,
+)
+
+
+class StubConfig:
+    def get(self, key):
+        return {"methods": ["magic"], "classes": [], "relationships": []}
+
+
+def inherit(child, parent):
+    return Relation(source=child, target=parent, type_=RelationType.INHERITANCE)
+
+
+def test_layout_places_parents_above_children():
+    sizes = {name: (100, 50) for name in ("Child", "Base", "GrandChild")}
+    relations = [inherit("Child", "Base"), inherit("GrandChild", "Child")]
+
+    layout = LayeredLayout().layout(sizes, relations)
+
+    assert layout.boxes["Base"][1] < layout.boxes["Child"][1] < layout.boxes["GrandChild"][1]
+
+
+def test_layout_handles_inheritance_cycle():
+    sizes = {"A": (100, 50), "B": (100, 50)}
+
+    layout = LayeredLayout().layout(sizes, [inherit("A", "B"), inherit("B", "A")])
+
+    assert set(layout.boxes) == {"A", "B"}
+    assert len(layout.edges) == 2
+
+
+def test_layout_removes_avoidable_crossings():
+    # Two independent hierarchies given in an interleaved order
+    sizes = {name: (100, 50) for name in ("P1", "P2", "C2", "C1")}
+    relations = [inherit("C1", "P1"), inherit("C2", "P2")]
+
+    layout = LayeredLayout().layout(sizes, relations)
+
+    assert layout.crossings == 0
+
+
+def test_count_crossings():
+    # 0 -> 3 and 1 -> 2 cross once
+    layers = [[0, 1], [2, 3]]
+    down = [[3], [2], [], []]
+    position = [0, 1, 0, 1]
+
+    assert count_crossings(layers, down, position) == 1
+
+
+def test_svg_exporter_renders_class_boxes():
+    stream = StringIO()
+    exporter = SVGExporter(stream, config=StubConfig())
+
+    exporter.begin("Test")
+    exporter.write_node(ClassNode(
+        name="Shape", type_=ClassType.ABSTRACT,
+        functions=[FunctionDef(name="__init__"), FunctionDef(name="area")],
+    ))
+    exporter.write_node(ClassNode(name="Square", attributes={"_size"}))
+    exporter.write_relation(inherit("Square", "Shape"))
+    exporter.end()
+
+    svg = stream.getvalue()
+    dom = minidom.parseString(svg)
+    assert len(dom.getElementsByTagName("polyline")) == 1
+    assert "+area()" in svg
+    assert "#_size" in svg
+    assert "__init__" not in svg
+    assert 'class="class abstract"' in svg
+
+
+def compose(owner, part):
+    return Relation(source=owner, target=part, type_=RelationType.COMPOSITION)
+
+
+def test_layout_ranks_graphs_without_inheritance():
+    sizes = {name: (100, 50) for name in ("App", "Service", "Repository")}
+    relations = [compose("App", "Service"), compose("Service", "Repository")]
+
+    layout = LayeredLayout().layout(sizes, relations)
+
+    assert layout.boxes["App"][1] < layout.boxes["Service"][1] < layout.boxes["Repository"][1]
+
+
+def test_layout_routes_same_layer_edges_around_the_boxes():
+    class FlatLayout(LayeredLayout):
+        def _rank(self, names, relations):
+            return names, {name: 0 for name in names}
+
+    sizes = {name: (100, 50) for name in ("A", "B", "C")}
+    layout = FlatLayout().layout(sizes, [compose("A", "C")])
+
+    [(_, points)] = layout.edges
+    top = min(y for _, y, _, _ in layout.boxes.values())
+    assert points[0][1] == points[-1][1] == top
+    # The horizontal segment runs above the row, over B
+    assert points[1][1] == points[2][1] < top
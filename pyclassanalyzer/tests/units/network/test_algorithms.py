@@ -0,0 +1,46 @@
+from pyclassanalyzer.network.algorithms import (
+    strongly_connected_components, transitive_reduction,
+)
+from pyclassanalyzer.network.classgraph import (
+    ClassGraph, ClassNode, Relation, RelationType,
+)
+
+
+def test_strongly_connected_components_sinks_first():
+    successors = {"A": ["B"], "B": ["C"], "C": ["B", "D"], "D": []}
+
+    components = strongly_connected_components(["A", "B", "C", "D"], successors)
+
+    assert [sorted(c) for c in components] == [["D"], ["B", "C"], ["A"]]
+
+
+def test_transitive_reduction_removes_implied_edges():
+    edges = [("A", "B"), ("B", "C"), ("A", "C"), ("C", "D"), ("A", "D")]
+
+    assert transitive_reduction(edges) == {("A", "C"), ("A", "D")}
+
+
+def test_transitive_reduction_keeps_cycle_edges():
+    # B and C form a cycle, A -> C is implied by A -> B -> C
+    edges = [("A", "B"), ("B", "C"), ("C", "B"), ("A", "C")]
+
+    assert transitive_reduction(edges) == {("A", "C")}
+
+
+def test_classgraph_transitive_reduction_per_relation_type():
+    graph = ClassGraph()
+    for name in ("A", "B", "C"):
+        graph.add_node(ClassNode(name=name))
+
+    dependency = RelationType.DEPENDENCY
+    graph.add_relation(Relation(source="A", target="B", type_=dependency))
+    graph.add_relation(Relation(source="B", target="C", type_=dependency))
+    graph.add_relation(Relation(source="A", target="C", type_=dependency))
+    # Not implied: the path A -> B -> C is made of dependencies only
+    graph.add_relation(Relation(source="A", target="C", type_=RelationType.COMPOSITION))
+
+    removed = graph.transitive_reduction()
+
+    assert removed == {dependency: 1}
+    assert Relation(source="A", target="C", type_=dependency) not in graph.relations
+    assert Relation(source="A", target="C", type_=RelationType.COMPOSITION) in graph.relations
@@ -0,0 +1,51 @@
+import pytest
+
+from pyclassanalyzer.network.classgraph import (
+    ClassGraph, ClassNode, ModuleDef, Relation, RelationType,
+)
+from pyclassanalyzer.network.collapse import classes_in_package, collapse_to_packages
+
+
+def make_node(name, package):
+    return ClassNode(name=name, module=ModuleDef(name=f"{package}.mod", package=package))
+
+
+@pytest.fixture
+def graph():
+    graph = ClassGraph()
+    graph.add_node(make_node("A", "app.core"))
+    graph.add_node(make_node("B", "app.core.inner"))
+    graph.add_node(make_node("C", "app.web"))
+    graph.add_relation(Relation(source="C", target="A", type_=RelationType.DEPENDENCY))
+    graph.add_relation(Relation(source="C", target="B", type_=RelationType.DEPENDENCY))
+    graph.add_relation(Relation(source="C", target="B", type_=RelationType.COMPOSITION))
+    graph.add_relation(Relation(source="B", target="A", type_=RelationType.INHERITANCE))
+    return graph
+
+
+def test_collapse_to_packages(graph):
+    collapsed = collapse_to_packages(graph)
+
+    assert collapsed.packages == {"app.core": 1, "app.core.inner": 1, "app.web": 1}
+    assert collapsed.edges[("app.web", "app.core.inner")] == {
+        RelationType.DEPENDENCY: 1,
+        RelationType.COMPOSITION: 1,
+    }
+    assert collapsed.weight("app.web", "app.core") == 1
+
+
+def test_collapse_to_packages_with_depth(graph):
+    collapsed = collapse_to_packages(graph, depth=2)
+
+    assert collapsed.packages == {"app.core": 2, "app.web": 1}
+    assert collapsed.edges[("app.web", "app.core")] == {
+        RelationType.DEPENDENCY: 2,
+        RelationType.COMPOSITION: 1,
+    }
+    # relations inside a package are folded into a self edge
+    assert collapsed.edges[("app.core", "app.core")] == {RelationType.INHERITANCE: 1}
+
+
+def test_classes_in_package(graph):
+    assert classes_in_package(graph, "app.core") == {"A", "B"}
+    assert classes_in_package(graph, "app.co") == set()
@@ -0,0 +1,88 @@
+import pytest
+
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, FunctionDef, ModuleDef, Relation, RelationType
+from pyclassanalyzer.network.index import SymbolIndex, write_index
+
+
+def make_node(name, module, line):
+    return ClassNode(name=name, module=ModuleDef(name=module), file=f"src/{module.replace('.', '/')}.py", line=line)
+
+
+@pytest.fixture
+def index(tmp_path):
+    graph = ClassGraph()
+    base = make_node("Base", "core.base", 3)
+    base.attributes = {"name"}
+    base.functions = [FunctionDef(name="run")]
+    for node in [base, make_node("Model", "core.model", 10), make_node("User", "app.user", 5),
+                 make_node("Admin", "app.admin", 7), make_node("Service", "app.service", 12),
+                 make_node("Model", "app.model", 1).model_copy(update={"name": "app.Model"})]:
+        graph.add_node(node)
+    for source, target, type_ in [("Model", "Base", RelationType.INHERITANCE),
+                                  ("User", "Model", RelationType.INHERITANCE),
+                                  ("Admin", "User", RelationType.INHERITANCE),
+                                  ("Service", "User", RelationType.DEPENDENCY),
+                                  ("Admin", "Service", RelationType.COMPOSITION)]:
+        graph.add_relation(Relation(source=source, target=target, type_=type_))
+
+    path = write_index(graph, str(tmp_path / "outputs" / "index.db"))
+    with SymbolIndex(path) as symbols:
+        yield symbols
+
+
+def names(classes):
+    return [class_.name for class_ in classes]
+
+
+def test_where_returns_the_definition(index, tmp_path):
+    [base] = index.where("Base")
+
+    assert base.qualname == "core.base.Base"
+    assert base.location().endswith("src/core/base.py:3")
+    assert base.members == {"attributes": ["name"], "methods": ["run"]}
+    assert index.where("User")[0].bases == ["Model"]
+
+
+def test_where_accepts_qualified_and_short_names(index):
+    assert names(index.where("app.model.Model")) == ["app.Model"]
+    # A short name defined in several modules matches all of them
+    assert names(index.where("Model")) == ["Model"]
+    assert names(index.where("core.model.Model")) == ["Model"]
+    assert index.where("Missing") == []
+
+
+def test_subclasses(index):
+    assert names(index.subclasses("Model")) == ["User"]
+    # Sorted by qualified name
+    assert names(index.subclasses("Base", transitive=True)) == ["Admin", "User", "Model"]
+
+
+def test_dependents(index):
+    assert names(index.dependents("User")) == ["Admin", "Service"]
+    assert names(index.dependents("User", types=["dependency"])) == ["Service"]
+    assert names(index.dependents("Service", transitive=True)) == ["Admin"]
+    assert names(index.dependents("Model", types=["inheritance"], transitive=True)) == ["Admin", "User"]
+
+
+def test_find(index):
+    assert names(index.find("*Model")) == ["app.Model", "Model"]
+    assert names(index.find("app.*")) == ["Admin", "app.Model", "Service", "User"]
+    assert names(index.find("erv")) == ["Service"]
+
+
+def test_write_index_replaces_the_previous_index(index, tmp_path):
+    path = str(tmp_path / "outputs" / "index.db")
+    write_index(ClassGraph(), path)
+
+    with SymbolIndex(path) as symbols:
+        assert symbols.find("*") == []
+
+
+def test_missing_or_foreign_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SymbolIndex(str(tmp_path / "missing.db"))
+
+    foreign = tmp_path / "foreign.db"
+    foreign.write_text("not a database")
+    with pytest.raises(ValueError):
+        SymbolIndex(str(foreign))
@@ -0,0 +1,133 @@
+import sys
+
+import pytest
+
+from pyclassanalyzer.network import matrix
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, Relation, RelationType
+from pyclassanalyzer.network.matrix import build_csr, pagerank, rank_classes, top_classes
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(matrix, "_np", None)
+    return request.param
+
+
+def test_missing_numpy_falls_back_without_touching_sys_modules(monkeypatch):
+    monkeypatch.setattr(matrix, "_np", matrix._UNRESOLVED)
+    monkeypatch.setitem(sys.modules, "numpy", None)  # makes `import numpy` raise ImportError
+
+    assert matrix._numpy() is None
+    assert matrix._np is None
+    assert sys.modules["numpy"] is None
+
+
+@pytest.fixture
+def graph():
+    # A -> B -> C, D -> C, C -> C
+    graph = ClassGraph()
+    for name in "ABCD":
+        graph.add_node(ClassNode(name=name))
+    graph.add_relation(Relation(source="A", target="B", type_=RelationType.DEPENDENCY))
+    graph.add_relation(Relation(source="B", target="C", type_=RelationType.INHERITANCE))
+    graph.add_relation(Relation(source="D", target="C", type_=RelationType.COMPOSITION))
+    graph.add_relation(Relation(source="C", target="C", type_=RelationType.DEPENDENCY))
+    return graph
+
+
+def test_build_csr(backend, graph):
+    adjacency = build_csr(graph)
+
+    assert adjacency.names == ["A", "B", "C", "D"]
+    assert list(adjacency.indptr) == [0, 1, 2, 2, 3]
+    assert list(adjacency.indices) == [1, 2, 2]
+    assert list(adjacency.in_degree()) == [0, 1, 2, 0]
+
+
+def test_build_csr_with_types(backend, graph):
+    adjacency = build_csr(graph, types=[RelationType.INHERITANCE])
+
+    assert list(adjacency.indices) == [2]
+
+
+def test_pagerank(backend, graph):
+    scores = pagerank(build_csr(graph))
+
+    assert sum(scores) == pytest.approx(1.0)
+    assert scores[2] > scores[1] > scores[0]
+    assert scores[0] == pytest.approx(scores[3])
+
+
+@pytest.mark.parametrize("metric, expected", [
+    ("pagerank", ["C", "B", "A", "D"]),
+    ("in-degree", ["C", "B", "A", "D"]),
+    ("out-degree", ["A", "B", "D", "C"]),
+    ("betweenness", ["B", "A", "C", "D"]),
+])
+def test_rank_classes(backend, graph, metric, expected):
+    assert rank_classes(graph, metric) == expected
+
+
+def test_rank_classes_unknown_metric(graph):
+    with pytest.raises(ValueError):
+        rank_classes(graph, "closeness")
+
+
+def test_top_classes(backend, graph):
+    top = top_classes(graph, 2)
+
+    assert list(top.nodes) == ["B", "C"]
+    assert sorted((rel.source, rel.target) for rel in top.relations) == [("B", "C"), ("C", "C")]
+    assert top_classes(graph, 10) is graph
+
+
+@pytest.fixture
+def cyclic_graph():
+    # A -> B <-> C -> E, D -> A
+    graph = ClassGraph()
+    for name in "ABCDE":
+        graph.add_node(ClassNode(name=name))
+    for source, target in ["AB", "BC", "CB", "CE", "DA"]:
+        graph.add_relation(Relation(source=source, target=target, type_=RelationType.DEPENDENCY))
+    return graph
+
+
+def test_adjacency_is_cached_until_the_graph_changes(cyclic_graph):
+    adjacency = cyclic_graph.adjacency()
+    assert cyclic_graph.adjacency() is adjacency
+
+    cyclic_graph.add_relation(Relation(source="E", target="D", type_=RelationType.INHERITANCE))
+    assert cyclic_graph.adjacency() is not adjacency
+    assert cyclic_graph.adjacency(RelationType.INHERITANCE).nnz == 1
+    assert cyclic_graph.class_index == {"A": 0, "B": 1, "C": 2, "D": 3, "E": 4}
+
+
+def test_reachability_counts(backend, cyclic_graph):
+    assert cyclic_graph.reachability_counts() == {
+        name: len(cyclic_graph.get_descendants(name)) for name in cyclic_graph.nodes
+    }
+    assert cyclic_graph.reachability_counts(reverse=True) == {
+        name: len(cyclic_graph.get_ancestors(name)) for name in cyclic_graph.nodes
+    }
+
+
+def test_reachability_counts_in_blocks(backend, cyclic_graph):
+    adjacency = cyclic_graph.adjacency()
+
+    assert matrix.reachability_counts(adjacency, block=2) == matrix.reachability_counts(adjacency)
+
+
+@pytest.mark.parametrize("direction, expected", [
+    ("out", {"A": {"A", "B", "C"}, "E": {"E"}}),
+    ("in", {"A": {"A", "D"}, "E": {"E", "C", "B"}}),
+    ("both", {"A": {"A", "B", "C", "D"}, "E": {"E", "C", "B"}}),
+])
+def test_k_hop_neighborhoods(backend, cyclic_graph, direction, expected):
+    assert cyclic_graph.k_hop_neighborhoods(["A", "E", "X"], k=2, direction=direction) == expected
+
+
+def test_degree_vectors(backend, cyclic_graph):
+    assert cyclic_graph.degree_vectors() == ([1, 2, 1, 0, 1], [1, 1, 2, 1, 0])
@@ -0,0 +1,117 @@
+import pytest
+
+from pyclassanalyzer.network.classgraph import (
+    ClassGraph, ClassNode, MergeConflict, ModuleDef, Relation, RelationType, union,
+)
+
+
+def make_node(name, module):
+    return ClassNode(name=name, module=ModuleDef(name=module, package=module.rpartition(".")[0]))
+
+
+def make_graph(classes, relations):
+    graph = ClassGraph()
+    for name, module in classes:
+        graph.add_node(make_node(name, module))
+    for source, target in relations:
+        graph.defer_relation(Relation(source=source, target=target, type_=RelationType.INHERITANCE))
+    return graph
+
+
+def edges(graph):
+    return {(rel.source, rel.target) for rel in graph.relations}
+
+
+@pytest.fixture
+def core():
+    return make_graph([("Base", "core.base"), ("Config", "core.config")], [("Config", "Base")])
+
+
+@pytest.fixture
+def service():
+    # App and Config of the service inherit from classes of the core shard
+    return make_graph([("App", "svc.app"), ("Config", "svc.config")],
+                      [("App", "Base"), ("Config", "Base")])
+
+
+def test_defer_relation_keeps_unresolved_relations(service):
+    assert edges(service) == set()
+    assert {(rel.source, rel.target) for rel in service.unresolved} == {("App", "Base"), ("Config", "Base")}
+
+
+def test_merge_resolves_relations_across_shards(core, service):
+    core.merge(service)
+
+    assert set(core.nodes) == {"Base", "Config", "App"}
+    assert edges(core) == {("Config", "Base"), ("App", "Base")}
+    assert core.unresolved == set()
+
+
+def test_merge_resolves_relations_of_the_receiving_graph(core, service):
+    service.merge(core)
+
+    assert ("App", "Base") in edges(service)
+    assert service.unresolved == set()
+
+
+def test_merge_keep_first(core, service):
+    renamed = core.merge(service, on_conflict="keep_first")
+
+    assert renamed == {}
+    assert core.nodes["Config"].module.name == "core.config"
+
+
+def test_merge_qualify(core, service):
+    renamed = core.merge(service, on_conflict="qualify", label="svc")
+
+    assert renamed == {"Config": "svc.Config"}
+    assert core.nodes["svc.Config"].module.name == "svc.config"
+    assert core.nodes["Config"].module.name == "core.config"
+    assert edges(core) == {("Config", "Base"), ("App", "Base"), ("svc.Config", "Base")}
+
+
+def test_merge_qualify_with_module_name(core, service):
+    assert core.merge(service, on_conflict="qualify") == {"Config": "svc.config.Config"}
+
+
+def test_merge_error_leaves_the_graph_unchanged(core, service):
+    version = core.version
+
+    with pytest.raises(MergeConflict) as error:
+        core.merge(service, on_conflict="error")
+
+    assert error.value.names == ["Config"]
+    assert core.version == version
+    assert set(core.nodes) == {"Base", "Config"}
+
+
+def test_merge_same_class_is_not_a_conflict(core):
+    shard = make_graph([("Config", "core.config")], [])
+
+    assert core.merge(shard, on_conflict="error") == {}
+
+
+def test_merge_unsupported_policy(core, service):
+    with pytest.raises(ValueError):
+        core.merge(service, on_conflict="replace")
+
+
+def test_merge_invalidates_cached_views(core, service):
+    assert core.is_subclass("Config", "Base")
+    assert not core.is_subclass("App", "Base")
+
+    core.merge(service)
+
+    assert core.is_subclass("App", "Base")
+
+
+def test_union_does_not_modify_the_shards(core, service):
+    leaf = make_graph([("Leaf", "svc.leaf")], [("Leaf", "App")])
+
+    graph = union([leaf, service, core], on_conflict="qualify", labels=["leaf", "svc", "core"])
+
+    assert set(graph.nodes) == {"Base", "Config", "App", "svc.Config", "Leaf"}
+    assert ("Leaf", "App") in edges(graph)
+    assert set(service.nodes) == {"App", "Config"}
+    assert edges(leaf) == set()
+    assert union([]).nodes == {}
@@ -0,0 +1,79 @@
+import pytest
+
+from pyclassanalyzer.network.classgraph import (
+    ClassGraph, ClassNode, FunctionDef, ModuleDef, Relation, RelationType,
+)
+from pyclassanalyzer.network.metrics import compute_metrics, inheritance_depths, lcom
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr("pyclassanalyzer.network.matrix._np", None)
+    return request.param
+
+
+def make_node(name, package, functions=()):
+    return ClassNode(
+        name=name,
+        module=ModuleDef(name=f"{package}.mod", package=package),
+        functions=[FunctionDef(name=func, uses=uses) for func, uses in functions],
+    )
+
+
+@pytest.fixture
+def graph():
+    graph = ClassGraph()
+    graph.add_node(make_node("Base", "app.core"))
+    graph.add_node(make_node("Child", "app.core"))
+    graph.add_node(make_node("GrandChild", "app.web"))
+    graph.add_node(make_node("View", "app.web"))
+    graph.add_relation(Relation(source="Child", target="Base", type_=RelationType.INHERITANCE))
+    graph.add_relation(Relation(source="GrandChild", target="Child", type_=RelationType.INHERITANCE))
+    graph.add_relation(Relation(source="View", target="Base", type_=RelationType.DEPENDENCY))
+    graph.add_relation(Relation(source="View", target="Base", type_=RelationType.COMPOSITION))
+    graph.add_relation(Relation(source="View", target="Child", type_=RelationType.DEPENDENCY))
+    return graph
+
+
+def test_class_metrics(backend, graph):
+    rows = {row.name: row for row in compute_metrics(graph).classes}
+
+    assert (rows["Base"].fan_in, rows["Base"].fan_out, rows["Base"].dit, rows["Base"].noc) == (2, 0, 0, 1)
+    assert (rows["Child"].fan_in, rows["Child"].fan_out, rows["Child"].dit) == (2, 1, 1)
+    assert rows["GrandChild"].dit == 2
+    assert rows["View"].fan_out == 2
+
+
+def test_package_metrics(backend, graph):
+    rows = {row.name: row for row in compute_metrics(graph).packages}
+
+    # GrandChild and View depend on app.core
+    assert (rows["app.core"].ca, rows["app.core"].ce, rows["app.core"].instability) == (2, 0, 0.0)
+    assert (rows["app.web"].ca, rows["app.web"].ce, rows["app.web"].instability) == (0, 2, 1.0)
+    assert rows["app.web"].classes == 2
+
+
+def test_metrics_are_sorted_and_focused(graph):
+    result = compute_metrics(graph)
+
+    assert [row.name for row in result.classes] == ["Base", "Child", "GrandChild", "View"]
+    assert [row.name for row in result.focus("app.web").classes] == ["GrandChild", "View"]
+    assert [row.name for row in compute_metrics(graph, depth=1).packages] == ["app"]
+
+
+def test_inheritance_depths_ignores_cycles():
+    # 0 -> 1 -> 2 -> 0, 3 -> 2
+    assert inheritance_depths([[1], [2], [0], [2]]) == [2, 1, 0, 1]
+
+
+@pytest.mark.parametrize("functions, expected", [
+    ([], 0),
+    ([("__init__", ["a", "b"]), ("get_a", ["a"]), ("get_b", ["b"])], 2),
+    ([("get_a", ["a"]), ("get_b", ["b"]), ("both", ["get_a", "get_b"])], 1),
+    ([("get_a", ["a"]), ("also_a", ["a"]), ("noop", [])], 2),
+])
+def test_lcom(functions, expected):
+    assert lcom(make_node("A", "app", functions)) == expected
@@ -0,0 +1,92 @@
+import pytest
+
+from pyclassanalyzer.network.classgraph import ClassGraph, ClassNode, Relation, RelationType
+from pyclassanalyzer.network.reachability import ReachabilityIndex
+
+
+@pytest.fixture
+def graph():
+    # Animal <- Dog <- Puppy, Cat <-> Lion (cycle), Dog ..> Bone
+    graph = ClassGraph()
+    for name in ["Animal", "Dog", "Puppy", "Cat", "Lion", "Bone"]:
+        graph.add_node(ClassNode(name=name))
+    for source, target, type_ in [
+        ("Dog", "Animal", RelationType.INHERITANCE),
+        ("Puppy", "Dog", RelationType.INHERITANCE),
+        ("Cat", "Lion", RelationType.INHERITANCE),
+        ("Lion", "Cat", RelationType.INHERITANCE),
+        ("Dog", "Bone", RelationType.DEPENDENCY),
+    ]:
+        graph.add_relation(Relation(source=source, target=target, type_=type_))
+    return graph
+
+
+def test_descendants_match_traversal(graph):
+    index = ReachabilityIndex(graph.adjacency())
+
+    for name in graph.nodes:
+        assert index.descendants(name) == graph.get_descendants(name)
+        assert index.count(name) == len(graph.get_descendants(name))
+    assert index.descendants("Unknown") == set()
+
+
+def test_ancestors_match_traversal(graph):
+    index = graph.reachability(reverse=True)
+
+    for name in graph.nodes:
+        assert index.descendants(name) == graph.get_ancestors(name)
+
+
+def test_is_subclass(graph):
+    assert graph.is_subclass("Puppy", "Animal")
+    assert not graph.is_subclass("Animal", "Puppy")
+    assert not graph.is_subclass("Dog", "Dog")
+    assert graph.is_subclass("Cat", "Cat")
+    assert not graph.is_subclass("Puppy", "Bone")
+    assert not graph.is_subclass("Puppy", "Unknown")
+
+
+def test_index_is_rebuilt_only_after_a_change(graph):
+    index = graph.reachability()
+    assert graph.reachability() is index
+
+    graph.add_node(ClassNode(name="Wolf"))
+    graph.add_relation(Relation(source="Animal", target="Wolf", type_=RelationType.INHERITANCE))
+
+    assert graph.reachability() is not index
+    assert graph.is_subclass("Puppy", "Wolf")
+
+
+def test_query_matches_per_class_methods(graph):
+    names = list(graph.nodes) + ["Unknown"]
+    results = graph.query({
+        "ancestors": names,
+        "descendants": names,
+        "neighbors": names,
+        "incoming": names,
+        "outgoing": names,
+    })
+
+    for name in names:
+        assert results["ancestors"][name] == graph.get_ancestors(name)
+        assert results["descendants"][name] == graph.get_descendants(name)
+        assert results["neighbors"][name] == graph.get_neighbors(name)
+        assert set(results["incoming"][name]) == set(graph.get_incoming_rels(name))
+        assert set(results["outgoing"][name]) == set(graph.get_outgoing_rels(name))
+
+
+def test_self_relation_makes_a_class_its_own_descendant(graph):
+    graph.add_relation(Relation(source="Bone", target="Bone", type_=RelationType.DEPENDENCY))
+    results = graph.query({"descendants": ["Bone", "Dog"], "ancestors": ["Bone", "Puppy"]})
+
+    assert results["descendants"]["Bone"] == graph.get_descendants("Bone") == {"Bone"}
+    assert results["descendants"]["Dog"] == graph.get_descendants("Dog") == {"Animal", "Bone"}
+    assert results["ancestors"]["Bone"] == graph.get_ancestors("Bone") == {"Bone", "Dog", "Puppy"}
+    assert results["ancestors"]["Puppy"] == graph.get_ancestors("Puppy") == set()
+    assert graph.reachability_counts()["Bone"] == 1
+    assert not graph.is_subclass("Bone", "Bone")
+
+
+def test_query_rejects_unknown_types(graph):
+    with pytest.raises(ValueError):
+        graph.query({"siblings": ["Dog"]})
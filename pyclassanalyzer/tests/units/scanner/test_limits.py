@@ -0,0 +1,96 @@
+import signal
+import time
+
+import pytest
+
+from pyclassanalyzer.scanner.limits import FileLimits, FileTimeout, time_limit
+from pyclassanalyzer.scanner.scanner import GraphScanner
+
+
+class StubConfig:
+    def __init__(self, limits=None):
+        self.data = {
+            "exclude": {
+                "directories": [],
+                "types": [],
+                "methods": [],
+                "relationships": [],
+                "classes": [],
+            },
+            "exception": {"name": "*Exception"},
+        }
+        if limits is not None:
+            self.data["limits"] = limits
+
+    def get(self, key):
+        return self.data[key]
+
+
+@pytest.fixture
+def project(tmp_path):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "good.py").write_text("class Good:\n    pass\n")
+    (package / "broken.py").write_text("class Broken(:\n")
+    (package / "latin.py").write_bytes(b"# \xe9\nclass Latin:\n    pass\n")
+    (package / "big_pb2.py").write_text("class Message:\n    pass\n" + "# padding\n" * 100)
+    return package
+
+
+def test_limits_from_config_keeps_defaults():
+    limits = FileLimits.from_config(StubConfig(limits={"skip": ["*_pb2.py"], "unknown": 1}))
+
+    assert limits.skip == ["*_pb2.py"]
+    assert limits.timeout == FileLimits().timeout
+
+
+def test_time_limit_interrupts_the_block():
+    with pytest.raises(FileTimeout):
+        with time_limit(0.05):
+            time.sleep(1)
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="no interval timers")
+def test_time_limit_keeps_the_alarm_of_the_application():
+    fired = []
+    previous = signal.signal(signal.SIGALRM, lambda signum, frame: fired.append(signum))
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0.3)
+        with time_limit(5):
+            pass
+        assert 0 < signal.getitimer(signal.ITIMER_REAL)[0] <= 0.3
+        time.sleep(0.5)
+        assert fired == [signal.SIGALRM]
+
+        # Due before the limit: the application alarm wins, without a FileTimeout
+        signal.setitimer(signal.ITIMER_REAL, 0.05)
+        with time_limit(5):
+            time.sleep(0.2)
+        assert fired == [signal.SIGALRM] * 2
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_scanner_isolates_bad_modules(project):
+    scanner = GraphScanner(path=str(project), config=StubConfig())
+    scanner.analyze()
+
+    assert set(scanner.graph.nodes) == {"Good", "Message"}
+    issues = {path.rsplit("/", 1)[-1]: issue for path, issue in scanner.issues.items()}
+    assert set(issues) == {"broken.py", "latin.py"}
+    assert issues["broken.py"].kind == "failed"
+    assert issues["broken.py"].reason.startswith("SyntaxError")
+    assert issues["latin.py"].reason.startswith("UnicodeDecodeError")
+
+
+def test_scanner_skips_by_pattern_and_size(project):
+    config = StubConfig(limits={"skip": ["*_pb2.py"], "max_file_size": 100})
+    scanner = GraphScanner(path=str(project), config=config)
+    scanner.analyze()
+
+    assert set(scanner.graph.nodes) == {"Good"}
+    skipped = {path.rsplit("/", 1)[-1]: issue.reason for path, issue in scanner.issues.items()
+               if issue.kind == "skipped"}
+    assert skipped == {"big_pb2.py": "matches skip pattern '*_pb2.py'"}
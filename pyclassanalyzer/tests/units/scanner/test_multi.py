@@ -0,0 +1,111 @@
+import pytest
+
+from pyclassanalyzer.network.classgraph import ClassNode, ModuleDef, Relation, RelationType
+from pyclassanalyzer.network.facts import ModuleFacts
+from pyclassanalyzer.scanner import schedule
+from pyclassanalyzer.scanner.multi import MultiRootScanner, expand_roots, merge_roots, root_labels
+
+
+class StubConfig:
+    def __init__(self):
+        self.data = {
+            "exclude": {
+                "directories": [],
+                "types": [],
+                "methods": [],
+                "relationships": [],
+                "classes": [],
+            },
+            "exception": {"name": "*Exception"},
+        }
+
+    def get(self, key):
+        return self.data[key]
+
+
+def write_package(root, package, source):
+    directory = root / package
+    directory.mkdir(parents=True)
+    (directory / "__init__.py").write_text("")
+    (directory / "mod.py").write_text(source)
+    return directory / "mod.py"
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    write_package(tmp_path / "services" / "a" / "src", "svc", "class Config:\n    pass\n\nclass App(Base):\n    pass\n")
+    write_package(tmp_path / "services" / "b" / "src", "svc", "class Config:\n    pass\n")
+    write_package(tmp_path / "libs" / "core", "base", "class Base:\n    pass\n")
+    return tmp_path
+
+
+def test_expand_roots(monorepo):
+    roots = expand_roots([str(monorepo / "services" / "*" / "src"), str(monorepo / "libs" / "core"),
+                          str(monorepo / "missing" / "*")])
+
+    assert roots == [
+        str(monorepo / "services" / "a" / "src"),
+        str(monorepo / "services" / "b" / "src"),
+        str(monorepo / "libs" / "core"),
+    ]
+
+
+def test_root_labels_are_unique():
+    labels = root_labels(["/repo/services/a/src", "/repo/services/b/src", "/repo/libs/core"])
+
+    assert labels == {
+        "/repo/services/a/src": "a.src",
+        "/repo/services/b/src": "b.src",
+        "/repo/libs/core": "core",
+    }
+
+
+def test_merge_roots_qualifies_classes():
+    def facts(name, package, relations=()):
+        return ModuleFacts(
+            path=f"{package}.py",
+            classes=[ClassNode(name=name, module=ModuleDef(name=f"{package}.mod", package=package))],
+            relations=list(relations),
+        )
+
+    graph = merge_roots({
+        "a.src": ("src", [facts("Config", "src"),
+                          facts("App", "src.app", [
+                              Relation(source="App", target="Config", type_=RelationType.COMPOSITION),
+                              Relation(source="App", target="Base", type_=RelationType.INHERITANCE),
+                          ])]),
+        "b.src": ("src", [facts("Config", "src")]),
+        "core": ("core", [facts("Base", "core")]),
+    })
+
+    assert set(graph.nodes) == {"a.src.Config", "a.src.App", "b.src.Config", "core.Base"}
+    assert graph.nodes["a.src.App"].module.package == "a.src.app"
+    assert graph.relations == {
+        Relation(source="a.src.App", target="a.src.Config", type_=RelationType.COMPOSITION),
+        Relation(source="a.src.App", target="core.Base", type_=RelationType.INHERITANCE),
+    }
+
+
+def test_only_changed_root_is_reanalyzed(monorepo, monkeypatch):
+    roots = expand_roots([str(monorepo / "services" / "*" / "src"), str(monorepo / "libs" / "*")])
+    cache_dir = str(monorepo / "cache")
+
+    scanner = MultiRootScanner(roots, StubConfig(), workers=1, cache_dir=cache_dir)
+    scanner.analyze()
+    assert Relation(source="a.src.App", target="core.Base", type_=RelationType.INHERITANCE) in scanner.graph.relations
+
+    extracted = []
+    original = schedule.extract_module
+    monkeypatch.setattr(schedule, "extract_module",
+                        lambda visitor, path, root, limits: extracted.append(root) or original(visitor, path, root, limits))
+
+    # A new scanner starts from the caches: nothing is parsed again
+    scanner = MultiRootScanner(roots, StubConfig(), workers=1, cache_dir=cache_dir)
+    scanner.analyze()
+    assert extracted == []
+    assert len(scanner.graph.nodes) == 4
+
+    (monorepo / "libs" / "core" / "base" / "mod.py").write_text("class Base:\n    pass\n\nclass Extra:\n    pass\n")
+    scanner.refresh()
+    assert extracted == [str(monorepo / "libs" / "core")]
+    assert "core.Extra" in scanner.graph.nodes
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from pyclassanalyzer.config import TomlConfig
+from pyclassanalyzer.network.classgraph import ClassNode, Relation, RelationType
+from pyclassanalyzer.network.facts import ModuleFacts
+from pyclassanalyzer.scanner.scanner import GraphScanner, build_graph
+
+
+def test_build_graph_resolves_relations_across_modules():
+    # `B` is defined after the module that refers to it
+    facts = [
+        ModuleFacts(
+            path="a.py",
+            classes=[ClassNode(name="A")],
+            relations=[
+                Relation(source="A", target="B", type_=RelationType.COMPOSITION),
+                Relation(source="A", target="print", type_=RelationType.DEPENDENCY),
+            ],
+        ),
+        ModuleFacts(path="b.py", classes=[ClassNode(name="B")]),
+    ]
+
+    graph = build_graph(facts)
+
+    assert set(graph.nodes) == {"A", "B"}
+    assert graph.relations == {
+        Relation(source="A", target="B", type_=RelationType.COMPOSITION)
+    }
+
+
+def test_build_graph_keeps_unresolved_classes_only_on_request():
+    facts = [
+        ModuleFacts(
+            path="a.py",
+            classes=[ClassNode(name="A")],
+            relations=[
+                Relation(source="A", target="Base", type_=RelationType.INHERITANCE),
+                Relation(source="A", target="len", type_=RelationType.DEPENDENCY),
+                Relation(source="A", target="models.User", type_=RelationType.COMPOSITION),
+            ],
+        ),
+    ]
+
+    assert build_graph(facts).unresolved == set()
+    assert {rel.target for rel in build_graph(facts, keep_unresolved=True).unresolved} == {"Base", "models.User"}
+
+
+def test_save_outputs_skips_unchanged_exports(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "mod.py").write_text("class Base:\n    pass\n\nclass App(Base):\n    pass\n")
+    scanner = GraphScanner(path=str(source), config=TomlConfig())
+    scanner.analyze()
+    output_path = str(tmp_path / "out" / "diagram.puml")
+
+    paths = scanner.save_outputs(output_path, ["json", "dot"])
+    stamps = {name: os.stat(path).st_mtime_ns for name, path in paths.items()}
+    assert scanner.save_outputs(output_path, ["json", "dot"]) == paths
+
+    assert {name: os.stat(path).st_mtime_ns for name, path in paths.items()} == stamps
+    assert sorted(os.listdir(tmp_path / "out")) == [".pyclassanalyzer-manifest.json", "diagram.dot", "diagram.json"]
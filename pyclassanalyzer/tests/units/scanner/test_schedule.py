@@ -0,0 +1,129 @@
+import heapq
+import multiprocessing
+import threading
+import time
+
+from pyclassanalyzer.scanner import schedule
+from pyclassanalyzer.scanner.schedule import estimate_costs, extract_chunk, extract_scheduled, plan_chunks
+
+
+class StubConfig:
+    def __init__(self):
+        self.data = {
+            "exclude": {
+                "directories": [],
+                "types": [],
+                "methods": [],
+                "relationships": [],
+                "classes": [],
+            },
+            "exception": {"name": "*Exception"},
+        }
+
+    def get(self, key):
+        return self.data[key]
+
+
+def makespan(chunks, costs, workers):
+    """Finish time of the chunks handed out in order to the first free worker."""
+    finish = [0.0] * workers
+    for chunk in chunks:
+        heapq.heappush(finish, heapq.heappop(finish) + sum(costs[item] for item in chunk))
+    return max(finish)
+
+
+def test_estimate_costs_prefers_measured_timings():
+    sizes = {("a", "big.py"): 2000, ("a", "new.py"): 500}
+    history = {"big.py": (1000, 2.0)}
+
+    costs = estimate_costs(sizes, history)
+
+    # Scaled by the change of size, and the measured rate for the unknown module
+    assert costs[("a", "big.py")] == 4.0
+    assert costs[("a", "new.py")] == 1.0
+
+
+def test_estimate_costs_without_history_uses_size():
+    costs = estimate_costs({("a", "x.py"): 1000}, {})
+
+    assert costs[("a", "x.py")] == 1000 * schedule.DEFAULT_SECONDS_PER_BYTE
+
+
+def test_plan_chunks_sends_large_modules_alone_and_first():
+    costs = {("a", "huge.py"): 10.0, ("a", "large.py"): 4.0}
+    costs.update({("a", f"small{i}.py"): 0.01 for i in range(1000)})
+
+    chunks = plan_chunks(costs, workers=4)
+
+    assert chunks[0] == [("a", "huge.py")]
+    assert chunks[1] == [("a", "large.py")]
+    # Small modules are batched instead of being sent one by one
+    assert len(chunks) < 100
+    assert sorted(item for chunk in chunks for item in chunk) == sorted(costs)
+
+
+def test_plan_chunks_balances_skewed_work():
+    costs = {("a", f"m{i}.py"): float(size) for i, size in enumerate([50, 40, 30] + [1] * 480)}
+
+    chunks = plan_chunks(costs, workers=4)
+
+    # total 600 / 4 workers = 150
+    assert makespan(chunks, costs, 4) <= 150 * 1.05
+
+
+def test_extract_scheduled_in_workers_keeps_discovery_order(tmp_path, monkeypatch):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(f"class C{i}:\n    pass\n" + "#\n" * (i * 100))
+        paths.append(str(path))
+    monkeypatch.setattr(schedule, "MIN_PARALLEL_SECONDS", 0)
+    monkeypatch.setattr(schedule, "MIN_CHUNK_SECONDS", 0)
+
+    results = extract_scheduled({"root": (str(tmp_path), paths)}, StubConfig(), workers=2)
+
+    assert [path for path, _ in results["root"]] == paths
+    assert [facts.classes[0].name for _, facts in results["root"]] == [f"C{i}" for i in range(6)]
+    assert all(facts.cost > 0 for _, facts in results["root"])
+
+
+def stuck_on_marked_modules(items, config):
+    if any("stuck" in path for _, path in items):
+        time.sleep(3600)
+    return extract_chunk(items, config)
+
+
+def test_extract_scheduled_terminates_stuck_workers(tmp_path, monkeypatch):
+    paths = []
+    for name in ("fine", "stuck"):
+        path = tmp_path / f"{name}.py"
+        path.write_text("class C:\n    pass\n")
+        paths.append(str(path))
+    config = StubConfig()
+    config.data["limits"] = {"timeout": 1}
+    monkeypatch.setattr(schedule, "extract_chunk", stuck_on_marked_modules)
+    monkeypatch.setattr(schedule, "MIN_PARALLEL_SECONDS", 0)
+    monkeypatch.setattr(schedule, "MIN_CHUNK_SECONDS", 0)
+    monkeypatch.setattr(schedule, "WORKER_GRACE", 0.5)
+    children = set(multiprocessing.active_children())
+    # A process the application starts meanwhile, which the timeout must leave alone
+    bystander = multiprocessing.Process(target=time.sleep, args=(30,))
+    starter = threading.Timer(0.3, bystander.start)
+    starter.start()
+
+    try:
+        results = extract_scheduled({"root": (str(tmp_path), paths)}, config, workers=2)
+        starter.join()
+        assert bystander.is_alive()
+    finally:
+        if bystander.pid is not None:
+            bystander.terminate()
+            bystander.join()
+
+    facts = dict(results["root"])
+    assert facts[paths[0]].classes[0].name == "C"
+    assert facts[paths[1]].issue.reason == "worker timed out"
+    deadline = time.monotonic() + 5
+    while set(multiprocessing.active_children()) - children and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert set(multiprocessing.active_children()) - children == set()
@@ -0,0 +1,234 @@
+import asyncio
+import json
+import time
+import pytest
+
+from pyclassanalyzer.scanner.scanner import GraphScanner
+from pyclassanalyzer.server import server as server_module
+from pyclassanalyzer.server.server import AnalysisServer
+
+
+class StubConfig:
+    def __init__(self):
+        self.data = {
+            "exclude": {
+                "directories": ["tests"],
+                "types": ["exception"],
+                "methods": ["magic"],
+                "relationships": [],
+                "classes": [],
+            },
+            "exception": {"name": "*Exception"},
+        }
+
+    def get(self, key):
+        return self.data[key]
+
+
+@pytest.fixture
+def project(tmp_path):
+    pkg = tmp_path / "mypkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "a.py").write_text(
+        "class A:\n    def __init__(self):\n        self.b = B()\n", encoding="utf-8"
+    )
+    (pkg / "b.py").write_text("class B: pass\n", encoding="utf-8")
+    return pkg
+
+
+@pytest.fixture
+def server(project):
+    scanner = GraphScanner(path=str(project), config=StubConfig())
+    return AnalysisServer(scanner=scanner, refresh_interval=0)
+
+
+async def request(socket_path, method, target):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, body.decode("utf-8")
+
+
+def test_server_answers_concurrent_clients(server, tmp_path):
+    socket_path = str(tmp_path / "pca.sock")
+
+    async def run():
+        listener = await server.start(socket_path=socket_path)
+        async with listener:
+            return await asyncio.gather(
+                request(socket_path, "GET", "/stats"),
+                request(socket_path, "GET", "/query?type=descendants&class=A"),
+                request(socket_path, "GET", "/subgraph?class=B&depth=1"),
+                request(socket_path, "GET", "/plantuml?title=Test"),
+            )
+
+    stats, query, subgraph, plantuml = asyncio.run(run())
+
+    assert stats[0] == 200
+    assert json.loads(stats[1])["classes"] == 2
+    assert json.loads(query[1])["result"] == ["B"]
+    assert {node["name"] for node in json.loads(subgraph[1])["nodes"]} == {"A", "B"}
+    assert "title Test" in plantuml[1]
+    assert "A *-- B" in plantuml[1]
+
+
+def test_server_refreshes_changed_files(server, project):
+    async def run():
+        server._lock = asyncio.Lock()
+        await server.refresh()
+        (project / "c.py").write_text("class C(B): pass\n", encoding="utf-8")
+        changed = await server.refresh()
+        return changed
+
+    changed = asyncio.run(run())
+
+    assert [path.endswith("c.py") for path in changed] == [True]
+    assert "C" in server.graph.nodes
+
+
+def test_refresh_ignores_modules_deleted_during_discovery(server, project, monkeypatch):
+    discover = server.scanner._discover_modules
+
+    def discover_then_delete():
+        paths = list(discover())
+        (project / "b.py").unlink()
+        return iter(paths)
+
+    async def run():
+        server._lock = asyncio.Lock()
+        await server.refresh()
+        monkeypatch.setattr(server.scanner, "_discover_modules", discover_then_delete)
+        return await server.refresh()
+
+    changed = asyncio.run(run())
+
+    assert [path.endswith("b.py") for path in changed] == [True]
+    assert "B" not in server.graph.nodes
+
+
+def test_periodic_refresh_survives_a_failed_refresh(server, monkeypatch):
+    calls = []
+
+    def refresh():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise FileNotFoundError("vanished.py")
+        return []
+
+    monkeypatch.setattr(server.scanner, "refresh", refresh)
+    server.refresh_interval = 0.01
+
+    async def run():
+        server._lock = asyncio.Lock()
+        task = asyncio.ensure_future(server._refresh_periodically())
+        while len(calls) < 3 and not task.done():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        return task
+
+    task = asyncio.run(run())
+
+    assert len(calls) >= 3
+    assert task.cancelled()
+
+
+def test_dispatch_unknown_class(server):
+    status, _, body = server.dispatch("GET", "/query?type=ancestors&class=Missing")
+
+    assert status == 404
+    assert "Missing" in body
+
+
+def test_dispatch_plantuml_member_detail(server):
+    server.scanner.analyze()
+
+    _, _, full = server.dispatch("GET", "/plantuml?class=A")
+    _, _, bare = server.dispatch("GET", "/plantuml?class=A&members=none")
+    status, _, _ = server.dispatch("GET", "/plantuml?members=private")
+
+    assert "+b" in full
+    assert "+b" not in bare
+    assert "A *-- B" in bare
+    assert status == 400
+
+
+def test_plantuml_cache_is_bounded_and_ignores_unknown_parameters(server, monkeypatch):
+    server.scanner.analyze()
+    monkeypatch.setattr(server_module, "PLANTUML_CACHE_SIZE", 2)
+
+    first = server.dispatch("GET", "/plantuml?title=One&foo=1")
+    assert server.dispatch("GET", "/plantuml?title=One&foo=2") == first
+    assert len(server._plantuml_cache) == 1
+
+    for title in ("Two", "Three", "Four"):
+        server.dispatch("GET", f"/plantuml?title={title}")
+    assert len(server._plantuml_cache) == 2
+
+
+def test_plantuml_rendered_across_a_refresh_is_not_cached(server, monkeypatch):
+    server.scanner.analyze()
+    generate = server.scanner.plantuml_generator.generate_plantuml
+
+    def generate_during_refresh(graph, title):
+        content = generate(graph, title)
+        # The graph changed while this diagram was drawn from the previous one
+        server._generation += 1
+        return content
+
+    monkeypatch.setattr(server.scanner.plantuml_generator, "generate_plantuml", generate_during_refresh)
+    status, _, _ = server.dispatch("GET", "/plantuml")
+
+    assert status == 200
+    assert len(server._plantuml_cache) == 0
+
+
+def test_slow_render_does_not_block_other_clients(server, tmp_path, monkeypatch):
+    socket_path = str(tmp_path / "pca.sock")
+    plantuml = server._plantuml
+
+    def slow_plantuml(params):
+        time.sleep(0.5)
+        return plantuml(params)
+
+    monkeypatch.setattr(server, "_plantuml", slow_plantuml)
+
+    async def run():
+        listener = await server.start(socket_path=socket_path)
+        async with listener:
+            finished = []
+
+            async def timed(target):
+                await request(socket_path, "GET", target)
+                finished.append(target)
+
+            await asyncio.gather(timed("/plantuml"), timed("/stats"))
+            return finished
+
+    assert asyncio.run(run()) == ["/stats", "/plantuml"]
+
+
+def test_client_leaving_mid_body_is_ignored(server, tmp_path):
+    socket_path = str(tmp_path / "pca.sock")
+    errors = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        listener = await server.start(socket_path=socket_path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(b"POST /refresh HTTP/1.1\r\nContent-Length: 100\r\n\r\npartial")
+            await writer.drain()
+            writer.close()
+            await asyncio.sleep(0.1)
+            return await request(socket_path, "GET", "/stats")
+
+    status, _ = asyncio.run(run())
+
+    assert status == 200
+    assert errors == []
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from pyclassanalyzer import analyze
+from pyclassanalyzer.config import DEFAULT_CONFIG, TomlConfig
+from pyclassanalyzer.network.facts import FactsCache
+from pyclassanalyzer.scanner import schedule
+
+
+def write_project(root, source="class Base:\n    pass\n\nclass App(Base):\n    pass\n"):
+    package = root / "app"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "mod.py").write_text(source)
+    tests = root / "tests"
+    tests.mkdir()
+    (tests / "__init__.py").write_text("")
+    (tests / "test_mod.py").write_text("class TestApp:\n    pass\n")
+    return root
+
+
+def class_names(graph):
+    return sorted(node.name for node in graph.nodes.values())
+
+
+def test_config_dict_is_merged_with_defaults():
+    config = TomlConfig({"exclude": {"directories": ["docs"]}})
+
+    assert config.get("exclude.directories") == ["docs"]
+    assert config.get("exclude.types") == DEFAULT_CONFIG["exclude"]["types"]
+    assert config.get("exception.name") == "*Exception"
+
+
+def test_config_without_file_uses_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    config = TomlConfig()
+
+    assert config.path is None
+    assert config.data == DEFAULT_CONFIG
+
+
+def test_analyze_does_not_read_the_working_directory(tmp_path, monkeypatch):
+    project = write_project(tmp_path / "project")
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    # Would add the classes of the tests package if it were read
+    (cwd / "config.toml").write_text('[exclude]\ndirectories = []\n')
+    monkeypatch.chdir(cwd)
+
+    graph = analyze(str(project), memory_cache=None)
+
+    assert class_names(graph) == class_names(analyze(str(project), config={}, memory_cache=None))
+    assert class_names(graph) == ["App", "Base"]
+
+
+def test_analyze_with_config_dict(tmp_path):
+    project = write_project(tmp_path)
+
+    graph = analyze(project, config={"exclude": {"directories": []}}, memory_cache=None)
+
+    assert class_names(graph) == ["App", "Base", "TestApp"]
+
+
+def test_analyze_missing_path(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        analyze(tmp_path / "missing")
+
+
+def test_analyze_reuses_the_memory_cache(tmp_path, monkeypatch):
+    project = write_project(tmp_path)
+    cache = FactsCache()
+    parsed = []
+    extract_module = schedule.extract_module
+
+    def counting(visitor, path, base_path, limits=None):
+        parsed.append(path)
+        return extract_module(visitor, path, base_path, limits)
+
+    monkeypatch.setattr(schedule, "extract_module", counting)
+
+    first = analyze(project, memory_cache=cache)
+    count = len(parsed)
+    second = analyze(project, memory_cache=cache)
+
+    assert count > 0
+    assert len(parsed) == count
+    assert class_names(second) == class_names(first)
+
+    (project / "app" / "mod.py").write_text("class Base:\n    pass\n\nclass Other(Base):\n    pass\n")
+    third = analyze(project, memory_cache=cache)
+
+    assert class_names(third) == ["Base", "Other"]
+    assert len(parsed) == count + 1
+
+
+def test_analyze_is_thread_safe(tmp_path):
+    projects = [write_project(tmp_path / f"p{i}", f"class Base{i}:\n    pass\n") for i in range(4)]
+    cache = FactsCache()
+    results = {}
+    errors = []
+
+    def run(i):
+        try:
+            results[i] = class_names(analyze(projects[i], memory_cache=cache))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i % 4,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert results == {i: [f"Base{i}"] for i in range(4)}
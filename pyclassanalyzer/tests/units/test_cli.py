@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pyclassanalyzer import cli
+from pyclassanalyzer.generators.exporters import EXPORTERS
+from pyclassanalyzer.generators import metrics
+from pyclassanalyzer.network.classgraph import RelationType
+from pyclassanalyzer.network.matrix import RANKINGS
+
+REPO_ROOT = Path(cli.__file__).resolve().parents[1]
+# Cumulative import time of the CLI module, measured with `-X importtime`
+IMPORT_BUDGET_MS = 100
+# Loaded only by the code paths that need them
+HEAVY_MODULES = ["numpy", "pydantic", "toml", "concurrent.futures",
+                 "pyclassanalyzer.network.classgraph", "pyclassanalyzer.scanner.scanner"]
+
+
+def import_times(statement):
+    """Run `statement` in a fresh interpreter and return module -> cumulative microseconds."""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_choices_match_the_implementations():
+    assert cli.FORMATS == list(EXPORTERS)
+    assert cli.RANK_BY == list(RANKINGS)
+    assert cli.METRIC_FORMATS == metrics.METRIC_FORMATS
+    assert cli.RELATION_TYPES == [str(type_) for type_ in RelationType]
+
+
+def test_cli_import_is_within_budget():
+    times = import_times("import pyclassanalyzer.cli")
+
+    assert times["pyclassanalyzer.cli"] < IMPORT_BUDGET_MS * 1000
+    assert [name for name in HEAVY_MODULES if name in times] == []
+
+
+def test_analysis_does_not_import_optional_subsystems():
+    times = import_times("import pyclassanalyzer.api")
+
+    assert "numpy" not in times
+    assert "concurrent.futures.process" not in times
+    assert "pyclassanalyzer.generators.exporters" not in times
+    assert "pyclassanalyzer.network.metrics" not in times
+
+
+def test_query_does_not_import_the_analysis():
+    times = import_times("import pyclassanalyzer.cli, pyclassanalyzer.network.index")
+
+    assert [name for name in HEAVY_MODULES if name in times] == []
+
+
+def test_index_and_query(tmp_path, capsys):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "models.py").write_text("class Base:\n    pass\n\n\nclass User(Base):\n    pass\n")
+    index = str(tmp_path / "index.db")
+
+    assert cli.main(["index", str(package), "-o", index, "-q"]) == 0
+    capsys.readouterr()
+
+    assert cli.main(["query", "-i", index, "subclasses", "Base"]) == 0
+    assert capsys.readouterr().out == f"{package / 'models.py'}:5: pkg.models.User\n"
+    assert cli.main(["query", "-i", index, "where", "Missing"]) == 1
+
+
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_max_classes_must_be_positive(tmp_path, capsys, value):
+    with pytest.raises(SystemExit) as error:
+        cli.main([str(tmp_path), "--max-classes", value])
+
+    assert error.value.code == 2
+    assert "--max-classes" in capsys.readouterr().err
@@ -0,0 +1,66 @@
+import io
+import logging
+
+import pytest
+
+from pyclassanalyzer.utils import log
+from pyclassanalyzer.utils.log import Progress, configure_logging, logger, progress
+
+
+@pytest.fixture
+def stream():
+    stream = io.StringIO()
+    yield stream
+    # Back to the library defaults
+    for handler in list(logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+    log.progress_logger.setLevel(logging.NOTSET)
+
+
+def test_progress_is_noop_by_default(stream):
+    configure_logging(0, stream=stream)
+
+    reporter = progress("parse", total=10)
+    for _ in range(10):
+        reporter.advance()
+    reporter.close()
+
+    assert not isinstance(reporter, Progress)
+    assert stream.getvalue() == ""
+
+
+def test_progress_reports_rate_and_total_when_verbose(stream):
+    configure_logging(1, stream=stream)
+
+    with progress("parse", total=4, interval=3600) as reporter:
+        for _ in range(4):
+            reporter.advance()
+
+    # Rate limited: a single report when the phase is closed
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith("parse: 4/4 files (100%),")
+    assert "files/s" in lines[0]
+
+
+def test_progress_reports_eta_while_running(stream):
+    configure_logging(1, stream=stream)
+
+    reporter = progress("emit", total=10, unit="relations", interval=0)
+    reporter.advance(5)
+
+    assert "emit: 5/10 relations (50%)" in stream.getvalue()
+    assert "ETA" in stream.getvalue()
+
+
+def test_quiet_keeps_warnings_only(stream):
+    configure_logging(-1, stream=stream)
+
+    logger.info("Saved: a.puml")
+    logger.warning("No classes found.")
+    logger.error("파일 저장 실패")
+
+    assert stream.getvalue().splitlines() == ["Warning: No classes found.", "Error: 파일 저장 실패"]
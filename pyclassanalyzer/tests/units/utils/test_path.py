@@ -1,4 +1,4 @@
-from pyclassanalyzer.utils.path import split_path
+from pyclassanalyzer.utils.path import split_path, module_name
 
 
 def test_split_path_relative_path_success():
@@ -10,4 +10,11 @@ def test_split_path_absolute_path_success():
     test = "/User/test/test-folder/test.py"
     result = ['User', 'test', 'test-folder', 'test.py']
     
-    assert result == split_path(test)
\ No newline at end of file
+    assert result == split_path(test)
+
+def test_module_name_module_success():
+    assert module_name("/src/pkg/sub/mod.py", "/src/pkg") == ("pkg.sub.mod", "pkg.sub")
+
+
+def test_module_name_package_init_success():
+    assert module_name("/src/pkg/sub/__init__.py", "/src/pkg") == ("pkg.sub", "pkg.sub")
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from pyclassanalyzer.utils.pathspec import PathFilter, PathSpec
+
+
+@pytest.mark.parametrize("pattern, path, is_dir, expected", [
+    ("*_pb2.py", "api/user_pb2.py", False, True),
+    ("*_pb2.py", "api/user.py", False, False),
+    ("build/", "pkg/build", True, True),
+    ("build/", "pkg/build", False, False),
+    ("/build", "pkg/build", True, False),
+    ("/build", "build", True, True),
+    ("**/migrations/**", "app/migrations", True, True),
+    ("**/migrations/**", "app/migrations/0001_init.py", False, True),
+    ("app/*.py", "app/models.py", False, True),
+    ("app/*.py", "app/sub/models.py", False, False),
+    ("doc?/", "docs", True, True),
+    ("[ab].py", "b.py", False, True),
+    ("[!ab].py", "b.py", False, False),
+])
+def test_pathspec_follows_gitignore_rules(pattern, path, is_dir, expected):
+    assert PathSpec([pattern]).match(path, is_dir=is_dir) is expected
+
+
+def test_pathspec_last_negation_wins():
+    spec = PathSpec(["*_pb2.py", "!keep_pb2.py", "# comment", ""])
+
+    assert spec.match("x/user_pb2.py")
+    assert not spec.match("x/keep_pb2.py")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for path in ["pkg/__init__.py", "pkg/models.py", "pkg/api_pb2.py", "pkg/README.md",
+                 "pkg/migrations/__init__.py", "pkg/migrations/0001.py",
+                 "pkg/generated/__init__.py", "pkg/generated/big.py",
+                 "pkg/tests/__init__.py", "pkg/tests/test_models.py",
+                 "pkg/__pycache__/models.cpython-311.pyc",
+                 "env/pyvenv.cfg", "env/lib/site.py"]:
+        path = tmp_path / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    (tmp_path / "pkg" / ".gitignore").write_text("generated/\n")
+    return tmp_path
+
+
+def walked(path_filter, root):
+    return {
+        "dirs": {os.path.relpath(directory, root) for directory, _, _ in path_filter.walk(str(root))},
+        "files": {os.path.relpath(os.path.join(directory, name), root)
+                  for directory, _, files in path_filter.walk(str(root)) for name in files},
+    }
+
+
+def test_walk_prunes_excluded_directories(tree):
+    path_filter = PathFilter(exclude=["**/migrations/**", "*_pb2.py"], directories=["tests"])
+
+    result = walked(path_filter, tree)
+
+    assert "pkg/migrations" not in result["dirs"]
+    assert "pkg/tests" not in result["dirs"]
+    assert "pkg/__pycache__" not in result["dirs"]
+    # A virtualenv is recognized by its marker file
+    assert "env/lib" not in result["dirs"]
+    assert result["files"] == {"pkg/__init__.py", "pkg/models.py",
+                               "pkg/generated/__init__.py", "pkg/generated/big.py"}
+
+
+def test_walk_honours_gitignore_when_enabled(tree):
+    result = walked(PathFilter(gitignore=True), tree)
+
+    assert "pkg/generated" not in result["dirs"]
+    assert "pkg/api_pb2.py" in result["files"]
+
+
+def test_path_filter_from_config():
+    class Config:
+        data = {"exclude": {"directories": ["tests"], "paths": ["build/"], "defaults": False},
+                "include": {"paths": ["*.py", "*.pyi"]}}
+
+    path_filter = PathFilter.from_config(Config())
+
+    assert path_filter.exclude.match("a/build", is_dir=True)
+    assert not path_filter.exclude.match(".venv", is_dir=True)
+    assert path_filter.include.match("a/b.pyi")
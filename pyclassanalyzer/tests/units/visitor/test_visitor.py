@@ -0,0 +1,116 @@
+import ast
+import pytest
+
+from pyclassanalyzer.network.classgraph import Relation, RelationType
+from pyclassanalyzer.visitors.visitor import Visitor
+
+
+class StubConfig:
+    def __init__(self):
+        self.data = {
+            "exclude": {
+                "directories": ["tests"],
+                "types": ["exception"],
+                "methods": ["magic"],
+                "relationships": [],
+                "classes": [],
+            },
+            "exception": {"name": "*Exception"},
+        }
+
+    def get(self, key):
+        return self.data[key]
+
+
+@pytest.fixture
+def visitor():
+    return Visitor(config=StubConfig())
+
+
+def test_extract_returns_module_facts(visitor):
+    code = """
+class A:
+    def __init__(self, b: B):
+        self.b = B()
+        helper()
+
+class LevelOneException(Exception):
+    pass
+"""
+    facts = visitor.extract(ast.parse(code), "a.py")
+
+    assert facts.path == "a.py"
+    assert [c.name for c in facts.classes] == ["A"]
+    assert facts.classes[0].attributes == {"b"}
+    assert Relation(source="A", target="B", type_=RelationType.COMPOSITION) in facts.relations
+    assert Relation(source="A", target="helper", type_=RelationType.DEPENDENCY) in facts.relations
+
+
+def test_extract_deduplicates_relations_per_module(visitor):
+    code = """
+class A:
+    def run(self):
+        helper()
+        helper()
+"""
+    facts = visitor.extract(ast.parse(code), "a.py")
+
+    assert len(facts.relations) == 1
+
+
+def test_extract_resets_bookkeeping(visitor):
+    visitor.extract(ast.parse("class A:\n    x = B()"), "a.py")
+
+    assert visitor._composition_calls == set()
+    assert visitor.current_class is None
+
+
+def test_extract_records_self_member_usage(visitor):
+    code = """
+class A:
+    def load(self):
+        self.cache = self.read(self.path)
+
+    def read(self, path):
+        return open(path)
+"""
+    facts = visitor.extract(ast.parse(code), "a.py")
+
+    functions = {func.name: func.uses for func in facts.classes[0].functions}
+    assert functions == {"load": ["cache", "read", "path"], "read": []}
+
+
+def test_extract_finds_classes_in_compound_statements(visitor):
+    code = """
+try:
+    class A:
+        if DEBUG:
+            b = B()
+        else:
+            with lock:
+                def run(self):
+                    for item in items:
+                        helper(item)
+except ImportError:
+    class C:
+        pass
+"""
+    facts = visitor.extract(ast.parse(code), "a.py")
+
+    assert [c.name for c in facts.classes] == ["A", "C"]
+    assert Relation(source="A", target="B", type_=RelationType.COMPOSITION) in facts.relations
+    assert Relation(source="A", target="helper", type_=RelationType.DEPENDENCY) in facts.relations
+
+
+def test_extract_records_class_locations(visitor):
+    code = """
+class A:
+    pass
+
+if True:
+    class B(A):
+        pass
+"""
+    facts = visitor.extract(ast.parse(code), "pkg/a.py")
+
+    assert [(c.name, c.file, c.line) for c in facts.classes] == [("A", "pkg/a.py", 2), ("B", "pkg/a.py", 6)]
@@ -0,0 +1,143 @@
+import logging
+import sys
+import time
+from typing import Optional
+
+logger = logging.getLogger("pyclassanalyzer")
+# Progress reports have their own logger, so they can be enabled on their own
+progress_logger = logging.getLogger("pyclassanalyzer.progress")
+
+# Silent when used as a library, until the application configures logging
+logger.addHandler(logging.NullHandler())
+
+
+class _CLIFormatter(logging.Formatter):
+    """Keep the CLI messages as they were. ex) "Error: ...", "Warning: ..." """
+
+    PREFIXES = {
+        logging.WARNING: "Warning: ",
+        logging.ERROR: "Error: ",
+        logging.CRITICAL: "Error: ",
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        return self.PREFIXES.get(record.levelno, "") + super().format(record)
+
+
+def configure_logging(verbosity: int = 0, stream=None) -> None:
+    """Configure the diagnostics of the command line tool.
+
+    Args:
+        verbosity (int): -1 for warnings and errors only, 0 for the results,
+            1 to add the progress reports, 2 for debug messages.
+        stream: Where to write the messages. (default: stderr)
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(_CLIFormatter("%(message)s"))
+
+    for existing in list(logger.handlers):
+        if not isinstance(existing, logging.NullHandler):
+            logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    if verbosity < 0:
+        logger.setLevel(logging.WARNING)
+    elif verbosity >= 2:
+        logger.setLevel(logging.DEBUG)
+    else:
+        logger.setLevel(logging.INFO)
+    progress_logger.setLevel(logging.INFO if verbosity >= 1 else logging.WARNING)
+
+
+class Progress:
+    """Rate-limited progress of a phase. ex) parse: 120/480 files (25%), 60.0 files/s, ETA 6s
+
+    At most one report is logged every `interval` seconds,
+    and a last one when the phase is closed.
+
+    Attributes:
+        phase: the name of the phase. ex) discover, parse, emit
+        total: the expected number of items, if known.
+        count: the number of items done so far.
+    """
+
+    def __init__(self, phase: str, total: Optional[int] = None, unit: str = "files", interval: float = 1.0) -> None:
+        self.phase = phase
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.count = 0
+        self._start = time.monotonic()
+        self._next_report = self._start + interval
+
+    def advance(self, n: int = 1) -> None:
+        self.count += n
+        now = time.monotonic()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            self._report(now)
+
+    def close(self) -> None:
+        self._report(time.monotonic(), done=True)
+
+    def __enter__(self) -> "Progress":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if exc_info[0] is None:
+            self.close()
+
+    def _report(self, now: float, done: bool = False) -> None:
+        elapsed = max(now - self._start, 1e-9)
+        rate = self.count / elapsed
+
+        message = f"{self.phase}: {self.count}"
+        if self.total:
+            message += f"/{self.total} {self.unit} ({100 * self.count // self.total}%)"
+        else:
+            message += f" {self.unit}"
+        message += f", {rate:.1f} {self.unit}/s"
+        if done:
+            message += f", done in {elapsed:.1f}s"
+        elif self.total and rate > 0:
+            message += f", ETA {max(self.total - self.count, 0) / rate:.0f}s"
+        progress_logger.info(message)
+
+
+class _NullProgress:
+    """Progress reporter used when the reports are disabled. Every call is a no-op."""
+
+    count = 0
+
+    def advance(self, n: int = 1) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NullProgress":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_PROGRESS = _NullProgress()
+
+
+def progress(phase: str, total: Optional[int] = None, unit: str = "files", interval: float = 1.0):
+    """Start reporting the progress of a phase.
+
+    When the progress reports are disabled, a shared no-op reporter is returned,
+    so the hot loops only pay for an empty method call.
+
+    Example:
+        with progress("parse", total=len(paths)) as reporter:
+            for path in paths:
+                ...
+                reporter.advance()
+    """
+    if not progress_logger.isEnabledFor(logging.INFO):
+        return _NULL_PROGRESS
+    return Progress(phase, total=total, unit=unit, interval=interval)
@@ -1,3 +1,5 @@
+import os
+from typing import Tuple
 
 def split_path(path_str: str) -> list[str]:
     
@@ -13,4 +15,23 @@ def find_root_name(path:str) -> str:
     ex) ./pyclassanalyzer/tests/units -> units 
     """
     parts = split_path(path)
-    return parts[-1]
\ No newline at end of file
+    return parts[-1]
+
+def module_name(path: str, base_path: str) -> Tuple[str, str]:
+    """
+    Return the dotted module name and package name of a file,
+    relative to the root package at base_path.
+    
+    ex) (./pkg/sub/mod.py, ./pkg) -> (pkg.sub.mod, pkg.sub)
+        (./pkg/sub/__init__.py, ./pkg) -> (pkg.sub, pkg.sub)
+    """
+    rel_path = os.path.relpath(os.path.abspath(path), os.path.abspath(base_path))
+    parts = [find_root_name(os.path.abspath(base_path))] + split_path(rel_path)
+    
+    stem, _ = os.path.splitext(parts[-1])
+    if stem == '__init__':
+        package = ".".join(parts[:-1])
+        return package, package
+    
+    package = ".".join(parts[:-1])
+    return ".".join(parts[:-1] + [stem]), package
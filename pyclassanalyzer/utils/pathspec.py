@@ -0,0 +1,206 @@
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# Directories of tools and environments, never part of the analyzed sources
+DEFAULT_SKIP_DIRECTORIES = [
+    ".git", ".hg", ".svn", "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".eggs", "*.egg-info",
+    "node_modules", "site-packages",
+]
+# A directory holding this file is a virtualenv, whatever its name
+VIRTUALENV_MARKER = "pyvenv.cfg"
+
+
+def translate(pattern: str, base: str = "") -> Optional[Tuple[str, bool, bool]]:
+    """Translate a gitignore pattern into a regular expression over "/"-separated relative paths.
+
+    Args:
+        pattern (str): The pattern. ex) build/, *_pb2.py, **/migrations/**, !keep.py
+        base (str): The directory of the .gitignore holding the pattern, relative to the root.
+
+    Returns:
+        Optional[Tuple[str, bool, bool]]: (regex, negated, directories only),
+        or None for blank lines and comments.
+
+    NOTE:
+        A pattern ending with "/**" also matches the directory itself,
+        so the whole directory is pruned from the walk.
+    """
+    pattern = pattern.rstrip("\n")
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+    if not pattern.endswith("\\ "):
+        pattern = pattern.rstrip()
+
+    negated = pattern.startswith("!")
+    if negated or pattern.startswith("\\"):
+        pattern = pattern[1:]
+    directories_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    # A slash at the beginning or in the middle anchors the pattern to its directory
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            content = pattern[i + 1:end].replace("\\", "\\\\")
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex.append(f"[{content}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            regex.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+
+    prefix = re.escape(base.strip("/") + "/") if base.strip("/") else ""
+    if not anchored:
+        prefix += "(?:.*/)?"
+    return f"^{prefix}{''.join(regex)}$", negated, directories_only
+
+
+class PathSpec:
+    """Compiled list of gitignore patterns. The last matching pattern decides, as in git."""
+
+    def __init__(self, patterns: Iterable[str] = (), base: str = "") -> None:
+        self._rules: List[Tuple["re.Pattern", bool, bool]] = []
+        # Without negated patterns, the order does not matter and all the patterns
+        # are merged into one regex for the files and one for the directories
+        self._merged: Optional[Tuple["re.Pattern", "re.Pattern"]] = None
+        self.extend(patterns, base)
+
+    def extend(self, patterns: Iterable[str], base: str = "") -> None:
+        for pattern in patterns:
+            translated = translate(pattern, base)
+            if translated is not None:
+                regex, negated, directories_only = translated
+                self._rules.append((re.compile(regex), negated, directories_only))
+        self._merge()
+
+    def copy(self) -> "PathSpec":
+        spec = PathSpec()
+        spec._rules = list(self._rules)
+        spec._merged = self._merged
+        return spec
+
+    def _merge(self) -> None:
+        if any(negated for _, negated, _ in self._rules):
+            self._merged = None
+            return
+        never = "(?!)"
+        files = "|".join(regex.pattern for regex, _, directories_only in self._rules if not directories_only)
+        directories = "|".join(regex.pattern for regex, _, _ in self._rules)
+        self._merged = (re.compile(files or never), re.compile(directories or never))
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Check if a "/"-separated path, relative to the root, is matched by the patterns."""
+        if self._merged is not None:
+            return self._merged[is_dir].match(path) is not None
+        for regex, negated, directories_only in reversed(self._rules):
+            if directories_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negated
+        return False
+
+
+class PathFilter:
+    """Exclusions and inclusions of the source walk, compiled once from the config.
+
+    Example:
+        [exclude]
+        directories = ["tests"]
+        paths = ["**/migrations/**", "*_pb2.py", "build/"]
+        gitignore = true
+        defaults = true
+
+        [include]
+        paths = ["*.py"]
+
+    Attributes:
+        exclude: patterns of the files and directories to leave out.
+        include: patterns a file must match to be analyzed. Empty for all files.
+        gitignore: whether the .gitignore files found during the walk are honoured.
+    """
+
+    def __init__(self, exclude: Iterable[str] = (), include: Iterable[str] = ("*.py",),
+                 directories: Iterable[str] = (), gitignore: bool = False, defaults: bool = True) -> None:
+        skipped = list(DEFAULT_SKIP_DIRECTORIES) if defaults else []
+        skipped += [name.rstrip("/") for name in directories]
+        self.defaults = defaults
+        self.exclude = PathSpec([f"{name}/" for name in skipped] + list(exclude))
+        self.include = PathSpec(include)
+        self.gitignore = gitignore
+
+    @classmethod
+    def from_config(cls, config) -> "PathFilter":
+        data = getattr(config, 'data', {})
+        exclude = data.get('exclude') or {}
+        include = data.get('include') or {}
+        return cls(
+            exclude=exclude.get('paths') or [],
+            include=include.get('paths', ["*.py"]) or [],
+            directories=exclude.get('directories') or [],
+            gitignore=bool(exclude.get('gitignore', False)),
+            defaults=bool(exclude.get('defaults', True)),
+        )
+
+    def walk(self, root: str):
+        """Walk the tree like `os.walk`, without entering the excluded directories
+        and listing only the included files.
+
+        Yields:
+            (directory, subdirectory names, file names), the file names being filtered.
+        """
+        root = os.path.abspath(root)
+        exclude = self.exclude.copy() if self.gitignore else self.exclude
+
+        for directory, dirs, files in os.walk(root):
+            relative = os.path.relpath(directory, root).replace(os.sep, "/")
+            relative = "" if relative == "." else relative
+            prefix = f"{relative}/" if relative else ""
+
+            if self.defaults and VIRTUALENV_MARKER in files:
+                dirs[:] = []
+                continue
+            if self.gitignore and ".gitignore" in files:
+                exclude.extend(read_patterns(os.path.join(directory, ".gitignore")), base=relative)
+
+            # Pruned in place, so os.walk never enters them
+            dirs[:] = [name for name in dirs if not exclude.match(prefix + name, is_dir=True)]
+            files = [name for name in files
+                     if not exclude.match(prefix + name)
+                     and (not self.include or self.include.match(prefix + name))]
+            yield directory, dirs, files
+
+
+def read_patterns(path: str) -> List[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
@@ -1,10 +1,11 @@
 import fnmatch
 import ast
-from typing import Optional, List
+from typing import Optional, List, Dict, Callable
 
 from pyclassanalyzer.network.classgraph import (
-    ClassGraph, ClassNode, Relation, RelationType, FunctionDef, ClassType
+    ClassNode, Relation, RelationType, FunctionDef, ClassType, ModuleDef
 )
+from pyclassanalyzer.network.facts import ModuleFacts
 from pyclassanalyzer.config import TomlConfig
 from pyclassanalyzer.utils.class_type import is_magic
 
@@ -25,14 +26,122 @@ def check_exception_name(format:str, name:str) -> bool:
     """
     return bool(fnmatch.fnmatch(name, format))
 
-class Visitor(ast.NodeVisitor):
-    def __init__(self, graph:ClassGraph, config: TomlConfig) -> None:
-        self.graph = graph
+# Nodes without any child that can produce a class fact.
+# They are not queued when walking a method body.
+_LEAF_TYPES = frozenset(
+    [ast.Name, ast.Constant, ast.alias]
+    + [cls for base in (ast.expr_context, ast.operator, ast.unaryop, ast.cmpop, ast.boolop)
+       for cls in base.__subclasses__()]
+)
+
+# Nodes whose list fields may hold statements, ex) if/for/try bodies, except handlers, match cases
+_BLOCK_TYPES = tuple(
+    getattr(ast, name) for name in ('stmt', 'excepthandler', 'match_case') if hasattr(ast, name)
+)
+
+
+class Visitor:
+    """Extract the class facts of a module.
+    
+    Only the statements are traversed at module and class level, since
+    expressions can not define classes, methods or attributes.
+    Each method body is walked once, breadth-first, with a handler per node type.
+    """
+    
+    def __init__(self, config: TomlConfig) -> None:
         self.current_class: Optional[ClassNode] = None
         
-        # For avoiding duplication of composition relations
+        # For avoiding duplication of composition relations.
+        # It holds `id()`s of AST nodes, so it is only valid while the module is alive.
         self._composition_calls: set[int] = set()
         self._config = config
+        
+        # Facts of the module being extracted
+        self._classes: List[ClassNode] = []
+        self._relations: Dict[Relation, None] = {}
+        self._module: Optional[ModuleDef] = None
+        self._path: Optional[str] = None
+        
+        # Statement type -> handler, at module and class level
+        self._statement_handlers: Dict[type, Callable[[ast.AST], None]] = {
+            ast.ClassDef: self.visit_ClassDef,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Assign: self.visit_Assign,
+            ast.AnnAssign: self.visit_AnnAssign,
+        }
+        # Node type -> handler, inside a method body
+        self._method_handlers: Dict[type, Callable[[ast.AST], None]] = {
+            ast.Attribute: self._handle_self_usage,
+            ast.Call: self._handle_function_call,
+            ast.Assign: self._handle_function_assignment,
+            ast.AnnAssign: self._handle_function_annotated_assignment,
+        }
+        # `self.xxx` names used by the method being walked
+        self._uses: Dict[str, None] = {}
+    
+    def extract(self, tree: ast.Module, path: str, module: Optional[ModuleDef] = None) -> ModuleFacts:
+        """Extract the class facts of a single module.
+        
+        Args:
+            tree (ast.Module): The parsed module.
+            path (str): The path of the module file.
+            module (Optional[ModuleDef]): The module the classes belong to.
+        
+        Returns:
+            ModuleFacts: The summary of the module.
+        
+        NOTE:
+            The returned facts do not refer to any AST node,
+            so the caller can drop the tree right after this call.
+            All bookkeeping is reset per module.
+        """
+        self.current_class = None
+        self._composition_calls = set()
+        self._classes = []
+        self._relations = {}
+        self._module = module
+        self._path = path
+        
+        try:
+            self._visit_body(tree.body)
+            
+            return ModuleFacts(
+                path=path,
+                classes=self._classes,
+                relations=list(self._relations),
+            )
+        finally:
+            self.current_class = None
+            self._composition_calls = set()
+            self._classes = []
+            self._relations = {}
+    
+    def _visit_body(self, statements: List[ast.AST]) -> None:
+        for statement in statements:
+            self._visit_statement(statement)
+    
+    def _visit_statement(self, node: ast.AST) -> None:
+        handler = self._statement_handlers.get(type(node))
+        if handler is not None:
+            handler(node)
+            return
+        
+        # Compound statement: look for the statements in its blocks
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, _BLOCK_TYPES):
+                        self._visit_statement(item)
+    
+    def _add_node(self, class_: ClassNode) -> None:
+        class_.module = self._module
+        class_.file = self._path
+        self._classes.append(class_)
+    
+    def _add_relation(self, relation: Relation) -> None:
+        # dict keeps the insertion order while removing duplicates in the module
+        self._relations[relation] = None
  
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
@@ -53,16 +162,16 @@ class Visitor(ast.NodeVisitor):
             return 
             
         # Create class node
-        class_ = ClassNode(name=node.name)
+        class_ = ClassNode(name=node.name, line=node.lineno)
         class_.annotations = self._parse_decorators(node.decorator_list)
         self._set_class_type(class_, exception_format)
         self._process_inheritance(class_, node.bases)
         
-        self.graph.add_node(class_)
+        self._add_node(class_)
         self.current_class = class_
 
-        # Traverse all nodes in the class
-        self.generic_visit(node)
+        # Traverse all statements in the class
+        self._visit_body(node.body)
         self.current_class = None
     
     def _parse_decorators(self, decorator_list: list) -> List[str]:
@@ -135,7 +244,7 @@ class Visitor(ast.NodeVisitor):
                 target=base_name,
                 type_=RelationType.INHERITANCE
             )
-            self.graph.add_relation(relation)
+            self._add_relation(relation)
     
     # TODO: Track the object types of `self.xxx` attributes from method parameters.
     # For example, if `__init__(self, a:A): self.a = a`,
@@ -161,7 +270,7 @@ class Visitor(ast.NodeVisitor):
                     target=arg.annotation.id,
                     type_=RelationType.DEPENDENCY
                 )
-                self.graph.add_relation(rel)
+                self._add_relation(rel)
             
        
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
@@ -189,28 +298,46 @@ class Visitor(ast.NodeVisitor):
         if func.name == '__init__':
             self._parse_function_attrs(node)
         
-        # Traverse all nodes in the function
-        for child in ast.walk(node):
-            # set dependency relationship
-            if isinstance(child, ast.Call) and isinstance(child.func, ast.Name):
-                if id(child) in self._composition_calls:
-                    continue
-                
-                relation = Relation(
-                    source=self.current_class.name,
-                    target=child.func.id,
-                    type_=RelationType.DEPENDENCY
-                )
-                self.graph.add_relation(relation)
-
-            # set composition relationship
-            elif isinstance(child, ast.Assign):
-                self._handle_function_assignment(child)
-
-            # if the type annotation is assigned in the function,
-            # set composition relationship
-            elif isinstance(child, ast.AnnAssign):
-                self._handle_function_annotated_assignment(child)
+        # Traverse all nodes in the function, breadth-first
+        self._uses = {}
+        handlers = self._method_handlers
+        queue = [node]
+        i = 0
+        while i < len(queue):
+            child = queue[i]
+            i += 1
+            
+            handler = handlers.get(type(child))
+            if handler is not None:
+                handler(child)
+            
+            for field in child._fields:
+                value = getattr(child, field, None)
+                if type(value) is list:
+                    for item in value:
+                        if isinstance(item, ast.AST) and type(item) not in _LEAF_TYPES:
+                            queue.append(item)
+                elif isinstance(value, ast.AST) and type(value) not in _LEAF_TYPES:
+                    queue.append(value)
+        
+        func.uses = list(self._uses)
+    
+    def _handle_self_usage(self, node: ast.Attribute) -> None:
+        """Record `self.xxx` usage, for the cohesion metrics."""
+        if isinstance(node.value, ast.Name) and node.value.id == 'self':
+            self._uses[node.attr] = None
+    
+    def _handle_function_call(self, node: ast.Call) -> None:
+        """Set the dependency relationship of a call. ex) helper(), B()"""
+        if not isinstance(node.func, ast.Name) or id(node) in self._composition_calls:
+            return
+        
+        relation = Relation(
+            source=self.current_class.name,
+            target=node.func.id,
+            type_=RelationType.DEPENDENCY
+        )
+        self._add_relation(relation)
 
     def _handle_assignment(self, node: ast.Assign) -> None:
         """Handle assignment statements.
@@ -260,7 +387,7 @@ class Visitor(ast.NodeVisitor):
                             target=class_name,
                             type_=RelationType.COMPOSITION
                         )
-                        self.graph.add_relation(relation)
+                        self._add_relation(relation)
                         self._composition_calls.add(id(node.value))
 
         # If the value is a call assignment, set the composition relationship.
@@ -292,7 +419,7 @@ class Visitor(ast.NodeVisitor):
                         target=class_name,
                         type_=RelationType.COMPOSITION
                     )
-                    self.graph.add_relation(relation)
+                    self._add_relation(relation)
                     self._composition_calls.add(id(node.value))
 
     def _handle_function_assignment(self, node: ast.Assign) -> None:
@@ -327,7 +454,7 @@ class Visitor(ast.NodeVisitor):
                             target=class_name,
                             type_=RelationType.COMPOSITION
                         )
-                        self.graph.add_relation(relation)
+                        self._add_relation(relation)
                         self._composition_calls.add(id(node.value))
 
     def _handle_function_annotated_assignment(self, node: ast.AnnAssign) -> None:
@@ -354,7 +481,7 @@ class Visitor(ast.NodeVisitor):
                     target=class_,
                     type_=RelationType.COMPOSITION
                 )
-                self.graph.add_relation(relation=relation)
+                self._add_relation(relation)
 
     def visit_Assign(self, node: ast.Assign) -> None:
         """클래스 레벨 할당문 처리"""
@@ -389,7 +516,7 @@ class Visitor(ast.NodeVisitor):
                 target=class_,
                 type_=RelationType.COMPOSITION
             )
-            self.graph.add_relation(relation=relation)
+            self._add_relation(relation)
 
 def extract_type_names(annotation: ast.AST) -> set[str]:
     """
@@ -26,6 +26,9 @@ setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.7",
+    extras_require={
+        "fast": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "pyclassanalyzer=pyclassanalyzer.cli:main",